@@ -7,12 +7,60 @@ TODO: Add description.
 # from datasources.base_class import DatasourceBaseClass as ds
 from strategies.base_class import StrategyBaseClass as strat
 from exchanges.base_class import ExchangeBaseClass as exch
+from indicators import SMATable
+from profiling import PipelineProfile
+from result_cache import ResultCache, data_digest
 
+from typing import Dict, List, Tuple
+import numpy
 import curio
 import logging
 logger = logging.getLogger(__name__)
 
 
+def rows_within_drawdown(
+    quantities, prices, fees, closes, max_drawdown: float
+) -> int:
+    """
+    Count the rows a backtest runs for before its drawdown gets too deep.
+
+    `quantities`, `prices` and `fees` are what the exchange fills on each
+    row, as returned by its `vector_fills`. The account is marked to the
+    close of every row, after that row's fill, and the drawdown is how far
+    that equity is below its highest value so far, as the exchange's
+    `Metrics` work it out. Returns the number of rows up to and including
+    the first one whose drawdown is over `max_drawdown`, in the quote
+    currency, or all of them if none is.
+    """
+    quantities = numpy.asarray(quantities, dtype=float)
+    spent = quantities * numpy.asarray(prices, dtype=float) + numpy.asarray(fees, dtype=float)
+    equity = numpy.cumsum(quantities) * numpy.asarray(closes, dtype=float) \
+        - numpy.cumsum(spent)
+    peak = numpy.maximum.accumulate(equity)
+    breached = numpy.flatnonzero(peak - equity > max_drawdown)
+    return int(breached[0]) + 1 if len(breached) else len(quantities)
+
+
+class BroadcastQueue:
+    """
+    Fan the batches of one datasource out to several strategies.
+
+    Every item put on it is put on each of its queues, the same object
+    each time, so strategies must not modify the batches they get.
+    """
+
+    def __init__(self, queues: List[curio.Queue]):
+        self.queues = queues
+
+    async def put(self, item):
+        for queue in self.queues:
+            await queue.put(item)
+
+    async def join(self):
+        for queue in self.queues:
+            await queue.join()
+
+
 class backtest_runner:
     """
     Backtest strategies.
@@ -25,20 +73,35 @@ class backtest_runner:
         exchange: exch,
         datasource,
         strategy_params: str,
-        datasource_path: str
+        datasource_path: str,
+        batch_size: int = None,
+        profile: PipelineProfile = None
     ):
-        """TODO: Add description."""
+        """
+        Backtest a strategy tick by tick, through the curio queues.
+
+        When a `profile` is given, the queues and the stages of the
+        pipeline are instrumented and their counters are kept in it.
+        """
         logger.info("Entering backtest routine.")
 
         # Get curio queues
-        transaction_queue = curio.Queue()
-        ticker_queue = curio.Queue()
+        if profile is None:
+            transaction_queue = curio.Queue()
+            ticker_queue = curio.Queue()
+        else:
+            transaction_queue = profile.queue('transactions')
+            ticker_queue = profile.queue('ticks')
 
         # Set up objects
-        data_source_object = datasource(datasource_path, ticker_queue)
+        data_source_object = datasource(datasource_path, ticker_queue, batch_size)
         exchange_object = exchange(transaction_queue)
         strategy_object = strategy(transaction_queue, ticker_queue)
-        await strategy_object.configure(strategy_params)
+        strategy_object.configure(strategy_params)
+        if profile is not None:
+            profile.instrument(
+                data_source_object, strategy_object, exchange_object
+            )
 
         # Run the tasks
         async with curio.TaskGroup() as g:
@@ -46,9 +109,249 @@ class backtest_runner:
             await g.spawn(strategy_object.run)
             datasrce_task = await g.spawn(data_source_object.run)
             await datasrce_task.join()
+            # Let the strategy and the exchange drain what is still queued
+            await ticker_queue.join()
+            await transaction_queue.join()
             await g.cancel_remaining()
             async for task in g:
                 logging.info(str(task) + 'completed.' + str(task.result))
+        if profile is not None:
+            profile.finish()
+
+        # Clean exit
+        backtest_runner.report(
+            [(strategy, strategy_params, exchange)], [exchange_object]
+        )
+        logger.info("Backtest complete, exiting cleanly.")
+        return exchange_object
+
+    async def run_many(
+        runs: List[Tuple[strat, str, exch]],
+        datasource,
+        datasource_path: str,
+        batch_size: int = None
+    ):
+        """
+        Backtest several strategies over a single pass of the data.
+
+        `runs` lists (strategy, strategy parameters, exchange) triples.
+        The data is read once and each batch is broadcast to every
+        strategy, while each strategy trades through its own transaction
+        queue on its own exchange account. Returns the exchange objects,
+        in the order of `runs`.
+        """
+        logger.info(f"Entering backtest routine for {len(runs)} strategies.")
+
+        # Get curio queues, a pair per strategy
+        ticker_queues = [curio.Queue() for _ in runs]
+        transaction_queues = [curio.Queue() for _ in runs]
+
+        # Set up objects
+        data_source_object = datasource(
+            datasource_path, BroadcastQueue(ticker_queues), batch_size
+        )
+        exchange_objects = []
+        strategy_objects = []
+        for run, ticker_queue, transaction_queue in zip(
+            runs, ticker_queues, transaction_queues
+        ):
+            strategy, strategy_params, exchange = run
+            exchange_objects.append(exchange(transaction_queue))
+            strategy_object = strategy(transaction_queue, ticker_queue)
+            strategy_object.configure(strategy_params)
+            strategy_objects.append(strategy_object)
+
+        # Run the tasks
+        async with curio.TaskGroup() as g:
+            for exchange_object, strategy_object in zip(
+                exchange_objects, strategy_objects
+            ):
+                await g.spawn(exchange_object.run)
+                await g.spawn(strategy_object.run)
+            datasrce_task = await g.spawn(data_source_object.run)
+            await datasrce_task.join()
+            # Let the strategies and the exchanges drain what is still queued
+            await data_source_object.q.join()
+            for transaction_queue in transaction_queues:
+                await transaction_queue.join()
+            await g.cancel_remaining()
 
         # Clean exit
+        backtest_runner.report(runs, exchange_objects)
+        logger.info("Backtest complete, exiting cleanly.")
+        return exchange_objects
+
+    def report(runs: List[Tuple[strat, str, exch]], exchange_objects: List[exch]):
+        """Log where each strategy of a backtest ended up, and how it got there."""
+        for (strategy, strategy_params, _), exchange_object in zip(
+            runs, exchange_objects
+        ):
+            logger.info(
+                f"{strategy.__name__} ({strategy_params}): "
+                f"{exchange_object.num_purchases} buys, "
+                f"{exchange_object.num_sales} sales, holding "
+                f"{exchange_object.current_balance} with a balance of "
+                f"{exchange_object.currency_held}; {exchange_object.metrics}"
+            )
+
+    def run_vector(
+        strategy: strat,
+        exchange: exch,
+        datasource,
+        strategy_params: str,
+        datasource_path: str,
+        profile: PipelineProfile = None
+    ):
+        """
+        Backtest a strategy over the whole data set in one pass.
+
+        Rather than pushing the data through the queues row by row, the
+        whole data set is handed to the strategy's `process_vector` and the
+        resulting orders are filled by the exchange's `fill_vector`. This
+        produces the same trades as `run` for strategies implementing both.
+        """
+        logger.info("Entering vectorised backtest routine.")
+        if profile is not None:
+            profile.start()
+            datasource = profile.timed('load', datasource)
+        data_source_object = datasource(datasource_path, None)
+        exchange_object = backtest_runner.evaluate_vector(
+            strategy, exchange, data_source_object.data, strategy_params,
+            profile
+        )
+        backtest_runner.report(
+            [(strategy, strategy_params, exchange)], [exchange_object]
+        )
         logger.info("Backtest complete, exiting cleanly.")
+        return exchange_object
+
+    def run_vector_many(
+        runs: List[Tuple[strat, str, exch]],
+        datasource,
+        datasource_path: str
+    ):
+        """
+        Backtest several strategies with the vectorised engine.
+
+        Like `run_many`, the data is loaded once and shared by every
+        (strategy, strategy parameters, exchange) triple of `runs`.
+        Returns the exchange objects, in the order of `runs`.
+        """
+        logger.info(
+            f"Entering vectorised backtest routine for {len(runs)} strategies."
+        )
+        data = datasource(datasource_path, None).data
+        exchange_objects = [
+            backtest_runner.evaluate_vector(
+                strategy, exchange, data, strategy_params
+            )
+            for strategy, strategy_params, exchange in runs
+        ]
+        backtest_runner.report(runs, exchange_objects)
+        logger.info("Backtest complete, exiting cleanly.")
+        return exchange_objects
+
+    def simulate_vector(
+        strategy: strat,
+        exchange: exch,
+        data,
+        strategy_params: str,
+        profile: PipelineProfile = None,
+        max_drawdown: float = None,
+        indicators: SMATable = None
+    ) -> Tuple[exch, numpy.ndarray, int]:
+        """
+        Fill the orders of a strategy over data that is already loaded.
+
+        With a `max_drawdown` (in the quote currency) only the orders up
+        to the first row whose drawdown goes over it are filled, the
+        drawdown being worked out from the fills the exchange would make.
+        `indicators` saves the strategy computing the same moving averages
+        again. Returns the exchange object, the price of each row in the
+        column the strategy trades on, and the number of rows filled.
+        """
+        # Set up objects, no queues are needed here
+        exchange_object = exchange(None)
+        strategy_object = strategy(None, None)
+        strategy_object.configure(strategy_params)
+        strategy_object.indicators = indicators
+        if profile is not None:
+            profile.instrument(strategy=strategy_object, exchange=exchange_object)
+
+        quantities, prices = strategy_object.process_vector(data)
+        rows = len(data)
+        if max_drawdown is not None:
+            rows = rows_within_drawdown(
+                *exchange_object.vector_fills(quantities, prices), prices, max_drawdown
+            )
+        exchange_object.fill_vector(quantities[:rows], prices[:rows])
+        if profile is not None:
+            profile.finish()
+        return exchange_object, prices, rows
+
+    def evaluate_vector(
+        strategy: strat,
+        exchange: exch,
+        data,
+        strategy_params: str,
+        profile: PipelineProfile = None
+    ):
+        """Run the vectorised engine on data that is already loaded."""
+        exchange_object, _, _ = backtest_runner.simulate_vector(
+            strategy, exchange, data, strategy_params, profile
+        )
+        return exchange_object
+
+    def evaluate(
+        strategy: strat,
+        exchange: exch,
+        data,
+        strategy_params: str,
+        cache: ResultCache = None,
+        digest: str = None,
+        max_drawdown: float = None,
+        indicators: SMATable = None
+    ) -> Dict:
+        """
+        Backtest with the vectorised engine and summarise the result.
+
+        Returns the trades filled, the final holdings, the profit/loss at
+        the last price and the metrics of the exchange's account. Prices
+        are those of the column the strategy trades on. With a
+        `max_drawdown` (in the quote currency) the backtest is aborted on
+        the first row its drawdown goes over it: the result is then the
+        one at that row's price, and is marked as aborted. With a `cache`,
+        a combination backtested before on the same data with the same
+        code is read back from it instead. `digest`, the `data_digest` of
+        `data`, saves hashing the data again when many combinations are
+        run on it, and `indicators` computing the same moving averages
+        again.
+        """
+        if cache is not None:
+            key = cache.key(
+                digest or data_digest(data), strategy, exchange, strategy_params,
+                max_drawdown=max_drawdown
+            )
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+        exchange_object, prices, rows = backtest_runner.simulate_vector(
+            strategy, exchange, data, strategy_params,
+            max_drawdown=max_drawdown, indicators=indicators
+        )
+
+        result = {
+            'profit_loss': exchange_object.get_profit_loss(prices[rows - 1]),
+            'num_purchases': exchange_object.num_purchases,
+            'num_sales': exchange_object.num_sales,
+            'current_balance': exchange_object.current_balance,
+            'currency_held': exchange_object.currency_held,
+            'trades': exchange_object.trades,
+            'metrics': exchange_object.metrics.summary(),
+            'rows': rows,
+            'aborted': rows < len(data),
+        }
+        if cache is not None:
+            cache.put(key, result)
+        return result
@@ -0,0 +1,379 @@
+"""
+Benchmark the throughput of the backtest pipeline.
+
+Synthetic OHLCV series of a few sizes are written as Binance CSV files,
+then each stage of the pipeline is timed over them: loading the file,
+event-driven backtests of the bundled strategies and exchange fills.
+Every case runs in a fresh process, so that the peak memory reported is
+its own, and the results are written as JSON so that commits can be
+compared with each other.
+"""
+
+from backtest import backtest_runner
+from binance.helpers.sign_request import Signer  # type: ignore
+from common.common_classes import transaction as t
+from datasources import csv_cache
+from datasources.binance_csv import BinanceCSV
+from exchanges.fake_exchange import FakeExchange
+from exchanges.matching_exchange import MatchingExchange
+from exchanges.order_book import BUY, SELL, OrderBook, SyntheticDepth
+from strategies.moving_average import moving_average
+from strategies.dca import DCA
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional
+import multiprocessing
+import platform
+import subprocess
+import sys
+import numpy
+import pandas as pd
+import curio
+import logging
+logger = logging.getLogger(__name__)
+
+# Rows of the synthetic series benchmarked by default
+SIZES = [10_000, 1_000_000, 10_000_000]
+
+# Parameters the strategies are benchmarked with
+MOVING_AVERAGE_PARAMS = '10,50'
+DCA_PARAMS = '24,100'
+
+
+def synthetic_ohlcv(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate an hourly OHLCV series, oldest first.
+
+    Closes follow a geometric random walk, and each candle opens at the
+    previous close, so strategies trade on it like they do on real data.
+    """
+    random = numpy.random.default_rng(seed)
+    close = 30_000 * numpy.exp(numpy.cumsum(random.normal(0, 0.005, rows)))
+    opens = numpy.concatenate([[30_000.], close[:-1]])
+    spread = numpy.abs(random.normal(0, 0.002, rows)) * close
+    volume = random.gamma(2., 500., rows)
+    dates = numpy.datetime64('2017-01-01T00') + numpy.arange(rows).astype('m8[h]')
+    return pd.DataFrame({
+        'date': numpy.datetime_as_string(dates, unit='s'),
+        'symbol': 'BTC/USDT',
+        'open': opens.round(2),
+        'high': (numpy.maximum(opens, close) + spread).round(2),
+        'low': (numpy.minimum(opens, close) - spread).round(2),
+        'close': close.round(2),
+        'Volume BTC': volume.round(6),
+        'Volume USDT': (volume * close).round(2),
+        'tradecount': random.poisson(1000, rows),
+    })
+
+
+def synthetic_csv(rows: int, folder: str) -> str:
+    """
+    Write a synthetic series as a Binance CSV file, newest first.
+
+    The file only depends on `rows`, so one left by an earlier run is
+    reused as is.
+    """
+    path = Path(folder) / f'synthetic_{rows}.csv'
+    if not path.is_file():
+        logger.info(f"Generating {rows} rows of synthetic data in {path}.")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_suffix('.partial')
+        synthetic_ohlcv(rows).iloc[::-1].to_csv(staging, index=False)
+        staging.replace(path)
+    return str(path)
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident memory of this process so far, in MB."""
+    # On Linux, `getrusage` carries the peak of the parent process over to
+    # a freshly started one, but the peak of the process' memory map does
+    # not.
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 2 ** 10
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, in kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+class _UncachedCSV(BinanceCSV):
+    """Binance CSV datasource parsing the file every time."""
+
+    CACHE = False
+
+
+def _load_csv(path: str) -> float:
+    """Parse the CSV file, without its cache."""
+    started = perf_counter()
+    _UncachedCSV(path)
+    return perf_counter() - started
+
+
+def _load_cached_csv(path: str) -> float:
+    """Load the CSV file from its columnar cache, built beforehand."""
+    started = perf_counter()
+    BinanceCSV(path)
+    return perf_counter() - started
+
+
+def _backtest(strategy, strategy_params: str, path: str) -> float:
+    """Backtest a strategy with the event-driven engine."""
+    started = perf_counter()
+    curio.run(
+        backtest_runner.run, strategy, FakeExchange, BinanceCSV,
+        strategy_params, path
+    )
+    return perf_counter() - started
+
+
+def _backtest_moving_average(path: str) -> float:
+    """Backtest the moving average strategy."""
+    return _backtest(moving_average, MOVING_AVERAGE_PARAMS, path)
+
+
+def _backtest_dca(path: str) -> float:
+    """Backtest the DCA strategy."""
+    return _backtest(DCA, DCA_PARAMS, path)
+
+
+def _exchange_fills(path: str) -> float:
+    """Fill one order per row through the exchange's queue."""
+    prices = BinanceCSV(path).data['close'].tolist()
+
+    async def fill():
+        queue = curio.Queue()
+        exchange = FakeExchange(queue)
+        for number, price in enumerate(prices):
+            await queue.put(
+                t.buyTransactionFactory(1, price) if number % 2 == 0
+                else t.sellTransactionFactory(1, price)
+            )
+        # Only the exchange draining the queue is timed
+        started = perf_counter()
+        filling = await curio.spawn(exchange.run)
+        await queue.join()
+        elapsed = perf_counter() - started
+        await filling.cancel()
+        return elapsed
+
+    return curio.run(fill)
+
+
+def _exchange_fill_vector(path: str) -> float:
+    """Fill one order per row with the vectorised engine."""
+    prices = BinanceCSV(path).data['close'].to_numpy()
+    quantities = numpy.where(numpy.arange(len(prices)) % 2 == 0, 1., -1.)
+    started = perf_counter()
+    FakeExchange(None).fill_vector(quantities, prices)
+    return perf_counter() - started
+
+
+def _order_book_events(path: str) -> float:
+    """
+    Match one order event per row, in the mix of a live order book.
+
+    Out of every 20 events, 8 are limit orders resting away from the
+    touch and 7 cancel the oldest resting order: most of the messages of
+    a live book are orders placed and cancelled. Of the others, 2 are
+    limit orders priced through the touch, 1 is a market order, 1 a stop
+    loss waiting for the price to move, and 1 replaces the depth around
+    the row's close, filling the resting orders and triggering the stops
+    the price has reached.
+    """
+    close = BinanceCSV(path).data['close'].to_numpy()
+    random = numpy.random.default_rng(0)
+    depth = SyntheticDepth(level_qty=5.)
+    book = OrderBook()
+    book.load_levels(*depth.book(close[0]))
+    kinds = numpy.arange(len(close)) % 20
+    sides = numpy.where(random.random(len(close)) < 0.5, BUY, SELL)
+    offsets = random.integers(1, 200, len(close)) * 0.0005
+    # Resting orders away from the close, crossing ones and stops past it
+    away = close * (1 - sides * offsets)
+    past = close * (1 + sides * offsets)
+    updates = {row: depth.book(close[row]) for row in numpy.flatnonzero(kinds == 19).tolist()}
+    events = list(zip(kinds.tolist(), sides.tolist(), away.tolist(), past.tolist()))
+    submit, cancel, load_levels = book.submit, book.cancel, book.load_levels
+    resting = deque()
+    started = perf_counter()
+    for row, (kind, side, price, other_price) in enumerate(events):
+        if kind < 8:
+            resting.append(submit(side, 'LIMIT', 1., price))
+        elif kind < 15:
+            cancel(resting.popleft())
+        elif kind < 17:
+            submit(side, 'LIMIT', 0.5, other_price)
+        elif kind == 17:
+            submit(side, 'MARKET', 0.5)
+        elif kind == 18:
+            submit(side, 'STOP_LOSS', 0.5, stop_price=other_price)
+        else:
+            load_levels(*updates[row])
+    return perf_counter() - started
+
+
+def _matching_fill_vector(path: str) -> float:
+    """Fill one market order per row against synthetic depth."""
+    prices = BinanceCSV(path).data['close'].to_numpy()
+    quantities = numpy.where(numpy.arange(len(prices)) % 2 == 0, 1.5, -1.5)
+    started = perf_counter()
+    MatchingExchange(None).fill_vector(quantities, prices)
+    return perf_counter() - started
+
+
+def _sign_requests(path: str) -> float:
+    """Sign one order request per row, as the live exchange would."""
+    prices = BinanceCSV(path).data['close'].tolist()
+    signer = Signer('x' * 64)
+    sign = signer.sign
+    started = perf_counter()
+    for price in prices:
+        sign({
+            'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT',
+            'timeInForce': 'GTC', 'quantity': 0.01, 'price': price,
+        })
+    return perf_counter() - started
+
+
+# What each case times, given the path of the CSV file to run on
+CASES = {
+    'binance_csv': _load_csv,
+    'binance_csv_cached': _load_cached_csv,
+    'backtest_moving_average': _backtest_moving_average,
+    'backtest_dca': _backtest_dca,
+    'exchange_fills': _exchange_fills,
+    'exchange_fill_vector': _exchange_fill_vector,
+    'order_book_events': _order_book_events,
+    'matching_fill_vector': _matching_fill_vector,
+    'sign_requests': _sign_requests,
+}
+
+# Ticks per second a case must reach, whatever the baseline
+REQUIRED_TICKS_PER_SECOND = {
+    'order_book_events': 150_000,
+    'sign_requests': 10_000,
+}
+
+
+def _prime_cache(path: str):
+    """Build the columnar cache of a CSV file."""
+    csv_cache.load(path)
+
+
+def _run_case(case: str, path: str, rows: int) -> Dict:
+    """Run a single case, in its own process."""
+    # Log lines are part of what is timed, but not worth printing here
+    logging.getLogger().setLevel(logging.WARNING)
+    baseline_rss_mb = _peak_rss_mb()
+    wall_time = CASES[case](path)
+    return {
+        'case': case,
+        'rows': rows,
+        'wall_time_s': wall_time,
+        'ticks_per_second': rows / wall_time if wall_time else None,
+        'peak_rss_mb': _peak_rss_mb(),
+        'baseline_rss_mb': baseline_rss_mb,
+    }
+
+
+def _in_new_process(function, *args):
+    """Call `function` in a freshly started process and return its result."""
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        return executor.submit(function, *args).result()
+
+
+def _commit() -> Optional[str]:
+    """Return the commit of the working tree, if it is a git repository."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict, report: Dict, tolerance: float = 0.1) -> List[str]:
+    """
+    List the cases that got slower than in a baseline report.
+
+    A case regressed when its ticks per second dropped by more than
+    `tolerance` (a fraction) from the baseline for the same size.
+    """
+    previous = {
+        (result['case'], result['rows']): result['ticks_per_second']
+        for result in baseline['results']
+    }
+    regressions = []
+    for result in report['results']:
+        before = previous.get((result['case'], result['rows']))
+        after = result['ticks_per_second']
+        if before and after and after < before * (1 - tolerance):
+            regressions.append(
+                f"{result['case']} ({result['rows']} rows): "
+                f"{after:,.0f} ticks/s, down from {before:,.0f} "
+                f"({after / before - 1:+.0%})"
+            )
+    return regressions
+
+
+def shortfalls(report: Dict) -> List[str]:
+    """List the cases slower than `REQUIRED_TICKS_PER_SECOND`."""
+    missed = []
+    for result in report['results']:
+        required = REQUIRED_TICKS_PER_SECOND.get(result['case'])
+        after = result['ticks_per_second']
+        if required and after is not None and after < required:
+            missed.append(
+                f"{result['case']} ({result['rows']} rows): "
+                f"{after:,.0f} ticks/s, {required:,.0f} required"
+            )
+    return missed
+
+
+class benchmark:
+    """
+    Benchmark the backtest pipeline.
+
+    This class times each case of `CASES` over synthetic data sets.
+    """
+
+    def run(cases: List[str], sizes: List[int], folder: str) -> Dict:
+        """
+        Run every case over a synthetic series of each size.
+
+        The CSV files (and their caches) are kept in `folder`, to be reused
+        by later runs. Returns the report, with one result per case and
+        size, smallest size first.
+        """
+        results = []
+        for rows in sorted(sizes):
+            path = synthetic_csv(rows, folder)
+            _in_new_process(_prime_cache, path)
+            for case in cases:
+                result = _in_new_process(_run_case, case, path, rows)
+                logger.info(
+                    f"{case} ({rows} rows): {result['wall_time_s']:.3f} s, "
+                    f"{result['ticks_per_second']:,.0f} ticks/s, "
+                    f"peak RSS {result['peak_rss_mb']:.0f} MB"
+                )
+                results.append(result)
+
+        return {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }
@@ -34,4 +34,8 @@ setuptools.setup(
     packages=setuptools.find_packages(where='src'),
     python_requires='>=3.9',
     install_requires=['requests'],
+    extras_require={
+        'numpy': ['numpy'],
+        'orjson': ['orjson'],
+    },
 )
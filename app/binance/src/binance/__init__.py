@@ -12,11 +12,13 @@ Author: Vitali Lupusor
 """
 
 # Import standard modules
-from typing import Optional
+from typing import Any, Optional, Union
 
 # Import local modules
 from .api_calls.market import MarketData    # type: ignore
 from .api_calls.client import Trade         # type: ignore
+from .helpers.cache import ResponseCache    # type: ignore
+from .helpers.session import Session        # type: ignore
 
 
 class Binance:
@@ -26,7 +28,10 @@ class Binance:
         self,
         key: Optional[str] = None,
         secret: Optional[str] = None,
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        pool_size: int = 10,
+        timeout: float = 10.,
+        cache: Union[bool, ResponseCache] = False
     ) -> None:
         """
         Binance client.
@@ -45,6 +50,21 @@ class Binance:
                 Server URL.
                 Defaults to `https://testnet.binance.vision/api/v3`.
 
+            pool_size (int):
+                Maximum number of connections kept open to the server,
+                shared by all the calls made through this client.
+                Defaults to `10`.
+
+            timeout (float):
+                Seconds to wait for the server to connect and to answer.
+                Defaults to `10`.
+
+            cache (Union[bool, ResponseCache]):
+                Cache the responses of slow-changing market data, such as
+                `exchangeInfo`. Pass a `ResponseCache` to choose how long
+                each endpoint is cached for.
+                Defaults to `False`.
+
         Arguments
         ---------
             get (MarketData):
@@ -56,6 +76,9 @@ class Binance:
             url (str):
                 Server URL where the requests will be sent to.
 
+            session (Session):
+                Pooled HTTP session shared by `get` and `trade`.
+
         """
         # Import standard modules
         from os import getenv
@@ -63,13 +86,40 @@ class Binance:
         self.__key = key or getenv('API_KEY')
         self.__secret = secret or getenv('API_SECRET')
         self._url = url or 'https://testnet.binance.vision/api/v3'
+        self.session = Session(pool_size, timeout)
+        if cache:
+            self.session.cache = (
+                cache if isinstance(cache, ResponseCache) else ResponseCache()
+            )
         self._public = None
         self._trade = None
+        self._async_public = None
+        self._async_trade = None
 
     def __repr__(self) -> str:
         """Configure object representation."""
         return f'<Binance: {self._url}>'
 
+    def __enter__(self) -> 'Binance':
+        """Use the client as a context manager, closed on the way out."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the client."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop syncing the server clock and close the pooled connections.
+
+        The client must not be used afterwards.
+        """
+        if self._trade is not None:
+            self._trade.close()
+        if self._async_trade is not None:
+            self._async_trade._apis.close()
+        self.session.close()
+
     @classmethod
     def from_env_file(cls, filename: str):
         """
@@ -173,15 +223,49 @@ class Binance:
     def public(self) -> MarketData:
         """Return all `Market Data Endpoint` APIs."""
         if not self._public:
-            self._public = MarketData(self.__key, self._url)
+            self._public = MarketData(self.__key, self._url, self.session)
         return self._public
 
     @property
     def trade(self) -> Trade:
         """Return all `Spot Account/Trade` APIs."""
         if not self._trade:
-            self._trade = Trade(self.__key, self.__secret, self._url)
+            self._trade = Trade(
+                self.__key, self.__secret, self._url, self.session
+            )
         return self._trade
 
+    @property
+    def async_public(self):
+        """
+        Return all `Market Data Endpoint` APIs as coroutines.
+
+        For use inside a curio event loop. Requires `curio`.
+        """
+        # Import local modules
+        from .api_calls.asynchronous import AsyncMarketData  # type: ignore
+
+        if not self._async_public:
+            self._async_public = AsyncMarketData(
+                self.__key, self._url, self.session
+            )
+        return self._async_public
+
+    @property
+    def async_trade(self):
+        """
+        Return all `Spot Account/Trade` APIs as coroutines.
+
+        For use inside a curio event loop. Requires `curio`.
+        """
+        # Import local modules
+        from .api_calls.asynchronous import AsyncTrade  # type: ignore
+
+        if not self._async_trade:
+            self._async_trade = AsyncTrade(
+                self.__key, self.__secret, self._url, self.session
+            )
+        return self._async_trade
+
 
-del(Optional, )
+del(Any, Optional, Union)
@@ -0,0 +1,163 @@
+"""
+Awaitable flavour of the Binance APIs, for use inside a curio event loop.
+
+Every method of `MarketData` and `Trade` is exposed under the same name as
+a coroutine. The blocking HTTP call runs on one of curio's worker threads,
+so the event loop carries on with other tasks while it is in flight, and
+many calls can be in flight at once. `run` runs a coroutine using them the
+way `curio.run` does, with the calls on a thread pool of its own that it
+shuts down before the kernel closes.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial, wraps
+from typing import Any, Callable, Optional
+
+# Import third-party modules
+from curio import Kernel, run_in_executor, run_in_thread
+from curio.workers import MAX_WORKER_THREADS
+
+# Import local modules
+from .client import Trade  # type: ignore
+from .market import MarketData  # type: ignore
+from ..helpers.session import Session  # type: ignore
+
+
+# Thread pool of the calls made inside `run`, if any
+_executor: ContextVar[Optional[ThreadPoolExecutor]] = ContextVar(
+    '_executor', default=None
+)
+
+
+def awaitable(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Turn a blocking API method into a coroutine with the same name."""
+    @wraps(method)
+    async def wrapper_awaitable(self, *args: Any, **kwargs: Any) -> Any:
+        call = partial(method, self._apis, *args, **kwargs)
+        executor = _executor.get()
+        if executor is None:
+            return await run_in_thread(call)
+        return await run_in_executor(executor, call)
+
+    return wrapper_awaitable
+
+
+class AsyncAPIs:
+    """
+    Base class of the awaitable APIs.
+
+    Subclasses name the blocking APIs they wrap in `APIS`, and get an
+    awaitable version of each of its public methods.
+    """
+
+    APIS: type = object
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Add the awaitable methods to a subclass."""
+        super().__init_subclass__(**kwargs)
+        for name, method in vars(cls.APIS).items():
+            if callable(method) and not name.startswith('_'):
+                setattr(cls, name, awaitable(method))
+
+
+class AsyncMarketData(AsyncAPIs):
+    """Awaitable collection of `Market Data Endpoint` APIs."""
+
+    APIS = MarketData
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        url: Optional[str] = None,
+        session: Optional[Session] = None
+    ) -> None:
+        """
+        Initialise the class.
+
+        Parameters
+        ----------
+            key (Optional[str]):
+                Binance API key.
+
+            url (Optional[str]):
+                Server URL.
+
+            session (Optional[Session]):
+                Pooled HTTP session to send the requests through.
+                Defaults to a new session.
+        """
+        self._apis = MarketData(key, url, session)
+
+
+class AsyncTrade(AsyncAPIs):
+    """Awaitable collection of `Spot Account/Trades` APIs."""
+
+    APIS = Trade
+
+    def __init__(
+        self,
+        key: str,
+        secret: str,
+        url: Optional[str] = None,
+        session: Optional[Session] = None
+    ) -> None:
+        """
+        Initialise the class.
+
+        Parameters
+        ----------
+            key (str):
+                Binance API key.
+
+            secret (str):
+                Binance API secret.
+
+            url (Optional[str]):
+                Server URL.
+
+            session (Optional[Session]):
+                Pooled HTTP session to send the requests through.
+                Defaults to a new session.
+        """
+        self._apis = Trade(key, secret, url, session)
+
+
+def run(corofunc: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a coroutine in a new curio kernel, like `curio.run`.
+
+    A worker thread wakes the kernel up once its call returns, and can
+    still be doing so after the task that awaited the call has moved on.
+    `curio.run` may then close the kernel under it. Here the calls run on
+    a thread pool of this function's own, which is shut down, once the
+    calls already started are done, before the kernel closes. Calls
+    abandoned by cancelled tasks before they started are dropped.
+
+    Parameters
+    ----------
+        corofunc (Callable[..., Any]):
+            Coroutine function to run.
+
+        *args (Any):
+            Its arguments.
+
+    Returns
+    -------
+        Any:
+            What the coroutine returns.
+    """
+    with Kernel() as kernel:
+        executor = ThreadPoolExecutor(MAX_WORKER_THREADS)
+        token = _executor.set(executor)
+        try:
+            return kernel.run(corofunc, *args)
+        finally:
+            _executor.reset(token)
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+del(Callable, Optional)
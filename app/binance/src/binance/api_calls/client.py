@@ -11,6 +11,9 @@ from typing import Literal, Optional, Union
 
 # Import local modules
 from ..helpers import get, post, delete  # type: ignore
+from ..helpers.requests import request  # type: ignore
+from ..helpers.session import Session  # type: ignore
+from ..helpers.sign_request import Signer  # type: ignore
 from ..helpers.type_literals import ResponseTypeOptions, TypeOptions  # type: ignore  # noqa: E501
 
 
@@ -18,7 +21,11 @@ class Trade:
     """Collection of `Spot Account/Trades` APIs."""
 
     def __init__(
-        self, key: str, secret: str, url: Optional[str] = None
+        self,
+        key: str,
+        secret: str,
+        url: Optional[str] = None,
+        session: Optional[Session] = None
     ) -> None:
         """
         Initialise the class.
@@ -33,10 +40,29 @@ class Trade:
 
             url (Optional[str]):
                 Server URL.
+
+            session (Optional[Session]):
+                Pooled HTTP session to send the requests through.
+                Defaults to a new session.
         """
         self.__key = key
-        self.__secret = secret
         self._url = url
+        self._session = session or Session()
+        # Signs requests with the server's time, kept in sync in the
+        # background from the first signed request on
+        self.__secret = Signer(secret, self._server_time) if secret else None
+
+    def _server_time(self) -> int:
+        """Return the server time, in milliseconds."""
+        # Sent past the session's response cache: a cached server time
+        # would skew the measured clock offset by its age
+        response = request('get', self._url, 'time', session=self._session)
+        return int(response['serverTime'])
+
+    def close(self) -> None:
+        """Stop keeping the server clock offset in sync."""
+        if self.__secret is not None:
+            self.__secret.stop()
 
     def order(
         self,
@@ -173,7 +199,8 @@ class Trade:
             timeInForce=_timeInForce, quantity=quantity,
             quoteOrderQty=quoteOrderQty, newClientOrderId=newClientOrderId,
             price=price, stopPrice=stopPrice, icebergQty=icebergQty,
-            newOrderRespType=newOrderRespType, recvWindow=recvWindow
+            newOrderRespType=newOrderRespType, recvWindow=recvWindow,
+            session=self._session
         )
 
     def testOrder(
@@ -316,7 +343,8 @@ class Trade:
             timeInForce=_timeInForce, quantity=quantity,
             quoteOrderQty=quoteOrderQty, newClientOrderId=newClientOrderId,
             price=price, stopPrice=stopPrice, icebergQty=icebergQty,
-            newOrderRespType=newOrderRespType, recvWindow=recvWindow
+            newOrderRespType=newOrderRespType, recvWindow=recvWindow,
+            session=self._session
         )
 
     def myTrades(
@@ -398,7 +426,8 @@ class Trade:
         return get(
             self._url, 'myTrades', key=self.__key, secret=self.__secret,
             symbol=symbol.upper(), startTime=startTime, endTime=endTime,
-            fromId=fromId, limit=limit, recvWindow=recvWindow
+            fromId=fromId, limit=limit, recvWindow=recvWindow,
+            session=self._session
         )
 
     def cancelOrder(
@@ -470,7 +499,8 @@ class Trade:
             orderId=orderId,
             origClientOrderId=origClientOrderId,
             newClientOrderId=newClientOrderId,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def cancelAllOpenOrders(
@@ -529,7 +559,8 @@ class Trade:
             key=self.__key,
             secret=self.__secret,
             symbol=symbol.upper(),
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def queryOrder(
@@ -603,7 +634,8 @@ class Trade:
             symbol=symbol.upper(),
             orderId=orderId,
             origClientOrderId=origClientOrderId,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def openOrders(
@@ -668,7 +700,8 @@ class Trade:
             key=self.__key,
             secret=self.__secret,
             symbol=symbol.upper() if symbol else None,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def allOrders(
@@ -762,7 +795,8 @@ class Trade:
             startTime=startTime,
             endTime=endTime,
             limit=limit,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def account(
@@ -814,7 +848,8 @@ class Trade:
             'account',
             key=self.__key,
             secret=self.__secret,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def oco(
@@ -998,7 +1033,8 @@ class Trade:
             stopIcebergQty=stopIcebergQty,
             stopLimitTimeInForce=stopLimitTimeInForce,
             newOrderRespType=newOrderRespType,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def cancelOrderList(
@@ -1111,7 +1147,8 @@ class Trade:
             orderListId=orderListId,
             listClientOrderId=listClientOrderId,
             newClientOrderId=newClientOrderId,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def allOrderList(
@@ -1241,7 +1278,8 @@ class Trade:
             startTime=startTime,
             endTime=endTime,
             limit=limit,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def orderList(
@@ -1307,7 +1345,8 @@ class Trade:
             secret=self.__secret,
             orderListId=orderListId,
             origClientOrderId=origClientOrderId,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
     def openOrderList(
@@ -1362,7 +1401,8 @@ class Trade:
             'openOrderList',
             key=self.__key,
             secret=self.__secret,
-            recvWindow=recvWindow
+            recvWindow=recvWindow,
+            session=self._session
         )
 
 
@@ -7,18 +7,26 @@ Author: Vitali Lupusor
 
 # Import standard modules
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 # Import local modules
 from ..helpers import get  # type: ignore
+from ..helpers.session import Session  # type: ignore
 from ..helpers.type_literals import KlineInterval, OrderBookLimit  # type: ignore # noqa: E501
 
+if TYPE_CHECKING:
+    # Import third-party modules
+    import numpy
+
 
 class MarketData:
     """Collection of `Market Data Endpoint` APIs."""
 
     def __init__(
-        self, key: Optional[str] = None, url: Optional[str] = None
+        self,
+        key: Optional[str] = None,
+        url: Optional[str] = None,
+        session: Optional[Session] = None
     ) -> None:
         """
         Initialise the class.
@@ -30,9 +38,14 @@ class MarketData:
 
             url (Optional[str]):
                 Server URL.
+
+            session (Optional[Session]):
+                Pooled HTTP session to send the requests through.
+                Defaults to a new session.
         """
         self.__key = key
         self._url = url
+        self._session = session or Session()
 
     def serverTime(self) -> datetime:
         """
@@ -46,7 +59,7 @@ class MarketData:
             (datetime.datetime)
             Current server time.
         """
-        response = get(self._url, endpoint='time')
+        response = get(self._url, endpoint='time', session=self._session)
 
         return datetime.fromtimestamp(response['serverTime'] / 1000)
 
@@ -78,7 +91,9 @@ class MarketData:
             .replace('\'', '"') \
             if symbols else None
 
-        return get(self._url, 'exchangeInfo', symbols=_symbols)
+        return get(
+            self._url, 'exchangeInfo', symbols=_symbols, session=self._session
+        )
 
     def orderBook(
         self, symbol: str, limit: OrderBookLimit = 100
@@ -125,7 +140,10 @@ class MarketData:
                 ]
             }
         """
-        return get(self._url, 'depth', symbol=symbol.upper(), limit=limit)
+        return get(
+            self._url, 'depth', symbol=symbol.upper(), limit=limit,
+            session=self._session
+        )
 
     def recentTrades(
         self, symbol: str, limit: int = 500
@@ -163,7 +181,10 @@ class MarketData:
                 }
             ]
         """
-        return get(self._url, 'trades', symbol=symbol.upper(), limit=limit)
+        return get(
+            self._url, 'trades', symbol=symbol.upper(), limit=limit,
+            session=self._session
+        )
 
     def tradeLookup(
         self,
@@ -209,7 +230,8 @@ class MarketData:
         """
         return get(
             self._url, 'historicalTrades', symbol=symbol.upper(), limit=limit,
-            fromId=fromId, key=self.__key
+            fromId=fromId, key=self.__key,
+            session=self._session
         )
 
     def aggTrades(
@@ -280,17 +302,19 @@ class MarketData:
 
         return get(
             self._url, 'aggTrades', symbol=symbol.upper(), limit=limit,
-            fromId=fromId, startTime=_startTime, endTime=_endTime
+            fromId=fromId, startTime=_startTime, endTime=_endTime,
+            session=self._session
         )
 
     def klines(
         self,
         symbol: str,
         interval: KlineInterval,
-        startTime: Optional[Union[str, date, datetime]] = None,
-        endTime: Optional[Union[str, date, datetime]] = None,
+        startTime: Optional[Union[int, str, date, datetime]] = None,
+        endTime: Optional[Union[int, str, date, datetime]] = None,
         limit: int = 500,
-    ) -> List[List[Any]]:
+        as_array: bool = False
+    ) -> Union[List[List[Any]], 'numpy.ndarray']:
         """
         Get kline/candlestick bars for a symbol.
 
@@ -313,22 +337,29 @@ class MarketData:
                     '8h', '12h', '1d', '3d', '1w', '1M'
                 ].
 
-            startTime (Optional[Union[str, datetime.date, datetime.datetime]]):
-                Date/datetime object or thereof string representation to get
-                aggregate trades from. INCLUSIVE.
+            startTime (Optional[Union[int, str, date, datetime]]):
+                Timestamp in milliseconds, date/datetime object or thereof
+                string representation to get klines from. INCLUSIVE.
 
-            endTime (Optional[Union[str, datetime.date, datetime.datetime]]):
-                Date/datetime object or thereof string representation to get
-                aggregate trades until. INCLUSIVE.
+            endTime (Optional[Union[int, str, date, datetime]]):
+                Timestamp in milliseconds, date/datetime object or thereof
+                string representation to get klines until. INCLUSIVE.
 
             limit (int):
                 TODO: Add description.
                 Takes values between `1` and `1000`.
                 Defaults to `500`.
 
+            as_array (bool):
+                Return the klines as a NumPy structured array of
+                `helpers.klines.KLINE_DTYPE`, with timestamps in
+                milliseconds as `int64` and prices and volumes as
+                `float64`. Requires `numpy`.
+                Defaults to `False`.
+
         Returns
         -------
-            (List[List[Any]])
+            (Union[List[List[Any]], numpy.ndarray])
             TODO: Add description.
 
             [
@@ -354,10 +385,17 @@ class MarketData:
         _startTime = to_timestamp(startTime) if startTime else None
         _endTime = to_timestamp(endTime) if endTime else None
 
-        return get(
+        klines = get(
             self._url, 'klines', symbol=symbol.upper(), interval=interval,
-            startTime=_startTime, endTime=_endTime, limit=limit
+            startTime=_startTime, endTime=_endTime, limit=limit,
+            session=self._session
         )
+        if as_array:
+            # Import local modules
+            from ..helpers.klines import klines_to_array  # type: ignore
+
+            return klines_to_array(klines)
+        return klines
 
     def avgPrice(self, symbol: str) -> Dict[str, Any]:
         """
@@ -381,7 +419,9 @@ class MarketData:
                 "price": "9.35751834"
             }
         """
-        return get(self._url, 'avgPrice', symbol=symbol.upper())
+        return get(
+            self._url, 'avgPrice', symbol=symbol.upper(), session=self._session
+        )
 
     def priceTicker24(
         self, symbol: Optional[str] = None
@@ -428,7 +468,9 @@ class MarketData:
             }
         """
         symbol = symbol.upper() if symbol else None
-        return get(self._url, 'ticker/24hr', symbol=symbol)
+        return get(
+            self._url, 'ticker/24hr', symbol=symbol, session=self._session
+        )
 
     def currentPrice(
         self, symbol: Optional[str] = None
@@ -459,7 +501,9 @@ class MarketData:
             }
         """
         symbol = symbol.upper() if symbol else None
-        return get(self._url, 'ticker/price', symbol=symbol)
+        return get(
+            self._url, 'ticker/price', symbol=symbol, session=self._session
+        )
 
     def bookTicker(
         self, symbol: Optional[str] = None
@@ -492,7 +536,10 @@ class MarketData:
             }
         """
         symbol = symbol.upper() if symbol else None
-        return get(self._url, 'ticker/bookTicker', symbol=symbol)
+        return get(
+            self._url, 'ticker/bookTicker', symbol=symbol,
+            session=self._session
+        )
 
 
-del(Any, Dict, List, Optional, Union, date)  # type: ignore
+del(TYPE_CHECKING, Any, Dict, List, Optional, Union, date)  # type: ignore
@@ -6,8 +6,12 @@ Author: Vitali Lupusor
 """
 
 # Import standard modules
-from datetime import date, datetime
-from typing import Any, Optional, Union
+from typing import Any, Optional
+
+# Import local modules
+from .requests import request
+from .session import Session
+from .timestamps import to_timestamp, to_timestamps  # noqa: F401
 
 
 def get(
@@ -15,6 +19,7 @@ def get(
     endpoint: str,
     key: Optional[str] = None,
     secret: Optional[str] = None,
+    session: Optional[Session] = None,
     **params: Any
 ) -> Any:
     """
@@ -36,6 +41,10 @@ def get(
             Binance API secret.
             Defaults to `None`.
 
+        session (Optional[Session]):
+            Pooled HTTP session to send the request through.
+            Defaults to the session shared by the whole process.
+
         **params (Any):
             symbol (str):
                 Currency symbol.
@@ -68,10 +77,18 @@ def get(
         (Any)
         TODO: Add description.
     """
-    # Import local modules
-    from .requests import request
+    cache = getattr(session, 'cache', None)
+    # Signed (account) calls are never cached
+    if cache is None or secret or not cache.caches(endpoint):
+        return request('get', url, endpoint, key, secret, session, **params)
 
-    return request('get', url, endpoint, key, secret, **params)
+    params_key = tuple(sorted(
+        (name, repr(value)) for name, value in params.items()
+    ))
+    return cache.fetch(
+        endpoint, (url, params_key),
+        lambda: request('get', url, endpoint, key, secret, session, **params)
+    )
 
 
 def post(
@@ -79,6 +96,7 @@ def post(
     endpoint: str,
     key: Optional[str] = None,
     secret: Optional[str] = None,
+    session: Optional[Session] = None,
     **params: Any
 ) -> Any:
     """
@@ -100,6 +118,10 @@ def post(
             Binance API secret.
             Defaults to `None`.
 
+        session (Optional[Session]):
+            Pooled HTTP session to send the request through.
+            Defaults to the session shared by the whole process.
+
         **params (Any):
             symbol (str):
                 Currency symbol.
@@ -132,10 +154,7 @@ def post(
         (Any)
         TODO: Add description.
     """
-    # Import local modules
-    from .requests import request
-
-    return request('post', url, endpoint, key, secret, **params)
+    return request('post', url, endpoint, key, secret, session, **params)
 
 
 def delete(
@@ -143,6 +162,7 @@ def delete(
     endpoint: str,
     key: Optional[str] = None,
     secret: Optional[str] = None,
+    session: Optional[Session] = None,
     **params: Any
 ) -> Any:
     """
@@ -164,6 +184,10 @@ def delete(
             Binance API secret.
             Defaults to `None`.
 
+        session (Optional[Session]):
+            Pooled HTTP session to send the request through.
+            Defaults to the session shared by the whole process.
+
         **params (Any):
             symbol (str):
                 Currency symbol.
@@ -188,64 +212,7 @@ def delete(
         (Any)
         TODO: Add description.
     """
-    # Import local modules
-    from .requests import request
-
-    return request('delete', url, endpoint, key, secret, **params)
-
-
-def to_timestamp(
-    value: Union[str, date, datetime],
-    datetime_format: Optional[str] = None
-) -> int:
-    """
-    Convert date/datetime object or thereof string representation to timestamp.
-
-    The timestamp is equal to the number of milliseconds passed since
-    `1990-01-01 00:00:00`.
-
-    Parameters
-    ----------
-        value (Union[str, datetime.date, datetime.datetime]):
-            Date/datetime object or thereof string representation
+    return request('delete', url, endpoint, key, secret, session, **params)
 
-        datetime_format (str):
-            If `value` is provided as a string representation of `datetime`,
-            a pythonic datetime-format string can be provided.
-            Example: `'%Y-%m-%d %H:%M:%S'` for UTC datetime format
-            (2021-01-01 00:00:00).
-            If not provided, the function will attempt to autodetect the
-            format. Defaults to `None`.
 
-    Returns
-    -------
-        (int)
-        Timestamp in milliseconds instance of the provided `value`.
-    """
-    if not datetime_format:
-        date_parts = ['%Y-%m-%d', '%d-%m-%Y']
-        time_parts = [' %H:%M:%S', 'T%H:%M:%S', "'T'%H:%M:%S"]
-        offset_parts = ['', '.%f', '%z', ' %Z', '.%f%z', '.%f %Z']
-        validFormats = [
-            date_part+time_offset_part for date_part in date_parts
-            for time_offset_part in ['']+[
-                time_part+offset_part for time_part in time_parts
-                for offset_part in offset_parts
-            ]
-        ]
-    else:
-        validFormats = [datetime_format]
-
-    if isinstance(value, str):
-        for strformat in validFormats:
-            try:
-                value = datetime.strptime(value, strformat)  # type: ignore
-            except ValueError:
-                pass
-            else:
-                break
-
-    return int(datetime.timestamp(value)*1000)  # type: ignore
-
-
-del(Any, Optional, Union, date)
+del(Any, Optional)
@@ -0,0 +1,135 @@
+"""
+Response cache for slow-changing data.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Flight:
+    """A request in progress, awaited by every identical request."""
+
+    def __init__(self) -> None:
+        """Initialise the flight, not landed yet."""
+        self.landed = threading.Event()
+        self.response: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """
+    Time-to-live cache of responses, with least recently used eviction.
+
+    Only endpoints with a time to live (in seconds) are cached. Identical
+    requests made while one is already in progress wait for its response
+    rather than sending their own, so many threads or tasks asking for
+    the same thing at once cost a single request.
+
+    Cached responses are shared by every caller and must not be modified.
+    """
+
+    # Seconds responses are kept for, by endpoint
+    TTLS = {
+        'exchangeInfo': 300.,
+        'time': 1.,
+    }
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_size: int = 256
+    ) -> None:
+        """
+        Initialise the cache.
+
+        Parameters
+        ----------
+            ttls (Optional[Dict[str, float]]):
+                Seconds responses are kept for, by endpoint, on top of (or
+                instead of) `TTLS`. Set an endpoint to `0` not to cache it.
+
+            max_size (int):
+                Most responses kept. The least recently used one is dropped
+                to make room for a new one.
+                Defaults to `256`.
+        """
+        self.ttls = {**self.TTLS, **(ttls or {})}
+        self.max_size = max_size
+        self.responses: OrderedDict = OrderedDict()
+        self.flights: Dict[Hashable, _Flight] = {}
+        self.lock = threading.Lock()
+
+    def caches(self, endpoint: str) -> bool:
+        """Whether the responses of `endpoint` are cached."""
+        return self.ttls.get(endpoint, 0) > 0
+
+    def fetch(
+        self, endpoint: str, key: Hashable, send: Callable[[], Any]
+    ) -> Any:
+        """
+        Return the cached response to a request, sending it if needed.
+
+        Parameters
+        ----------
+            endpoint (str):
+                Server endpoint for the API call.
+
+            key (Hashable):
+                Identifies the request among those of the same endpoint.
+
+            send (Callable[[], Any]):
+                Sends the request and returns its response.
+
+        Returns
+        -------
+            (Any)
+            The response.
+        """
+        key = (endpoint, key)
+        with self.lock:
+            cached = self.responses.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.responses.move_to_end(key)
+                return cached[1]
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = _Flight()
+
+        if not leader:
+            flight.landed.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = send()
+        except BaseException as error:
+            flight.error = error
+            raise
+        else:
+            with self.lock:
+                self.responses[key] = (
+                    time.monotonic() + self.ttls[endpoint], flight.response
+                )
+                self.responses.move_to_end(key)
+                while len(self.responses) > self.max_size:
+                    self.responses.popitem(last=False)
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.landed.set()
+        return flight.response
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self.lock:
+            self.responses.clear()
+
+
+del(Callable, )
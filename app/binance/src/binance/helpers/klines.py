@@ -0,0 +1,95 @@
+"""
+Typed NumPy arrays of klines.
+
+Requires `numpy`.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+from typing import Any, List, Sequence
+
+# Import third-party modules
+import numpy
+
+# Layout of a kline, one record per kline. The trailing "Ignore" field
+# of the API response is left out.
+KLINE_DTYPE = numpy.dtype([
+    ('open_time', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+    ('close_time', 'i8'),
+    ('quote_volume', 'f8'),
+    ('trades', 'i8'),
+    ('taker_buy_volume', 'f8'),
+    ('taker_buy_quote_volume', 'f8'),
+])
+
+
+def klines_to_array(klines: List[List[Any]]) -> numpy.ndarray:
+    """
+    Convert klines, as decoded from the API response, to a typed array.
+
+    Parameters
+    ----------
+        klines (List[List[Any]]):
+            Klines in the format returned by `MarketData.klines`.
+
+    Returns
+    -------
+        (numpy.ndarray)
+        The klines, as records of `KLINE_DTYPE`, with timestamps in
+        milliseconds as `int64` and prices and volumes as `float64`.
+    """
+    array = numpy.empty(len(klines), dtype=KLINE_DTYPE)
+    if not klines:
+        return array
+    # Converting one column at a time lets NumPy parse the price strings
+    # in bulk, rather than one record at a time.
+    for name, column in zip(KLINE_DTYPE.names, zip(*klines)):
+        array[name] = numpy.array(column, dtype=KLINE_DTYPE[name])
+    return array
+
+
+def concat_klines(pages: Sequence[numpy.ndarray]) -> numpy.ndarray:
+    """
+    Join pages of klines, oldest first, into one array.
+
+    Klines already in an earlier page (by open time) are dropped, so pages
+    may overlap. The result is allocated once and each page copied into
+    place, rather than growing it one page at a time.
+
+    Parameters
+    ----------
+        pages (Sequence[numpy.ndarray]):
+            Pages of klines as returned by `klines_to_array`, in time order.
+
+    Returns
+    -------
+        (numpy.ndarray)
+        The klines of every page, without duplicates.
+    """
+    kept = []
+    last_open = None
+    for page in pages:
+        if last_open is not None:
+            # A view past the overlap, pages are sorted by open time
+            page = page[numpy.searchsorted(
+                page['open_time'], last_open, side='right'
+            ):]
+        if len(page):
+            last_open = page['open_time'][-1]
+            kept.append(page)
+
+    klines = numpy.empty(sum(len(page) for page in kept), dtype=KLINE_DTYPE)
+    position = 0
+    for page in kept:
+        klines[position:position + len(page)] = page
+        position += len(page)
+    return klines
+
+
+del(Any, List, Sequence)
@@ -0,0 +1,165 @@
+"""
+Request weight rate limiting.
+
+Binance caps the request weight an IP address may use per minute, and
+bans addresses that keep going over it. Every call is charged against a
+budget shared by the whole process before it is sent, so calls made from
+several threads or tasks together stay within the cap.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+from urllib.parse import urlsplit
+
+# Import third-party modules
+from requests import Response
+
+
+def _depth_weight(params: Dict[str, Any]) -> int:
+    """Weight of an `orderBook` call, which grows with its `limit`."""
+    limit = params.get('limit') or 100
+    if limit <= 100:
+        return 1
+    if limit <= 500:
+        return 5
+    if limit <= 1000:
+        return 10
+    return 50
+
+
+def _all_symbols(single: int, every: int) -> Callable[[Dict[str, Any]], int]:
+    """Weight of a call costing more when the `symbol` is omitted."""
+    def weight(params: Dict[str, Any]) -> int:
+        return single if params.get('symbol') else every
+
+    return weight
+
+
+# Request weight of each call, by HTTP method and endpoint, as documented
+# in `MarketData` and `Trade`. Calls not listed weigh 1.
+WEIGHTS: Dict[
+    str, Dict[str, Union[int, Callable[[Dict[str, Any]], int]]]
+] = {
+    'get': {
+        'exchangeInfo': 10,
+        'depth': _depth_weight,
+        'historicalTrades': 5,
+        'ticker/24hr': _all_symbols(1, 40),
+        'ticker/price': _all_symbols(1, 2),
+        'ticker/bookTicker': _all_symbols(1, 2),
+        'myTrades': 10,
+        'order': 2,
+        'openOrders': _all_symbols(3, 40),
+        'allOrders': 10,
+        'account': 10,
+        'orderList': 2,
+        'allOrderList': 10,
+        'openOrderList': 3,
+    },
+}
+
+
+def request_weight(method: str, endpoint: str, params: Dict[str, Any]) -> int:
+    """Return the request weight of a call."""
+    weight = WEIGHTS.get(method, {}).get(endpoint, 1)
+    return weight(params) if callable(weight) else weight
+
+
+class WeightLimiter:
+    """
+    Token bucket of request weight, refilled over a minute.
+
+    Up to `weight_per_minute` can be spent at once, and spent weight comes
+    back at an even rate over the following minute. Callers block until
+    the weight of their call is available.
+
+    The bucket is kept in line with the weight the server says has been
+    used (`X-MBX-USED-WEIGHT-1M` header), which also counts calls made by
+    other processes from the same address.
+    """
+
+    # Request weight Binance allows per minute
+    WEIGHT_PER_MINUTE = 1200
+
+    # Header reporting the weight used in the current minute
+    USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'
+
+    def __init__(self, weight_per_minute: Optional[int] = None) -> None:
+        """
+        Initialise the limiter, with a full bucket.
+
+        Parameters
+        ----------
+            weight_per_minute (Optional[int]):
+                Request weight that may be used per minute.
+                Defaults to `WEIGHT_PER_MINUTE`.
+        """
+        self.weight_per_minute = weight_per_minute or self.WEIGHT_PER_MINUTE
+        self.tokens = float(self.weight_per_minute)
+        self.refilled = time.monotonic()
+        self.blocked_until = 0.
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the weight that came back since the last refill."""
+        self.tokens = min(
+            self.weight_per_minute,
+            self.tokens
+            + (now - self.refilled) * self.weight_per_minute / 60
+        )
+        self.refilled = now
+
+    def acquire(self, weight: int) -> None:
+        """Block until `weight` is available, then spend it."""
+        # A call heavier than the whole budget waits for a full bucket
+        weight = min(weight, self.weight_per_minute)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                wait = max(
+                    self.blocked_until - now,
+                    (weight - self.tokens) * 60 / self.weight_per_minute
+                )
+            time.sleep(wait)
+
+    def update(self, response: Response) -> None:
+        """Correct the bucket from the server's response headers."""
+        used = response.headers.get(self.USED_WEIGHT_HEADER)
+        retry_after = response.headers.get('Retry-After')
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if used is not None:
+                self.tokens = min(
+                    self.tokens, self.weight_per_minute - int(used)
+                )
+            # Over the limit (429) or banned (418): wait as long as told
+            if response.status_code in (418, 429):
+                self.tokens = min(self.tokens, 0.)
+                if retry_after is not None:
+                    self.blocked_until = now + float(retry_after)
+
+
+# Limiter of each server, shared by the whole process
+_limiters: Dict[str, WeightLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter(url: str) -> WeightLimiter:
+    """Return the limiter shared by every call to the server at `url`."""
+    server = urlsplit(url).netloc
+    with _limiters_lock:
+        if server not in _limiters:
+            _limiters[server] = WeightLimiter()
+        return _limiters[server]
+
+
+del(Callable, Optional, Union)
@@ -6,15 +6,27 @@ Author: Vitali Lupusor
 """
 
 # Import standard modules
-from requests import Response
+import json
+from functools import wraps
 from typing import Any, Callable, Literal, Optional, Union
 
+# Import third-party modules
+from requests import Response
+try:
+    # Decodes large responses, such as pages of klines, several times faster
+    from orjson import loads
+except ImportError:
+    from json import loads
+from requests.exceptions import RequestException
+
+# Import local modules
+from .rate_limit import limiter, request_weight
+from .session import Session, default_session
+from .sign_request import Signer, sign
+
 
 def response_handler(func: Callable[..., Any]) -> Callable[..., Any]:
     """TODO: Add description."""
-    # Import standard modules
-    from functools import wraps
-
     @wraps(func)
     def wrapper_response_handler(
         *args: Any, **kwargs: Any
@@ -70,10 +82,6 @@ def response_handler(func: Callable[..., Any]) -> Callable[..., Any]:
             (Union[dict, list])
             TODO: Add description.
         """
-        # Import standard modules
-        import json
-        from requests.exceptions import RequestException
-
         response = func(*args, **kwargs)
 
         if not response.ok:
@@ -88,7 +96,7 @@ def response_handler(func: Callable[..., Any]) -> Callable[..., Any]:
             )
             raise RequestException(err)
 
-        return response.json()
+        return loads(response.content)
 
     return wrapper_response_handler
 
@@ -99,7 +107,8 @@ def request(
     url: str,
     endpoint: str,
     key: Optional[str] = None,
-    secret: Optional[str] = None,
+    secret: Optional[Union[str, Signer]] = None,
+    session: Optional[Session] = None,
     **params: Any
 ) -> Response:
     """
@@ -117,6 +126,14 @@ def request(
             Binance API key.
             Defaults to `None`.
 
+        secret (Optional[Union[str, Signer]]):
+            Binance API secret, or a `Signer` holding it.
+            Defaults to `None`.
+
+        session (Optional[Session]):
+            Pooled HTTP session to send the request through.
+            Defaults to the session shared by the whole process.
+
         **params (Any):
             symbol (str):
                 Currency symbol.
@@ -149,21 +166,27 @@ def request(
         (requests.models.Response)
         TODO: Add description.
     """
-    # Import standard modules
-    import requests
-
-    # Import local modules
-    from .sign_request import sign
-
     # Configure parameters
     _url = '/'.join([url, endpoint])
     _headers = {'X-MBX-APIKEY': key} if key else None
     _params = params
 
-    if secret:
+    if isinstance(secret, Signer):
+        _params = secret.sign(params)
+    elif secret:
         _params = sign(secret, **params)
 
-    return requests.request(method, url=_url, headers=_headers, params=_params)
+    _session = session or default_session()
+    _limiter = limiter(url)
+
+    # Wait for the weight of the call to be available before sending it
+    _limiter.acquire(request_weight(method, endpoint, params))
+    response = _session.request(
+        method, url=_url, headers=_headers, params=_params
+    )
+    _limiter.update(response)
+
+    return response
 
 
 del(Callable, Literal, Response)
@@ -0,0 +1,85 @@
+"""
+Pooled HTTP session.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+from threading import Lock
+from typing import Any
+
+# Import third-party modules
+from requests import Response, Session as _Session
+from requests.adapters import HTTPAdapter
+
+
+class Session(_Session):
+    """
+    HTTP session keeping a pool of open connections to the server.
+
+    Every call made through the same session reuses an open (keep-alive)
+    connection when there is one, rather than paying for a new TCP and
+    TLS handshake each time.
+    """
+
+    def __init__(
+        self, pool_size: int = 10, timeout: float = 10., max_retries: int = 0
+    ) -> None:
+        """
+        Initialise the session.
+
+        Parameters
+        ----------
+            pool_size (int):
+                Maximum number of connections kept open to the server.
+                Defaults to `10`.
+
+            timeout (float):
+                Seconds to wait for the server to connect and to answer,
+                unless a call says otherwise. Defaults to `10`.
+
+            max_retries (int):
+                Number of times failed connections are retried.
+                Defaults to `0`.
+        """
+        super().__init__()
+        self.timeout = timeout
+        # Optional `ResponseCache` of the calls made through the session
+        self.cache = None
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size,
+            max_retries=max_retries
+        )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(  # type: ignore
+        self, method: str, url: str, **kwargs: Any
+    ) -> Response:
+        """Send a request, with the session's timeout by default."""
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+# Session used by calls not given one, shared by the whole process
+_default_session = None
+# Held while the shared session is created, so threads share one session
+_default_session_lock = Lock()
+
+
+def default_session() -> Session:
+    """
+    Return the session shared by calls not given one.
+
+    The session is created on first use. Threads calling this at the
+    same time all get the same session.
+    """
+    global _default_session
+    if _default_session is None:
+        with _default_session_lock:
+            if _default_session is None:
+                _default_session = Session()
+    return _default_session
+
+
+del(Any, Lock, Response)
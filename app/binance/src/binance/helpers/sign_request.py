@@ -1,18 +1,155 @@
 """
-TODO: Add description.
+Signing of `SIGNED` (account and trade) requests.
 
 Date: 2021-05-23
 Author: Vitali Lupusor
 """
 
 # Import standard modules
-from typing import Any, Union
+import hmac
+import logging
+import threading
+import time
+from hashlib import sha256
+from typing import Any, Callable, Dict, Optional, Union
+from urllib.parse import quote_plus
+
+logger = logging.getLogger(__name__)
+
+
+def _query(params: Dict[str, Any]) -> str:
+    """URL-encode parameters, as `urllib.parse.urlencode` would."""
+    return '&'.join([
+        f'{name}={quote_plus(str(value))}' for name, value in params.items()
+    ])
+
+
+class Signer:
+    """
+    Sign requests with a Binance API secret.
+
+    The HMAC key is prepared once, and only copied for each request.
+    Timestamps follow the server's clock rather than the local one: the
+    offset between the two is measured from `serverTime` and smoothed
+    over several measurements, so a drifting local clock does not get
+    orders rejected for falling outside their `recvWindow`.
+    """
+
+    # Milliseconds a signed request is valid for, unless it says otherwise
+    RECV_WINDOW = 5000
+
+    # Seconds between two measurements of the server clock offset
+    SYNC_INTERVAL = 60.
+
+    # Weight of a new measurement in the smoothed offset
+    SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        secret: Union[bytes, str],
+        server_time: Optional[Callable[[], int]] = None
+    ) -> None:
+        """
+        Initialise the signer.
+
+        Parameters
+        ----------
+            secret (Union[bytes, str]):
+                Binance API secret.
+
+            server_time (Optional[Callable[[], int]]):
+                Returns the server time, as a timestamp in milliseconds.
+                When given, the clock offset is measured before the first
+                request is signed, then refreshed in the background every
+                `SYNC_INTERVAL` seconds. Defaults to `None`, to use the
+                local clock as it is.
+        """
+        _secret = secret if isinstance(secret, bytes) \
+            else secret.encode('utf-8')
+        self._hmac = hmac.new(_secret, digestmod=sha256)
+        self.server_time = server_time
+        self.offset: Optional[float] = None
+        self._syncing: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def measure_offset(self) -> None:
+        """Measure the offset of the server clock, and smooth it in."""
+        sent = time.time() * 1000
+        server_time = self.server_time()
+        received = time.time() * 1000
+        # The server read its clock about halfway through the round trip
+        offset = server_time - (sent + received) / 2
+        with self._lock:
+            if self.offset is None:
+                self.offset = offset
+            else:
+                self.offset += self.SMOOTHING * (offset - self.offset)
+
+    def _sync(self) -> None:
+        """Refresh the clock offset until stopped."""
+        while not self._stop.wait(self.SYNC_INTERVAL):
+            try:
+                self.measure_offset()
+            except Exception as error:
+                logger.warning(f"Could not measure the server time: {error}")
+
+    def start(self) -> None:
+        """Measure the clock offset, then keep it fresh in the background."""
+        with self._lock:
+            if self._syncing is not None or self.server_time is None:
+                return
+            self._syncing = threading.Thread(
+                target=self._sync, name='binance-clock-sync', daemon=True
+            )
+        try:
+            self.measure_offset()
+        except Exception as error:
+            logger.warning(f"Could not measure the server time: {error}")
+        self._syncing.start()
+
+    def stop(self) -> None:
+        """Stop refreshing the clock offset."""
+        self._stop.set()
+
+    def timestamp(self) -> int:
+        """Return the current server time, in milliseconds."""
+        if self._syncing is None and self.server_time is not None:
+            self.start()
+        return int(time.time() * 1000 + (self.offset or 0.))
+
+    def sign(self, params: Dict[str, Any]) -> str:
+        """
+        Create a `timestamp` based HMAC signature.
+
+        Parameters
+        ----------
+            params (Dict[str, Any]):
+                Request parameters. Those with no values are left out.
+
+        Returns
+        -------
+            (str)
+            The URL-encoded request parameters, with `recvWindow`,
+            `timestamp` and `signature`.
+        """
+        _params = {key: value for key, value in params.items() if value}
+        if 'recvWindow' not in _params:
+            _params['recvWindow'] = self.RECV_WINDOW
+        _params['timestamp'] = self.timestamp()
+
+        query = _query(_params)
+        signature = self._hmac.copy()
+        signature.update(query.encode('utf-8'))
+        return f'{query}&signature={signature.hexdigest()}'
 
 
 def sign(secret: Union[bytes, str], **params: Any) -> dict:
     """
     Create a `timestamp` based HMAC signature.
 
+    Uses the local clock. Prefer a `Signer` to sign many requests.
+
     Parameters
     ----------
         secret (Union[bytes, str]):
@@ -24,7 +161,6 @@ def sign(secret: Union[bytes, str], **params: Any) -> dict:
         Request parameters with `HMAC` signature.
     """
     # Import standard modules
-    import hmac
     from datetime import datetime
     from urllib.parse import urlencode
 
@@ -53,4 +189,4 @@ def sign(secret: Union[bytes, str], **params: Any) -> dict:
     return _params
 
 
-del(Any, Union)
+del(Callable, Union)
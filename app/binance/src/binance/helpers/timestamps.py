@@ -0,0 +1,259 @@
+"""
+Conversion of dates and datetimes to timestamps.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+import time as clock
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Formats tried when none is given, most common first
+_DATE_PARTS = ['%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y']
+_TIME_PARTS = [' %H:%M:%S', 'T%H:%M:%S', "'T'%H:%M:%S"]
+_OFFSET_PARTS = ['', '.%f', '%z', ' %Z', '.%f%z', '.%f %Z']
+DATETIME_FORMATS: List[str] = [
+    date_part + time_offset_part for date_part in _DATE_PARTS
+    for time_offset_part in [''] + [
+        time_part + offset_part for time_part in _TIME_PARTS
+        for offset_part in _OFFSET_PARTS
+    ]
+] + [
+    # As found in CSV exports, e.g. `13/04/2021 00:00`, `2021-04-13 12-AM`
+    '%d/%m/%Y %H:%M', '%Y-%m-%d %H:%M', '%Y-%m-%d %I-%p'
+]
+
+# Format found for each shape of string (digits replaced by `d`)
+_formats: Dict[str, str] = {}
+_DIGITS = str.maketrans('0123456789', 'dddddddddd')
+
+# Most digits of the fields `to_timestamps` reads without `strptime`
+_FIELD_WIDTHS = {'Y': 4, 'm': 2, 'd': 2, 'H': 2, 'I': 2, 'M': 2, 'S': 2}
+
+
+def datetime_format_of(value: str) -> str:
+    """
+    Find the format of a string representation of a date/datetime.
+
+    The format found is remembered for every string of the same shape,
+    e.g. `2021-04-13 00:00:00` and `2020-12-31 23:59:59`, so it is only
+    looked for once.
+
+    Parameters
+    ----------
+        value (str):
+            String representation of a date/datetime.
+
+    Raises
+    ------
+        ValueError
+            When `value` is in none of the `DATETIME_FORMATS`.
+
+    Returns
+    -------
+        (str)
+        The format of `value`.
+    """
+    shape = value.translate(_DIGITS)
+    datetime_format = _formats.get(shape)
+    if datetime_format is None:
+        for candidate in DATETIME_FORMATS:
+            try:
+                datetime.strptime(value, candidate)
+            except ValueError:
+                continue
+            datetime_format = _formats[shape] = candidate
+            break
+        else:
+            raise ValueError(f'Unknown date/datetime format: {value!r}')
+    return datetime_format
+
+
+def to_timestamp(
+    value: Union[int, str, date, datetime],
+    datetime_format: Optional[str] = None
+) -> int:
+    """
+    Convert date/datetime object or thereof string representation to timestamp.
+
+    The timestamp is equal to the number of milliseconds passed since
+    `1970-01-01 00:00:00` UTC. Dates and datetimes with no time zone are
+    taken in local time.
+
+    Parameters
+    ----------
+        value (Union[int, str, datetime.date, datetime.datetime]):
+            Date/datetime object or thereof string representation.
+            Integers are taken as timestamps in milliseconds already.
+
+        datetime_format (str):
+            If `value` is provided as a string representation of `datetime`,
+            a pythonic datetime-format string can be provided.
+            Example: `'%Y-%m-%d %H:%M:%S'` for UTC datetime format
+            (2021-01-01 00:00:00).
+            If not provided, the function will attempt to autodetect the
+            format. Defaults to `None`.
+
+    Returns
+    -------
+        (int)
+        Timestamp in milliseconds instance of the provided `value`.
+    """
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, str):
+        value = datetime.strptime(
+            value, datetime_format or datetime_format_of(value)
+        )
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+
+    return int(datetime.timestamp(value)*1000)  # type: ignore
+
+
+def _field_positions(
+    value: str, datetime_format: str
+) -> Optional[Dict[str, slice]]:
+    """
+    Locate the fields of a format in a string.
+
+    Returns `None` when the format has fields other than numbers and
+    AM/PM, which are left to `pandas.to_datetime`.
+    """
+    fields = {}
+    position = 0
+    directives = iter(datetime_format)
+    for character in directives:
+        if character != '%':
+            position += 1
+            continue
+        directive = next(directives, '')
+        if directive == 'p':
+            width = 2
+        elif directive in _FIELD_WIDTHS:
+            width = 0
+            while (
+                width < _FIELD_WIDTHS[directive]
+                and value[position + width:position + width + 1].isdigit()
+            ):
+                width += 1
+        else:
+            return None
+        fields[directive] = slice(position, position + width)
+        position += width
+    return fields if position == len(value) else None
+
+
+def _parse_fields(values: Any, fields: Dict[str, slice]) -> Any:
+    """
+    Read numeric date/datetime fields straight from the characters.
+
+    All `values` have the same shape, so each field is found at the same
+    place in every one of them.
+    """
+    # Import third-party modules
+    import numpy
+
+    length = len(values[0])
+    characters = numpy.asarray(values, dtype=f'U{length}') \
+        .view('u4').reshape(-1, length)
+
+    def field(directive: str, default: int) -> Any:
+        if directive not in fields:
+            return numpy.full(len(characters), default, dtype='i8')
+        digits = characters[:, fields[directive]].astype('i8') - ord('0')
+        return digits @ 10 ** numpy.arange(digits.shape[1] - 1, -1, -1)
+
+    years, months, days = field('Y', 1970), field('m', 1), field('d', 1)
+    if 'I' in fields:
+        hours = field('I', 12) % 12 \
+            + 12 * (characters[:, fields['p'].start] == ord('P'))
+    else:
+        hours = field('H', 0)
+    minutes, seconds = field('M', 0), field('S', 0)
+
+    first_of_month = ((years - 1970) * 12 + months - 1).astype('M8[M]')
+    dates = first_of_month.astype('M8[D]') + (days - 1).astype('m8[D]')
+    valid = (
+        (months >= 1) & (months <= 12) & (days >= 1)
+        & (dates.astype('M8[M]') == first_of_month)
+        & (hours < 24) & (minutes < 60) & (seconds < 60)
+    )
+    if not valid.all():
+        return None
+    return dates.astype('M8[ms]') + (
+        (hours * 60 + minutes) * 60 + seconds
+    ).astype('m8[s]')
+
+
+def to_timestamps(
+    values: Iterable[str],
+    datetime_format: Optional[str] = None
+) -> Any:
+    """
+    Convert string representations of dates/datetimes to timestamps.
+
+    Vectorised `to_timestamp`, for whole columns of dates at once, e.g.
+    the `date` column of a Binance CSV export. Values are grouped by shape
+    and the numbers of each group are read straight from the characters
+    with NumPy, rather than one value at a time. Requires `pandas`.
+
+    Parameters
+    ----------
+        values (Iterable[str]):
+            String representations of dates/datetimes.
+
+        datetime_format (Optional[str]):
+            Format of all the `values`. Defaults to `None`, to detect the
+            format of each shape of value found in `values`.
+
+    Raises
+    ------
+        ValueError
+            When a value is not a valid date/datetime in its format.
+
+    Returns
+    -------
+        (numpy.ndarray)
+        Timestamps in milliseconds, as `int64`.
+    """
+    # Import third-party modules
+    import numpy
+    import pandas as pd
+    from dateutil.tz import tzlocal
+
+    values = pd.Index(values, dtype=object)
+    timestamps = numpy.empty(len(values), dtype='i8')
+    if not len(values):
+        return timestamps
+
+    # Exports may mix formats, so each shape of value is parsed on its own
+    shapes = pd.Series([value.translate(_DIGITS) for value in values])
+    for positions in shapes.groupby(shapes).indices.values():
+        group = values[positions]
+        group_format = datetime_format or datetime_format_of(group[0])
+        fields = _field_positions(group[0], group_format)
+        parsed = _parse_fields(group, fields) if fields is not None else None
+        parsed = pd.to_datetime(group, format=group_format) \
+            if parsed is None else pd.DatetimeIndex(parsed)
+        if parsed.tz is not None:
+            timestamps[positions] = parsed.as_unit('ms').asi8
+        elif not clock.daylight:
+            # Like `to_timestamp`, dates with no time zone are in local
+            # time, which is a fixed offset from UTC here
+            timestamps[positions] = parsed.as_unit('ms').asi8 \
+                + clock.timezone * 1000
+        else:
+            localised = parsed.tz_localize(tzlocal(), ambiguous=False)
+            # Times skipped by a clock change come back shifted by it, so
+            # are shifted back to be taken with the offset from before the
+            # change, as `to_timestamp` does
+            skipped = parsed - localised.tz_localize(None)
+            timestamps[positions] = localised.as_unit('ms').asi8 \
+                + skipped.as_unit('ms').asi8
+    return timestamps
+
+
+del(Iterable, List, Union, date)
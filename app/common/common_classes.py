@@ -1,36 +1,81 @@
 """
 Author: Peter Ooms.
 
-TODO: Add description.
+Transactions requested by strategies from exchanges, one at a time or in
+batches.
 """
 
+import numpy
+
+# One transaction per record, for batches of them
+TRANSACTION_DTYPE = numpy.dtype([
+    ('order_id', 'i8'),
+    ('timestamp', 'i8'),
+    ('side', 'i1'),
+    ('qty', 'f8'),
+    ('price', 'f8'),
+    ('fee', 'f8'),
+])
+
+# The side of a transaction, as stored in batches
+BUY = 1
+SELL = -1
+
+# Order ids are handed out in sequence, starting from 1
+_next_order_id = 1
+
+
+def _order_ids(count: int) -> int:
+    """Reserve `count` consecutive order ids and return the first one."""
+    global _next_order_id
+    first = _next_order_id
+    _next_order_id += count
+    return first
+
 
 class transaction():
     """
     Transaction factory class.
 
-    Produces a transaction based on buying or selling.
+    Produces a transaction based on buying or selling. Transactions have
+    slots rather than an instance dictionary, as strategies create lots
+    of them.
     """
 
-    isBuyTransaction = False
-    amount = 0
-    desired_value = 0
+    __slots__ = ('order_id', 'timestamp', 'side', 'qty', 'price', 'fee')
+
+    def __init__(self, side: int, qty: float, price: float, timestamp: int = 0, fee: float = 0.):
+        """Create a transaction, with the next order id."""
+        self.order_id = _order_ids(1)
+        self.timestamp = timestamp
+        self.side = side
+        self.qty = qty
+        self.price = price
+        self.fee = fee
+
+    # The names of the fields before transactions had an id, a timestamp
+    # and a fee
+    @property
+    def isBuyTransaction(self) -> bool:
+        return self.side == BUY
 
+    @property
+    def amount(self) -> float:
+        return self.qty
+
+    @property
+    def desired_value(self) -> float:
+        return self.price
+
+    @staticmethod
     def buyTransactionFactory(amount, value):
         """Create a long transaction object."""
-        new_trans = transaction()
-        new_trans.isBuyTransaction = True
-        new_trans.amount = amount
-        new_trans.desired_value = value
-        return new_trans
+        return transaction(BUY, amount, value)
 
+    @staticmethod
     def sellTransactionFactory(amount, value):
         """Create a short transaction object."""
-        new_trans = transaction()
-        new_trans.isBuyTransaction = False
-        new_trans.amount = amount
-        new_trans.desired_value = value
-        return new_trans
+        return transaction(SELL, amount, value)
 
     def __str__(self):
         """Produce string representation of this object."""
@@ -38,3 +83,22 @@ class transaction():
             return f"Request to buy {self.amount} " \
                 f"security at {self.desired_value}"
         return f"Request to sell {self.amount} security at {self.desired_value}"
+
+
+def transaction_batch(sides, quantities, prices, timestamps=0) -> numpy.ndarray:
+    """
+    Create a batch of transactions, as records of `TRANSACTION_DTYPE`.
+
+    `sides` are `BUY` or `SELL`. Like the quantities, prices and
+    timestamps, they can be given once for the whole batch or once per
+    transaction. Each transaction gets an order id of its own.
+    """
+    size = numpy.broadcast(sides, quantities, prices, timestamps).size
+    batch = numpy.empty(size, dtype=TRANSACTION_DTYPE)
+    batch['order_id'] = numpy.arange(len(batch)) + _order_ids(len(batch))
+    batch['timestamp'] = timestamps
+    batch['side'] = sides
+    batch['qty'] = quantities
+    batch['price'] = prices
+    batch['fee'] = 0.
+    return batch
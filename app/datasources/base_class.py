@@ -7,15 +7,54 @@ functions as needed.
 
 from abc import ABCMeta, abstractmethod
 
+from log_pipeline import tick_logger
+from curio import sleep
+tick_log = tick_logger(__name__)
+
 
 class DatasourceBaseClass(metaclass=ABCMeta):
     """
     Abstract base class to act as an interface.
 
     It is meant to define methods that must be present in data sources.
+    Rows are sent to the strategy in batches: contiguous NumPy record
+    arrays of up to `batch_size` rows each.
     """
 
+    # Default number of rows put on the queue at once
+    BATCH_SIZE = 1000
+
+    # Whether the whole data set is loaded as `data`, as the vectorised
+    # engine and the optimiser need
+    IN_MEMORY = True
+
+    # Number of rows put on the queue at once
+    batch_size = BATCH_SIZE
+
+    # Position of the cursor
+    cursor_position = 0
+
+    # The data as a NumPy record array, batches are slices of it
+    records = None
+
     @abstractmethod
     def new_data_available(self) -> bool:
         """Return true if there are more rows abailable, false if not."""
         pass
+
+    def next_batch(self):
+        """Return the next block of rows as a NumPy record array."""
+        if self.records is None:
+            self.records = self.data.to_records(index=False)
+        start = self.cursor_position
+        self.cursor_position = min(start + self.batch_size, len(self.records))
+        return self.records[start:self.cursor_position]
+
+    async def run(self):
+        """Put the data on the queue one batch at a time."""
+        while self.new_data_available():
+            tick_log.debug("Adding batch to queue...")
+            await self.q.put(self.next_batch())
+            # 0-second sleep allows the task loop to switch to the next
+            # ready task, which gives the strategy a chance to run.
+            await sleep(0)
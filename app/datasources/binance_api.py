@@ -7,7 +7,7 @@ the message queue for downstream processing.
 import requests as r
 import pandas as pd
 import logging
-from curio import Queue, sleep
+from curio import Queue
 
 from datasources import base_class
 logger = logging.getLogger(__name__)
@@ -39,7 +39,7 @@ class binance_api(base_class.DatasourceBaseClass):
     # Queue on which to dump data
     q: list = []
 
-    def __init__(self, path: str, q: Queue):
+    def __init__(self, path: str, q: Queue, batch_size: int = None):
         """Connect to binance API and download the data."""
         # TODO: It would be good if the base URI could be configured on
         # the CLI or via a config file instead of being hardcoded here.
@@ -61,12 +61,13 @@ class binance_api(base_class.DatasourceBaseClass):
             'Volume USDT',
             'tradecount',
             'Taker buy base asset volume',
-            'Taker buy quote asset volume',
-            'Ignore'
+            'Taker buy quote asset volume'
         ]
 
-        self.data = pd.DataFrame(data, columns=column_headings)
-        self.data = self.data.apply(pd.to_numeric)
+        # Parse the columns straight to their types, in bulk
+        from binance.helpers.klines import klines_to_array
+        self.data = pd.DataFrame(klines_to_array(data))
+        self.data.columns = column_headings
 
         # Reverse data set if needed.
         # Data should be ordered from oldest to newest
@@ -79,16 +80,7 @@ class binance_api(base_class.DatasourceBaseClass):
         logger.info(f"Read {self.data.shape} "
                     f"from {base_uri} successfully. {reverse}")
         self.q = q
+        self.batch_size = batch_size or self.BATCH_SIZE
 
     def new_data_available(self):  # noqa: D102
         return not(self.cursor_position >= len(self.data))
-
-    async def run(self):
-        """TODO: Add function description."""
-        while self.new_data_available():
-            logger.debug("Adding to queue...")
-            await self.q.put(self.data.iloc[self.cursor_position])
-            self.cursor_position += 1
-            # 0-second sleep allows the task loop to switch to the next
-            # ready task, which gives the exchange a chance to run.
-            await sleep(0)
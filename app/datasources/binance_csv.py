@@ -7,9 +7,9 @@ TODO: Add description
 # from typing import List
 import pandas as pd
 import logging
-from curio import Queue, sleep
+from curio import Queue
 
-from datasources import base_class
+from datasources import base_class, csv_cache
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +24,9 @@ class BinanceCSV(base_class.DatasourceBaseClass):
     # Whether or not to reverse the data
     REVERSE = True
 
+    # Whether or not to go through the columnar cache of the file
+    CACHE = True
+
     # Empty object to store the pandas dataframe
     data = pd.DataFrame()
 
@@ -33,13 +36,14 @@ class BinanceCSV(base_class.DatasourceBaseClass):
     # # Queue on which to dump data
     # q: List = []
 
-    def __init__(self, path: str, q: Queue = []):
+    def __init__(self, path: str, q: Queue = [], batch_size: int = None):
         """Initialise a Binance formatted CSV file arguments: path(str) - path to the CSV file."""
-        self.data = pd.read_csv(path)
-
         # reverse data set. data should be ordered from oldest to newest
-        if self.REVERSE:
-            self.data = self.data.iloc[::-1]
+        if self.CACHE:
+            self.data = csv_cache.load(path, self.REVERSE)
+        else:
+            self.data = csv_cache.read_csv(path, self.REVERSE)
+        self.batch_size = batch_size or self.BATCH_SIZE
 
         reverse = "Data was reversed." if self.REVERSE else "Data was not reversed."
         logger.info(f"Read {self.data.shape} from {path} successfully. {reverse}")
@@ -47,13 +51,3 @@ class BinanceCSV(base_class.DatasourceBaseClass):
 
     def new_data_available(self):
         return not(self.cursor_position >= len(self.data))
-
-    async def run(self):
-        """TODO: Add function description."""
-        while self.new_data_available():
-            logger.debug("Adding to queue...")
-            await self.q.put(self.data.iloc[self.cursor_position])
-            self.cursor_position += 1
-            # 0-second sleep allows the task loop to switch to the next
-            # ready task which gives the exchange a chance to run.
-            await sleep(0)
@@ -0,0 +1,125 @@
+"""
+Streaming Binance CSV datasource.
+
+Reads a Binance formatted CSV file in fixed-size chunks as the backtest
+goes, so that histories larger than the available memory can be used.
+"""
+
+import io
+import os
+from typing import Iterator, List
+
+from binance.helpers import to_timestamps  # type: ignore
+import numpy
+import pandas as pd
+import logging
+from curio import Queue
+
+from datasources import base_class
+logger = logging.getLogger(__name__)
+
+
+class BinanceCSVStream(base_class.DatasourceBaseClass):
+    """
+    Binance CSV data streaming class.
+
+    Unlike `BinanceCSV`, the file is never loaded as a whole: only the
+    batch of rows being put on the queue and one block of raw text are
+    held in memory. Binance exports are ordered newest first, so by
+    default the file is read backwards from its end, which yields the rows
+    oldest first.
+    """
+
+    # Whether or not the rows of the file are newest first
+    REVERSE = True
+
+    # Rows are only ever read a batch at a time, there is no `data`
+    IN_MEMORY = False
+
+    # Number of bytes read from the file at once
+    BLOCK_SIZE = 1 << 20
+
+    def __init__(self, path: str, q: Queue = [], batch_size: int = None):
+        """Open a Binance formatted CSV file arguments: path(str) - path to the CSV file."""
+        self.path = path
+        self.q = q
+        self.batch_size = batch_size or self.BATCH_SIZE
+
+        with open(path, 'rb') as file:
+            header = file.readline()
+            # Where the first row starts
+            self.data_start = file.tell()
+        self.columns = header.decode('utf-8').strip().split(',')
+        self.dtypes = None
+
+        self.batches = self.read_batches()
+        self.pending = next(self.batches, None)
+
+        order = "newest first" if self.REVERSE else "oldest first"
+        logger.info(f"Streaming {path} in batches of {self.batch_size} rows, {order}.")
+
+    def read_lines(self) -> Iterator[bytes]:
+        """Yield the rows of the file as raw lines, oldest first."""
+        if not self.REVERSE:
+            with open(self.path, 'rb') as file:
+                file.seek(self.data_start)
+                for line in file:
+                    if line.strip():
+                        yield line.rstrip(b'\n')
+            return
+
+        with open(self.path, 'rb') as file:
+            position = file.seek(0, os.SEEK_END)
+            # Beginning of the line cut by the start of the last block read
+            remainder = b''
+            while position > self.data_start:
+                size = min(self.BLOCK_SIZE, position - self.data_start)
+                position -= size
+                file.seek(position)
+                lines = (file.read(size) + remainder).split(b'\n')
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def parse(self, lines: List[bytes]) -> numpy.recarray:
+        """Parse a chunk of raw lines into a NumPy record array."""
+        chunk = pd.read_csv(
+            io.BytesIO(b'\n'.join(lines)), header=None, names=self.columns,
+            dtype=self.dtypes
+        )
+        if self.dtypes is None:
+            # Keep the types of the first chunk for all the others, with
+            # integers widened to floats in case later chunks miss values.
+            self.dtypes = {
+                column: 'float64' if pd.api.types.is_numeric_dtype(dtype) else dtype
+                for column, dtype in chunk.dtypes.items()
+            }
+            chunk = chunk.astype(self.dtypes)
+        if 'date' in chunk:
+            # As timestamps in milliseconds, like `BinanceCSV` loads them
+            chunk['date'] = to_timestamps(chunk['date'])
+        return chunk.to_records(index=False)
+
+    def read_batches(self) -> Iterator[numpy.recarray]:
+        """Yield the rows of the file in batches of `batch_size`, oldest first."""
+        lines = []
+        for line in self.read_lines():
+            lines.append(line)
+            if len(lines) == self.batch_size:
+                yield self.parse(lines)
+                lines = []
+        if lines:
+            yield self.parse(lines)
+
+    def new_data_available(self):
+        return self.pending is not None
+
+    def next_batch(self):
+        """Return the next batch read from the file."""
+        batch = self.pending
+        self.cursor_position += len(batch)
+        self.pending = next(self.batches, None)
+        return batch
@@ -0,0 +1,163 @@
+"""
+On-disk cache of parsed Binance CSV files.
+
+The first time a CSV file is loaded it is parsed once, put in time order
+and saved as one typed `.npy` file per column in a `<file name>.cache`
+folder next to it. Dates are parsed into timestamps in milliseconds by
+`to_timestamps`, and text columns are kept as the codes of their
+categories, so that every column is a plain array of numbers. Later loads
+memory-map those columns instead of parsing the CSV again. The cache is
+keyed by the modification time and size of the CSV, so it is rebuilt as
+soon as the source file changes, or when it cannot be read.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from binance.helpers import to_timestamps  # type: ignore
+import numpy
+import pandas as pd
+import logging
+logger = logging.getLogger(__name__)
+
+# Bump this when the layout of the cache changes, to rebuild existing ones
+CACHE_VERSION = 2
+
+META_FILE = 'meta.json'
+
+# End of the name of the folder a cache is built in
+STAGING_SUFFIX = '.csv.cache'
+
+
+def cache_path(path: str) -> Path:
+    """Return the folder in which the cache of a CSV file is kept."""
+    source = Path(path)
+    return source.with_name(source.name + '.cache')
+
+
+def fingerprint(path: str, reverse: bool) -> Dict:
+    """Return what identifies the cache of a CSV file in its current state."""
+    stat = os.stat(path)
+    return {
+        'version': CACHE_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'reverse': reverse,
+    }
+
+
+def read_csv(path: str, reverse: bool) -> pd.DataFrame:
+    """
+    Parse a Binance CSV file into a time-ordered data frame.
+
+    The `date` column is parsed into timestamps in milliseconds, and the
+    other text columns, such as `symbol`, into categories.
+    """
+    data = pd.read_csv(path)
+    # Binance exports are newest first, data should be oldest first
+    if reverse:
+        data = data.iloc[::-1].reset_index(drop=True)
+    for column in data.columns:
+        if not pd.api.types.is_numeric_dtype(data[column]):
+            if column == 'date':
+                data[column] = to_timestamps(data[column])
+            else:
+                data[column] = data[column].astype('category')
+    return data
+
+
+def _read_cache(folder: Path, meta: Dict) -> pd.DataFrame:
+    """Memory-map the columns of a valid cache into a data frame."""
+    columns = {}
+    for number, column in enumerate(meta['columns']):
+        # Plain array views of the mapped files, which pandas would copy
+        # into memory without copy=False
+        values = numpy.load(folder / f'{number}.npy', mmap_mode='r').view(numpy.ndarray)
+        if column in meta['categories']:
+            values = pd.Categorical.from_codes(values, meta['categories'][column])
+        columns[column] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def _write_cache(folder: Path, data: pd.DataFrame, meta: Dict):
+    """Save every column of `data` as a typed `.npy` file."""
+    # Build the cache aside and swap it in, so a half-written cache is
+    # never picked up by a concurrent load. Named like a cache, so that it
+    # is ignored like one.
+    staging = Path(tempfile.mkdtemp(
+        prefix='.staging-', suffix=STAGING_SUFFIX, dir=folder.parent
+    ))
+    try:
+        categories = {}
+        for number, column in enumerate(data.columns):
+            values = data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # The codes can be memory-mapped, the categories go in the
+                # metadata
+                categories[column] = values.cat.categories.tolist()
+                values = values.cat.codes
+            numpy.save(staging / f'{number}.npy', values.to_numpy(), allow_pickle=False)
+        with open(staging / META_FILE, 'w') as file:
+            json.dump(
+                {**meta, 'columns': list(data.columns), 'categories': categories}, file
+            )
+
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(staging, folder)
+    except BaseException:
+        # Such as another process swapping its own cache in first
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _read_meta(folder: Path) -> Optional[Dict]:
+    """Return the metadata of an existing cache, if there is one."""
+    try:
+        with open(folder / META_FILE) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def load(path: str, reverse: bool = True) -> pd.DataFrame:
+    """
+    Load a Binance CSV file through its cache.
+
+    Parameters
+    ----------
+        path (str):
+            Path to the CSV file.
+
+        reverse (bool):
+            Whether the rows of the file are newest first and have to be
+            reversed. Defaults to `True`, as in Binance exports.
+
+    Returns
+    -------
+        (pandas.DataFrame)
+        The content of the file, oldest row first.
+    """
+    folder = cache_path(path)
+    expected = fingerprint(path, reverse)
+    meta = _read_meta(folder)
+
+    if meta is not None and all(meta.get(key) == value for key, value in expected.items()):
+        logger.debug(f"Loading {path} from its cache in {folder}")
+        try:
+            return _read_cache(folder, meta)
+        except (OSError, ValueError, KeyError) as error:
+            # Such as a column file gone missing or cut short
+            logger.warning(f"Could not read the cache of {path} in {folder}: {error}")
+
+    data = read_csv(path, reverse)
+    try:
+        _write_cache(folder, data, expected)
+    except OSError as error:
+        logger.warning(f"Could not cache {path} in {folder}: {error}")
+    else:
+        logger.debug(f"Cached {path} in {folder}")
+    return data
@@ -0,0 +1,153 @@
+"""
+Historical kline downloader.
+
+Downloads the klines of a symbol over a date range from the Binance API,
+one page of up to 1000 klines per `MarketData.klines` call, with several
+pages in flight at once. Pages are parsed straight into typed NumPy
+arrays.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import numpy
+from binance.api_calls.market import MarketData  # type: ignore
+from binance.helpers import to_timestamp  # type: ignore
+from binance.helpers.klines import concat_klines  # type: ignore
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Length of each kline interval in milliseconds. Months vary in length, so
+# the longest one is used: pages may overlap, but never leave gaps.
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3_600_000,
+    '2h': 2 * 3_600_000,
+    '4h': 4 * 3_600_000,
+    '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000,
+    '12h': 12 * 3_600_000,
+    '1d': 86_400_000,
+    '3d': 3 * 86_400_000,
+    '1w': 7 * 86_400_000,
+    '1M': 31 * 86_400_000,
+}
+
+CSV_COLUMNS = [
+    'date', 'symbol', 'open', 'high', 'low', 'close', 'Volume',
+    'Quote volume', 'tradecount'
+]
+
+
+class KlineDownloader:
+    """
+    Download klines over a date range.
+
+    The range is split into pages of `PAGE_SIZE` klines which are fetched
+    concurrently, then stitched back together in time order. The Binance
+    client keeps the calls within the request weight allowed per minute.
+    """
+
+    # Most klines returned by a single call
+    PAGE_SIZE = 1000
+
+    def __init__(self, market: MarketData, workers: int = 8):
+        """
+        Initialise the downloader.
+
+        Parameters
+        ----------
+            market (MarketData):
+                The `Market Data Endpoint` APIs to download from.
+
+            workers (int):
+                Number of pages downloaded at the same time.
+                Defaults to `8`.
+        """
+        self.market = market
+        self.workers = workers
+
+    def pages(self, interval: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Split `[start, end]` (in milliseconds) into pages of klines."""
+        if interval not in INTERVAL_MS:
+            raise ValueError(
+                f"Invalid kline interval {interval}, valid options are "
+                f"{', '.join(INTERVAL_MS)}."
+            )
+        page_length = INTERVAL_MS[interval] * self.PAGE_SIZE
+        return [
+            (page_start, min(page_start + page_length - 1, end))
+            for page_start in range(start, end + 1, page_length)
+        ]
+
+    def fetch(self, symbol: str, interval: str, page: Tuple[int, int]) -> numpy.ndarray:
+        """Download a single page of klines."""
+        return self.market.klines(
+            symbol, interval, startTime=page[0], endTime=page[1],
+            limit=self.PAGE_SIZE, as_array=True
+        )
+
+    def download(self, symbol: str, interval: str, start, end) -> numpy.ndarray:
+        """
+        Download the klines of `symbol` opened between `start` and `end`.
+
+        Parameters
+        ----------
+            symbol (str):
+                Currency symbol.
+
+            interval (KlineInterval):
+                Kline interval, as taken by `MarketData.klines`.
+
+            start (Union[int, str, datetime.date, datetime.datetime]):
+                Timestamp in milliseconds, date/datetime object or thereof
+                string representation to download from. INCLUSIVE.
+
+            end (Union[int, str, datetime.date, datetime.datetime]):
+                Timestamp in milliseconds, date/datetime object or thereof
+                string representation to download until. INCLUSIVE.
+
+        Returns
+        -------
+            (numpy.ndarray)
+            The klines, as records of `binance.helpers.klines.KLINE_DTYPE`,
+            oldest first and without duplicates.
+        """
+        pages = self.pages(interval, to_timestamp(start), to_timestamp(end))
+        logger.info(
+            f"Downloading {symbol} {interval} klines in {len(pages)} pages "
+            f"with {self.workers} workers."
+        )
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Pages come back in order, and are joined without overlaps
+            klines = concat_klines(list(executor.map(
+                lambda page: self.fetch(symbol, interval, page), pages
+            )))
+
+        logger.info(f"Downloaded {len(klines)} {symbol} {interval} klines.")
+        return klines
+
+
+def write_csv(klines: numpy.ndarray, path: str, symbol: str):
+    """
+    Write klines to a CSV file in the Binance export format.
+
+    Like Binance exports, the newest kline comes first, so the file can be
+    read by the `BinanceCSV` datasources.
+    """
+    with open(path, 'w') as file:
+        file.write(','.join(CSV_COLUMNS) + '\n')
+        for kline in klines[::-1].tolist():
+            opened = datetime.fromtimestamp(kline[0] / 1000, tz=timezone.utc)
+            file.write(','.join([
+                opened.strftime('%Y-%m-%d %H:%M:%S'), symbol.upper(),
+                *(str(value) for value in kline[1:6]), str(kline[7]),
+                str(kline[8])
+            ]) + '\n')
@@ -0,0 +1,247 @@
+"""
+Local store of market data.
+
+Klines are kept on disk in a compact binary format, one partition per
+symbol, interval and (UTC) day: `<root>/<SYMBOL>/<interval>/<YYYY-MM-DD>.npy`.
+The store is kept up to date with an incremental `sync`, which only
+downloads the klines closed after the last one stored, and range queries
+only load the partitions they need.
+"""
+
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import numpy
+import pandas as pd
+import logging
+from binance.helpers.klines import KLINE_DTYPE  # type: ignore
+from curio import Queue
+
+from datasources import base_class
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86_400_000
+
+
+def to_milliseconds(value) -> Optional[int]:
+    """Convert a date, or its string representation, to a UTC timestamp in milliseconds."""
+    if value is None or isinstance(value, int):
+        return value
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return int(timestamp.timestamp() * 1000)
+
+
+def to_day(timestamp: int) -> date:
+    """Return the UTC day a timestamp in milliseconds falls on."""
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).date()
+
+
+class KlineStore:
+    """Partitioned on-disk store of klines."""
+
+    # Default location of the store
+    ROOT = 'data/store'
+
+    def __init__(self, root: str = None):
+        """Open the store kept in the `root` folder."""
+        self.root = Path(root or self.ROOT)
+
+    def partition_path(self, symbol: str, interval: str, day: date) -> Path:
+        """Return the file holding the klines of a symbol and interval for a day."""
+        return self.root / symbol.upper() / interval / f'{day.isoformat()}.npy'
+
+    def days(self, symbol: str, interval: str) -> List[date]:
+        """Return the days stored for a symbol and interval, oldest first."""
+        folder = self.root / symbol.upper() / interval
+        if not folder.is_dir():
+            return []
+        return sorted(date.fromisoformat(path.stem) for path in folder.glob('*.npy'))
+
+    def load_partition(self, symbol: str, interval: str, day: date) -> numpy.ndarray:
+        """Memory-map the klines of a single day."""
+        path = self.partition_path(symbol, interval, day)
+        if not path.is_file():
+            return numpy.empty(0, dtype=KLINE_DTYPE)
+        return numpy.load(path, mmap_mode='r')
+
+    def write(self, symbol: str, interval: str, klines: numpy.ndarray):
+        """
+        Add klines to the store.
+
+        Klines already stored for the same open time are replaced, so
+        writing overlapping ranges is safe.
+        """
+        if not len(klines):
+            return
+        days = (klines['open_time'] // DAY_MS).astype('i8')
+        for day_number in numpy.unique(days):
+            day = date(1970, 1, 1) + timedelta(days=int(day_number))
+            new = klines[days == day_number]
+            stored = self.load_partition(symbol, interval, day)
+            merged = numpy.concatenate([new, stored])
+            # Keep the first (newest) copy of each open time, in time order
+            _, first = numpy.unique(merged['open_time'], return_index=True)
+            self.save_partition(symbol, interval, day, merged[first])
+
+    def save_partition(self, symbol: str, interval: str, day: date, klines: numpy.ndarray):
+        """Replace the klines of a single day."""
+        path = self.partition_path(symbol, interval, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write aside and swap in, so readers never see a partial partition
+        handle, staging = tempfile.mkstemp(suffix='.npy', dir=path.parent)
+        with os.fdopen(handle, 'wb') as file:
+            numpy.save(file, numpy.ascontiguousarray(klines), allow_pickle=False)
+        os.replace(staging, path)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> numpy.ndarray:
+        """
+        Return the klines of a symbol and interval opened between two times.
+
+        Parameters
+        ----------
+            symbol (str):
+                Currency symbol.
+
+            interval (str):
+                Kline interval.
+
+            start (Optional[int]):
+                UTC timestamp in milliseconds to read from. INCLUSIVE.
+                Defaults to the first kline stored.
+
+            end (Optional[int]):
+                UTC timestamp in milliseconds to read until. INCLUSIVE.
+                Defaults to the last kline stored.
+
+        Returns
+        -------
+            (numpy.ndarray)
+            The klines, oldest first, as records of `KLINE_DTYPE`.
+        """
+        days = [
+            day for day in self.days(symbol, interval)
+            if (start is None or day >= to_day(start))
+            and (end is None or day <= to_day(end))
+        ]
+        partitions = [self.load_partition(symbol, interval, day) for day in days]
+        if not partitions:
+            return numpy.empty(0, dtype=KLINE_DTYPE)
+
+        klines = numpy.concatenate(partitions)
+        selected = numpy.ones(len(klines), dtype=bool)
+        if start is not None:
+            selected &= klines['open_time'] >= start
+        if end is not None:
+            selected &= klines['open_time'] <= end
+        return klines[selected]
+
+    def last_close_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Return the close time of the last kline stored, if any."""
+        days = self.days(symbol, interval)
+        if not days:
+            return None
+        return int(self.load_partition(symbol, interval, days[-1])['close_time'][-1])
+
+    def sync(
+        self,
+        downloader,
+        symbol: str,
+        interval: str,
+        start=None,
+        end=None
+    ) -> int:
+        """
+        Download the klines closed since the last one stored.
+
+        Parameters
+        ----------
+            downloader (KlineDownloader):
+                Downloader to fetch the klines with.
+
+            symbol (str):
+                Currency symbol.
+
+            interval (str):
+                Kline interval.
+
+            start (Union[int, str, datetime.date, datetime.datetime]):
+                UTC timestamp in milliseconds, date/datetime object or
+                thereof string representation to start from when nothing is
+                stored yet for this symbol and interval. Ignored otherwise.
+
+            end (Union[int, str, datetime.date, datetime.datetime]):
+                UTC timestamp in milliseconds, date/datetime object or
+                thereof string representation to sync until.
+                Defaults to now.
+
+        Returns
+        -------
+            (int)
+            The number of klines added to the store.
+        """
+        end = to_milliseconds(end) if end is not None else int(time.time() * 1000)
+        last_close_time = self.last_close_time(symbol, interval)
+        if last_close_time is not None:
+            start = last_close_time + 1
+        elif start is None:
+            raise ValueError(
+                f"Nothing is stored for {symbol.upper()} {interval} yet, "
+                "a start date is needed."
+            )
+
+        klines = downloader.download(
+            symbol, interval, to_milliseconds(start), end
+        ).astype(KLINE_DTYPE, copy=False)
+        # The last kline may still be open, it is picked up by the next sync
+        klines = klines[klines['close_time'] <= end]
+        self.write(symbol, interval, klines)
+        logger.info(f"Synced {len(klines)} {symbol.upper()} {interval} klines.")
+        return len(klines)
+
+
+class KlineStoreSource(base_class.DatasourceBaseClass):
+    """
+    Local kline store datasource.
+
+    Selects the klines of a symbol and interval between two dates from
+    the store, rather than from a file.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        q: Queue = [],
+        batch_size: int = None,
+        symbol: str = None,
+        interval: str = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ):
+        """Select klines from the store kept in `path`."""
+        if symbol is None or interval is None:
+            raise ValueError('Selecting klines from the store needs a symbol and an interval.')
+        store = KlineStore(path)
+        self.data = pd.DataFrame(store.read(
+            symbol, interval, to_milliseconds(start), to_milliseconds(end)
+        ))
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.q = q
+        logger.info(
+            f"Read {self.data.shape} {symbol.upper()} {interval} klines "
+            f"from {store.root} successfully."
+        )
+
+    def new_data_available(self):
+        return self.cursor_position < len(self.data)
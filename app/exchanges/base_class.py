@@ -1,8 +1,10 @@
 """TODO: Add file description."""
 
 
+from common.common_classes import BUY
 from typing import List
 from abc import ABCMeta, abstractmethod
+import numpy
 
 
 class ExchangeBaseClass(metaclass=ABCMeta):
@@ -26,12 +28,59 @@ class ExchangeBaseClass(metaclass=ABCMeta):
         """TODO: Add function description."""
         pass
 
+    def fill_vector(self, quantities, prices):
+        """
+        Fill a whole vector of orders in one pass.
+
+        Used by the vectorised backtest engine. `quantities` holds the signed
+        quantity to trade on each row (positive to buy, negative to sell,
+        zero to do nothing) and `prices` the price each one is requested at.
+        """
+        raise NotImplementedError(
+            f"The {type(self).__name__} exchange cannot fill vectors of orders."
+        )
+
+    def vector_fills(self, quantities, prices):
+        """
+        Work out how each order of a vector would fill, without filling it.
+
+        Returns the signed quantity filled on each row, the price it fills
+        at and the fee it pays, as `fill_vector` would fill them.
+        """
+        raise NotImplementedError(
+            f"The {type(self).__name__} exchange cannot fill vectors of orders."
+        )
+
+    async def fill_batch(self, batch):
+        """
+        Fill a batch of transactions, made by `transaction_batch`.
+
+        One transaction after the other by default, those for nothing
+        marking the account at their price. Exchanges that can do better
+        with the whole batch override this.
+        """
+        for side, qty, price in zip(
+            batch['side'].tolist(), batch['qty'].tolist(), batch['price'].tolist()
+        ):
+            if not qty:
+                self.mark(price)
+            elif side == BUY:
+                await self.buy(qty, price)
+            else:
+                await self.sell(qty, price)
+
+    def mark(self, value):
+        """Mark the account to market at the current value of the security."""
+        pass
+
     @abstractmethod
     async def run(self):
         """TODO: Add function description."""
         while True:
             item = await self.q.get()
-            if item.isBuyTransaction:
+            if isinstance(item, numpy.ndarray):
+                await self.fill_batch(item)
+            elif item.isBuyTransaction:
                 await self.buy(item.amount, item.desired_value)
             else:
                 await self.sell(item.amount, item.desired_value)
@@ -3,10 +3,17 @@
 # Import standard modules
 import logging
 
+# Import third-party modules
+import numpy
+
 # Import local modules
 from exchanges import base_class
+from log_pipeline import tick_logger
+from metrics import Metrics
 
 logger = logging.getLogger(__name__)
+# Fills come one per tick at most, and are logged as such
+tick_log = tick_logger(__name__)
 
 
 class FakeExchange(base_class.ExchangeBaseClass):
@@ -15,6 +22,10 @@ class FakeExchange(base_class.ExchangeBaseClass):
     def __init__(self, queue, initial_investment=0):
         """TODO: Add function description."""
         super().__init__(queue, initial_investment)
+        # Every fill as a (side, qty, value) tuple, oldest first
+        self.trades = []
+        # Performance of the account, updated on every fill
+        self.metrics = Metrics(self.currency_held, self.current_balance)
         logger.info(
             "Opened an initial account with the fake exchange with an "
             f"investment of {initial_investment}"
@@ -51,10 +62,12 @@ class FakeExchange(base_class.ExchangeBaseClass):
         profit_loss = (self.current_balance * value) + self.currency_held
 
         self.num_purchases += 1
-        logger.info(
-            f"Exch: BUY  {qty}x{self.SECURITY_1} for {amount_to_deduct}. "
-            f"Current balance: {self.SECURITY_2} {self.currency_held}, "
-            f"{self.SECURITY_1} {self.current_balance} P/L: {profit_loss}"
+        self.trades.append(('BUY', qty, value))
+        self.metrics.fill(qty, value, self.TRANSACTION_COST_FIXED)
+        tick_log.info(
+            "Exch: BUY  %sx%s for %s. Current balance: %s %s, %s %s P/L: %s",
+            qty, self.SECURITY_1, amount_to_deduct, self.SECURITY_2,
+            self.currency_held, self.SECURITY_1, self.current_balance, profit_loss
         )
 
     async def sell(self, qty, value):
@@ -70,15 +83,79 @@ class FakeExchange(base_class.ExchangeBaseClass):
         profit_loss = (self.current_balance * value) + self.currency_held
 
         self.num_sales += 1
-        logger.info(
-            f"Exch: SELL {qty}x{self.SECURITY_1} for {amount_to_award}. "
-            f"Current balance: {self.SECURITY_2} {self.currency_held}, "
-            f"{self.SECURITY_1} {self.current_balance} P/L: {profit_loss}"
+        self.trades.append(('SELL', qty, value))
+        self.metrics.fill(-qty, value, self.TRANSACTION_COST_FIXED)
+        tick_log.info(
+            "Exch: SELL %sx%s for %s. Current balance: %s %s, %s %s P/L: %s",
+            qty, self.SECURITY_1, amount_to_award, self.SECURITY_2,
+            self.currency_held, self.SECURITY_1, self.current_balance, profit_loss
+        )
+
+    def fill_vector(self, quantities, prices):
+        """
+        Fill every non-zero order of a vector at its requested value.
+
+        The rows without an order mark the account to market at their
+        price, so the metrics see every row.
+        """
+        filled = numpy.flatnonzero(quantities)
+        qty = numpy.asarray(quantities, dtype=float)[filled]
+        value = numpy.asarray(prices, dtype=float)[filled]
+
+        # Same sums as buy()/sell() applied one fill after the other
+        currency_moves = -(qty * value) - self.TRANSACTION_COST_FIXED
+        currency_held = self.currency_held + numpy.cumsum(currency_moves)
+        current_balance = self.current_balance + numpy.cumsum(qty)
+
+        if len(filled):
+            self.currency_held = float(currency_held[-1])
+            self.current_balance = float(current_balance[-1])
+        self.num_purchases += int(numpy.count_nonzero(qty > 0))
+        self.num_sales += int(numpy.count_nonzero(qty < 0))
+        self.trades.extend(
+            ('BUY' if q > 0 else 'SELL', abs(q), v)
+            for q, v in zip(qty.tolist(), value.tolist())
+        )
+        self.metrics.fill_vector(quantities, prices, self.TRANSACTION_COST_FIXED)
+
+        profit_loss = (self.current_balance * value[-1]) + self.currency_held \
+            if len(filled) else self.currency_held
+        tick_log.info(
+            "Exch: filled %s orders (%s buys, %s sales). "
+            "Current balance: %s %s, %s %s P/L: %s",
+            len(filled), self.num_purchases, self.num_sales, self.SECURITY_2,
+            self.currency_held, self.SECURITY_1, self.current_balance, profit_loss
         )
 
+    def vector_fills(self, quantities, prices):
+        """Every order fills in full at its requested value, for the fixed cost."""
+        quantities = numpy.asarray(quantities, dtype=float)
+        fees = numpy.where(quantities != 0, float(self.TRANSACTION_COST_FIXED), 0.)
+        return quantities, numpy.asarray(prices, dtype=float), fees
+
+    async def fill_batch(self, batch):
+        """
+        Fill a batch of transactions in one pass, like `fill_vector`.
+
+        A batch of nothing but marks only marks the account.
+        """
+        quantities = batch['qty'] * batch['side']
+        if quantities.any():
+            self.fill_vector(quantities, batch['price'])
+        else:
+            self.metrics.fill_vector(quantities, batch['price'])
+
     def get_current_balance(self):
         """Get the number of securities you own right now."""
         return self.current_balance
 
+    def mark(self, value):
+        """Mark the account to market at the current value of the security."""
+        self.metrics.mark(value)
+
+    def get_profit_loss(self, value):
+        """Get the current standing if the security is worth `value`."""
+        return (self.current_balance * value) + self.currency_held
+
     async def run(self):
         await super().run()
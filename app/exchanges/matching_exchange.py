@@ -0,0 +1,118 @@
+"""
+Fake exchange matching orders against an order book.
+
+Unlike `FakeExchange`, orders are not filled in full at the price the
+strategy asks for: they are matched as market orders against the depth
+around that price, so larger orders fill at worse prices, and every fill
+pays the taker fee.
+"""
+
+from .fake_exchange import FakeExchange
+from .order_book import BUY, SELL, OrderBook, SyntheticDepth
+from log_pipeline import tick_logger
+
+import numpy
+tick_log = tick_logger(__name__)
+
+
+class MatchingExchange(FakeExchange):
+    """A fake exchange with slippage and fees."""
+
+    # Depth every order meets, around its price
+    DEPTH = SyntheticDepth()
+
+    # Fee of a market order, as a fraction of its quote amount
+    TAKER_FEE = 0.001
+
+    def __init__(self, queue, initial_investment=0, depth: SyntheticDepth = None):
+        super().__init__(queue, initial_investment)
+        self.depth = depth or self.DEPTH
+        self.book = OrderBook(taker_fee=self.TAKER_FEE)
+        self.fees_paid = 0.
+
+    async def buy(self, qty, value):
+        """Buy a number of the security, as a market order around its value."""
+        self._market_order(BUY, qty, value)
+
+    async def sell(self, qty, value):
+        """Sell a number of the security, as a market order around its value."""
+        self._market_order(SELL, qty, value)
+
+    def _market_order(self, side: int, qty, value):
+        """Match a market order against the depth around `value`."""
+        self.book.load_levels(*self.depth.book(value))
+        self.book.submit(side, 'MARKET', qty)
+        fills, self.book.fills = self.book.fills, []
+        filled = sum(fill[3] for fill in fills)
+        if not filled:
+            tick_log.warning("Exch: no depth to fill %sx%s at %s", qty, self.SECURITY_1, value)
+            return
+        quote = sum(fill[2] * fill[3] for fill in fills)
+        fee = sum(fill[4] for fill in fills)
+        price = quote / filled
+
+        self.currency_held -= side * quote + fee
+        self.current_balance += side * filled
+        self.fees_paid += fee
+        if side == BUY:
+            self.num_purchases += 1
+        else:
+            self.num_sales += 1
+        self.trades.append(('BUY' if side == BUY else 'SELL', filled, price))
+        self.metrics.fill(side * filled, price, fee)
+        tick_log.info(
+            "Exch: %s %sx%s for %s (asked %s, fee %s). "
+            "Current balance: %s %s, %s %s P/L: %s",
+            'BUY ' if side == BUY else 'SELL', filled, self.SECURITY_1, price,
+            value, fee, self.SECURITY_2, self.currency_held, self.SECURITY_1,
+            self.current_balance, self.get_profit_loss(value)
+        )
+
+    def vector_fills(self, quantities, prices):
+        """
+        Every order is a market order against the depth around its price.
+
+        Rows without an order, or without depth to fill it, fill nothing at
+        their own price.
+        """
+        prices = numpy.asarray(prices, dtype=float)
+        filled = numpy.flatnonzero(quantities)
+        qty, price = self.depth.fill_vector(
+            numpy.asarray(quantities, dtype=float)[filled], prices[filled]
+        )
+        row_quantities = numpy.zeros(len(prices))
+        row_prices = prices.copy()
+        row_quantities[filled], row_prices[filled] = qty, price
+        return row_quantities, row_prices, numpy.abs(row_quantities * row_prices) * self.TAKER_FEE
+
+    def fill_vector(self, quantities, prices):
+        """
+        Fill every non-zero order of a vector as a market order.
+
+        The same fills as `buy` and `sell` one order after the other, since
+        each order meets the depth around its own price.
+        """
+        row_quantities, row_prices, row_fees = self.vector_fills(quantities, prices)
+        # Every row for the metrics, the ones without a fill as marks
+        self.metrics.fill_vector(row_quantities, row_prices, row_fees)
+
+        filled = numpy.flatnonzero(row_quantities)
+        qty, price, fees = row_quantities[filled], row_prices[filled], row_fees[filled]
+        quote = qty * price
+
+        if len(qty):
+            self.currency_held = float(self.currency_held + numpy.cumsum(-quote - fees)[-1])
+            self.current_balance = float(self.current_balance + numpy.cumsum(qty)[-1])
+            self.fees_paid += float(fees.sum())
+        self.num_purchases += int(numpy.count_nonzero(qty > 0))
+        self.num_sales += int(numpy.count_nonzero(qty < 0))
+        self.trades.extend(
+            ('BUY' if q > 0 else 'SELL', abs(q), v)
+            for q, v in zip(qty.tolist(), price.tolist())
+        )
+        tick_log.info(
+            "Exch: filled %s orders (%s buys, %s sales), %s in fees. "
+            "Current balance: %s %s, %s %s",
+            len(qty), self.num_purchases, self.num_sales, self.fees_paid,
+            self.SECURITY_2, self.currency_held, self.SECURITY_1, self.current_balance
+        )
@@ -0,0 +1,448 @@
+"""
+Order book matching engine, for exchanges that simulate slippage.
+
+The book holds the liquidity of the market as sorted price levels on each
+side, either replayed from recorded `MarketData.orderBook` snapshots or
+synthesised from candles by `SyntheticDepth`. Orders of the order types
+the Binance API takes are matched against it: market orders walk the
+levels and pay the taker fee, limit orders that cannot fill rest until the
+book reaches their price and pay the maker fee, and stop orders wait for
+the price to reach their stop price before turning into market or limit
+orders.
+"""
+
+from binance.helpers.type_literals import TypeOptions  # type: ignore
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+from typing import Dict, List, Optional, Sequence, Tuple, get_args
+import numpy
+
+# The order types of the Binance API, all supported here
+ORDER_TYPES = get_args(TypeOptions)
+
+BUY = 1
+SELL = -1
+
+# What stop orders become once triggered
+_TRIGGERED = {
+    'STOP_LOSS': 'MARKET',
+    'TAKE_PROFIT': 'MARKET',
+    'STOP_LOSS_LIMIT': 'LIMIT',
+    'TAKE_PROFIT_LIMIT': 'LIMIT',
+}
+
+
+class OrderBook:
+    """
+    Price levels of a market, and the orders matched against them.
+
+    Prices of each side are kept in an ascending list, searched with
+    `bisect`, along with the quantity at each price. Open orders wait in
+    queues of the same kind, one first in first out queue of order ids per
+    price, so they are matched in price then time priority and cancelled
+    in place. Fills are appended to `fills` as they happen, as
+    `(order id, side, price, qty, fee, maker)` tuples; fees are a fraction
+    of the quote amount.
+    """
+
+    def __init__(self, maker_fee: float = 0.001, taker_fee: float = 0.001):
+        """
+        Open an empty book.
+
+        `maker_fee` is paid by the resting orders that fill, and
+        `taker_fee` by the orders that fill as they arrive, both as a
+        fraction of the quote amount.
+        """
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        # Ascending prices and the quantity at each, by side of the book
+        self._prices = {BUY: [], SELL: []}
+        self._quantities: Dict[int, Dict[float, float]] = {BUY: {}, SELL: {}}
+        # Resting limit orders, by side: the order ids at each price, and
+        # the ascending prices
+        self._resting: Dict[int, Dict[float, Dict[int, None]]] = {BUY: {}, SELL: {}}
+        self._resting_prices: Dict[int, List[float]] = {BUY: [], SELL: []}
+        # Stop orders waiting for the price to rise or to fall to them,
+        # likewise by stop price
+        self._stops_above: Tuple[Dict[float, Dict[int, None]], List[float]] = ({}, [])
+        self._stops_below: Tuple[Dict[float, Dict[int, None]], List[float]] = ({}, [])
+        # Every order still open, by id, as (side, order type, qty, price,
+        # stop price) tuples
+        self.orders: Dict[int, Tuple[int, str, float, Optional[float], Optional[float]]] = {}
+        self.fills: List[Tuple[int, int, float, float, float, bool]] = []
+        self._next_id = count(1).__next__
+
+    # Liquidity
+
+    def set_level(self, side: int, price: float, qty: float):
+        """Set the quantity at a price level, removing it at zero."""
+        prices, quantities = self._prices[side], self._quantities[side]
+        if qty > 0:
+            if price not in quantities:
+                insort(prices, price)
+            quantities[price] = qty
+        elif price in quantities:
+            del quantities[price]
+            del prices[bisect_left(prices, price)]
+
+    def load_levels(self, bids: Sequence[Tuple[float, float]], asks: Sequence[Tuple[float, float]]):
+        """
+        Replace the liquidity of the book, then match the open orders
+        against it.
+        """
+        for side, levels in ((BUY, bids), (SELL, asks)):
+            quantities = {}
+            for price, qty in levels:
+                qty = float(qty)
+                if qty > 0:
+                    quantities[float(price)] = qty
+            self._quantities[side] = quantities
+            self._prices[side] = sorted(quantities)
+        if self.orders:
+            self._match_open_orders()
+
+    def load_snapshot(self, snapshot: Dict):
+        """Replace the liquidity with a `MarketData.orderBook` response."""
+        self.load_levels(snapshot['bids'], snapshot['asks'])
+
+    def best_bid(self) -> Optional[float]:
+        """Return the highest bid, or `None` when there are no bids."""
+        prices = self._prices[BUY]
+        return prices[-1] if prices else None
+
+    def best_ask(self) -> Optional[float]:
+        """Return the lowest ask, or `None` when there are no asks."""
+        prices = self._prices[SELL]
+        return prices[0] if prices else None
+
+    def mid_price(self) -> Optional[float]:
+        """
+        Return the price halfway between the best bid and ask.
+
+        With only one side in the book, its best price. With neither,
+        `None`.
+        """
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return bid if ask is None else ask
+        return (bid + ask) / 2
+
+    # Orders
+
+    def submit(
+        self,
+        side: int,
+        order_type: str,
+        qty: float,
+        price: float = None,
+        stop_price: float = None
+    ) -> int:
+        """
+        Submit an order, and match it right away if it can be.
+
+        `price` is the limit price of the limit order types, and
+        `stop_price` the trigger price of the stop order types. Returns the
+        id of the order, which stays open while it rests or waits for its
+        stop price. A `LIMIT_MAKER` order that would match right away is
+        rejected, and returns `None`.
+        """
+        order_id = self._next_id()
+        # The most common order types first, matched inline
+        if order_type == 'LIMIT':
+            if price is None:
+                raise ValueError("LIMIT orders need a price.")
+            other = self._prices[-side]
+            if other and (other[0] <= price if side == BUY else other[-1] >= price):
+                qty = self._take(order_id, side, qty, price)
+                if self._stops_above[1] or self._stops_below[1]:
+                    self._trigger_stops()
+            if qty > 0:
+                self.orders[order_id] = (side, 'LIMIT', qty, price, None)
+                levels = self._resting[side]
+                queue = levels.get(price)
+                if queue is None:
+                    queue = levels[price] = {}
+                    insort(self._resting_prices[side], price)
+                queue[order_id] = None
+        elif order_type == 'MARKET':
+            self._take(order_id, side, qty, None)
+            if self._stops_above[1] or self._stops_below[1]:
+                self._trigger_stops()
+        elif order_type == 'LIMIT_MAKER':
+            if price is None:
+                raise ValueError("LIMIT_MAKER orders need a price.")
+            if self._crosses(side, price):
+                return None
+            self._rest(order_id, side, qty, price)
+        elif order_type in _TRIGGERED:
+            if stop_price is None:
+                raise ValueError(f"{order_type} orders need a stop price.")
+            if price is None and _TRIGGERED[order_type] == 'LIMIT':
+                raise ValueError(f"{order_type} orders need a price.")
+            self.orders[order_id] = (side, order_type, qty, price, stop_price)
+            self._enqueue(*self._stops(side, order_type), stop_price, order_id)
+            self._trigger_stops()
+        else:
+            raise ValueError(
+                f"Unknown order type {order_type!r}, expected one of {ORDER_TYPES}."
+            )
+        return order_id
+
+    def cancel(self, order_id: int) -> bool:
+        """Cancel an open order. Returns whether it was still open."""
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        if order[1] == 'LIMIT':
+            # Inline, cancelling resting orders is most of the traffic
+            levels, price = self._resting[order[0]], order[3]
+            queue = levels[price]
+            del queue[order_id]
+            if not queue:
+                del levels[price]
+                prices = self._resting_prices[order[0]]
+                del prices[bisect_left(prices, price)]
+        else:
+            self._dequeue(*self._stops(order[0], order[1]), order[4], order_id)
+        return True
+
+    def _stops(self, side: int, order_type: str) -> Tuple[Dict, List]:
+        """Return the queues a stop order waits in for its stop price."""
+        # Selling on a stop loss and buying on a take profit wait for the
+        # price to fall, the other way round for a rise
+        if order_type.startswith('STOP_LOSS') == (side == SELL):
+            return self._stops_below
+        return self._stops_above
+
+    @staticmethod
+    def _enqueue(levels: Dict, prices: List[float], price: float, order_id: int):
+        """Add an order at the back of the queue of its price."""
+        queue = levels.get(price)
+        if queue is None:
+            queue = levels[price] = {}
+            insort(prices, price)
+        queue[order_id] = None
+
+    @staticmethod
+    def _dequeue(levels: Dict, prices: List[float], price: float, order_id: int):
+        """Remove an order from the queue of its price."""
+        queue = levels[price]
+        del queue[order_id]
+        if not queue:
+            del levels[price]
+            del prices[bisect_left(prices, price)]
+
+    def _crosses(self, side: int, price: float) -> bool:
+        """Whether a limit order at `price` would match right away."""
+        if side == BUY:
+            best = self.best_ask()
+            return best is not None and best <= price
+        best = self.best_bid()
+        return best is not None and best >= price
+
+    def _take(self, order_id: int, side: int, qty: float, limit: Optional[float]) -> float:
+        """
+        Match an order against the levels of the other side, as a taker.
+
+        Goes no further than `limit`, if there is one. Returns the
+        quantity left unfilled.
+        """
+        other = -side
+        prices, quantities = self._prices[other], self._quantities[other]
+        fee_rate = self.taker_fee
+        fills = self.fills
+        # Buys walk the asks up from the lowest, sells the bids down from
+        # the highest, as far as the limit
+        if side == BUY:
+            levels = prices if limit is None else prices[:bisect_right(prices, limit)]
+        else:
+            levels = reversed(prices if limit is None else prices[bisect_left(prices, limit):])
+        emptied = 0
+        for level in levels:
+            available = quantities[level]
+            if available > qty:
+                quantities[level] = available - qty
+                fills.append((order_id, side, level, qty, qty * level * fee_rate, False))
+                qty = 0
+                break
+            fills.append((order_id, side, level, available, available * level * fee_rate, False))
+            qty -= available
+            del quantities[level]
+            emptied += 1
+            if qty <= 0:
+                break
+        if emptied:
+            if side == BUY:
+                del prices[:emptied]
+            else:
+                del prices[-emptied:]
+        return qty
+
+    def _rest(self, order_id: int, side: int, qty: float, price: float):
+        """Leave a limit order in the book, until the price comes to it."""
+        self.orders[order_id] = (side, 'LIMIT', qty, price, None)
+        self._enqueue(self._resting[side], self._resting_prices[side], price, order_id)
+
+    def _match_open_orders(self):
+        """Fill resting orders the book has reached, and trigger stops."""
+        orders = self.orders
+        for side in (BUY, SELL):
+            levels, prices = self._resting[side], self._resting_prices[side]
+            other = self._prices[-side]
+            while prices and other:
+                # The highest bid first, or the lowest ask
+                if side == BUY:
+                    price = prices[-1]
+                    if other[0] > price:
+                        break
+                else:
+                    price = prices[0]
+                    if other[-1] < price:
+                        break
+                queue = levels[price]
+                for order_id in list(queue):
+                    left = self._make(order_id, side, orders[order_id][2], price)
+                    if left > 0:
+                        # Out of liquidity at this price
+                        orders[order_id] = (side, 'LIMIT', left, price, None)
+                        break
+                    del orders[order_id]
+                    del queue[order_id]
+                else:
+                    del levels[price]
+                    if side == BUY:
+                        prices.pop()
+                    else:
+                        del prices[0]
+                    continue
+                break
+        if self._stops_above[1] or self._stops_below[1]:
+            self._trigger_stops()
+
+    def _make(self, order_id: int, side: int, qty: float, price: float) -> float:
+        """
+        Fill a resting order at its own price, as a maker, against the
+        liquidity that reached it. Returns the quantity left unfilled.
+        """
+        other = -side
+        prices, quantities = self._prices[other], self._quantities[other]
+        fee_rate = self.maker_fee
+        fills = self.fills
+        while qty > 0 and prices:
+            level = prices[0] if side == BUY else prices[-1]
+            if level > price if side == BUY else level < price:
+                break
+            available = quantities[level]
+            if available > qty:
+                quantities[level] = available - qty
+                fills.append((order_id, side, price, qty, qty * price * fee_rate, True))
+                return 0.
+            fills.append((order_id, side, price, available, available * price * fee_rate, True))
+            qty -= available
+            # The level is used up, like in `_take`
+            del quantities[level]
+            if side == BUY:
+                del prices[0]
+            else:
+                prices.pop()
+        return qty
+
+    def _trigger_stops(self):
+        """Turn the stop orders the price has reached into live orders."""
+        above, below = self._stops_above, self._stops_below
+        while above[1] or below[1]:
+            price = self.mid_price()
+            if price is None:
+                return
+            # The lowest of the stops waiting for a rise, or the highest of
+            # those waiting for a fall
+            if above[1] and above[1][0] <= price:
+                stops, stop_price = above, above[1][0]
+            elif below[1] and below[1][-1] >= price:
+                stops, stop_price = below, below[1][-1]
+            else:
+                return
+            order_id = next(iter(stops[0][stop_price]))
+            self._dequeue(*stops, stop_price, order_id)
+            side, order_type, qty, limit, _ = self.orders.pop(order_id)
+            if _TRIGGERED[order_type] == 'MARKET':
+                self._take(order_id, side, qty, None)
+            else:
+                left = self._take(order_id, side, qty, limit)
+                if left > 0:
+                    self._rest(order_id, side, left, limit)
+
+
+class SyntheticDepth:
+    """
+    Order book depth made up around a price, when none was recorded.
+
+    Each side has `levels` levels of `level_qty`, the first `half_spread`
+    away from the price (as a fraction of it) and each next one `step`
+    further. Market orders larger than the whole side are only partially
+    filled.
+    """
+
+    def __init__(
+        self,
+        half_spread: float = 0.0001,
+        step: float = 0.0001,
+        level_qty: float = 1.,
+        levels: int = 20
+    ):
+        self.half_spread = half_spread
+        self.step = step
+        self.level_qty = level_qty
+        self.levels = levels
+
+    @classmethod
+    def from_candles(
+        cls, high, low, close, volume, levels: int = 20, participation: float = 0.01
+    ) -> 'SyntheticDepth':
+        """
+        Size the depth after a series of candles.
+
+        The levels of each side span the median range of a candle, and
+        together hold `participation` of the median volume of a candle.
+        """
+        close = numpy.asarray(close, dtype=float)
+        spread = numpy.median((numpy.asarray(high) - numpy.asarray(low)) / close)
+        step = spread / levels
+        return cls(
+            half_spread=step / 2,
+            step=step,
+            level_qty=participation * float(numpy.median(volume)) / levels,
+            levels=levels
+        )
+
+    def book(self, price: float) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """Return the bid and ask levels around `price`, best first."""
+        offsets = [self.half_spread + level * self.step for level in range(self.levels)]
+        return (
+            [(price * (1 - offset), self.level_qty) for offset in offsets],
+            [(price * (1 + offset), self.level_qty) for offset in offsets],
+        )
+
+    def fill_vector(self, quantities, prices) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Fill market orders against the depth around each one's price.
+
+        `quantities` are signed, positive to buy and negative to sell.
+        Every order meets a fresh book, so the orders are independent of
+        each other and are all filled at once. Returns the quantity filled
+        (signed, like the order) and the average price of each order.
+        """
+        quantities = numpy.asarray(quantities, dtype=float)
+        prices = numpy.asarray(prices, dtype=float)
+        size = numpy.minimum(numpy.abs(quantities), self.levels * self.level_qty)
+        # Whole levels taken, and what is left for the next one
+        whole = numpy.floor(size / self.level_qty)
+        part = size - whole * self.level_qty
+        # Sum of the offsets of the whole levels, then of the partial one
+        offsets = self.level_qty * (
+            whole * self.half_spread + self.step * whole * (whole - 1) / 2
+        ) + part * (self.half_spread + self.step * whole)
+        side = numpy.sign(quantities)
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            average = numpy.where(size > 0, prices * (1 + side * offsets / size), prices)
+        return side * size, average
@@ -0,0 +1,102 @@
+"""
+Indicators precomputed once for a whole parameter sweep.
+
+Every combination of a sweep over moving average windows needs the same
+few dozen simple moving averages. They are all computed up front from a
+single cumulative sum per price column, into a block of shared memory that
+every worker process of the sweep maps, rather than each combination
+computing its own.
+"""
+
+from itertools import groupby
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy
+
+
+def sma_matrix(prices, windows: Sequence[int], out: numpy.ndarray = None) -> numpy.ndarray:
+    """
+    Compute the simple moving averages of `prices` over several windows.
+
+    Returns one row per window, with as many columns as `prices`. Each
+    average is taken over the window ending on its column, and is NaN
+    until there are enough prices for a full window. All the rows come
+    from a single cumulative sum of the prices, so the cost does not
+    depend on the size of the windows.
+    """
+    prices = numpy.asarray(prices, dtype=float)
+    if out is None:
+        out = numpy.empty((len(windows), len(prices)))
+    cumulative = numpy.concatenate(([0.], numpy.cumsum(prices)))
+    for row, window in enumerate(windows):
+        out[row, :window - 1] = numpy.nan
+        if window <= len(prices):
+            numpy.subtract(cumulative[window:], cumulative[:-window], out=out[row, window - 1:])
+            out[row, window - 1:] /= window
+    return out
+
+
+class SMATable:
+    """
+    Simple moving averages, one row per (column, window).
+
+    Backtests over the first rows of the data the table was built from
+    read the first columns of the table, since each average only depends
+    on the prices up to its own row.
+    """
+
+    def __init__(self, matrix: numpy.ndarray, keys: Sequence[Tuple[str, int]]):
+        self.matrix = matrix
+        self.index = {tuple(key): row for row, key in enumerate(keys)}
+
+    def get(
+        self, column: str, windows: Sequence[int], length: int
+    ) -> Optional[List[numpy.ndarray]]:
+        """
+        Return the averages of `column` over `windows` for the first
+        `length` rows, as read-only views, or `None` if any is missing.
+        """
+        if length > self.matrix.shape[1]:
+            return None
+        try:
+            rows = [self.index[column, window] for window in windows]
+        except KeyError:
+            return None
+        return [self.matrix[row, :length] for row in rows]
+
+
+def share_smas(
+    data, keys: Sequence[Tuple[str, int]]
+) -> Tuple[shared_memory.SharedMemory, Dict]:
+    """
+    Compute the averages of `keys` over `data` into shared memory.
+
+    Returns the block of shared memory, which the caller closes and
+    unlinks once the workers are done with it, and the description of the
+    table for `attach_smas`, which is cheap to pickle.
+    """
+    keys = sorted(set(tuple(key) for key in keys))
+    shape = (len(keys), len(data))
+    block = shared_memory.SharedMemory(
+        create=True, size=max(1, shape[0] * shape[1] * 8)
+    )
+    matrix = numpy.ndarray(shape, dtype=float, buffer=block.buf)
+    # Sorted keys keep the windows of each column on consecutive rows
+    start = 0
+    for column, group in groupby(keys, key=lambda key: key[0]):
+        windows = [window for _, window in group]
+        sma_matrix(data[column], windows, out=matrix[start:start + len(windows)])
+        start += len(windows)
+    return block, {'name': block.name, 'shape': shape, 'keys': keys}
+
+
+def attach_smas(description: Dict) -> Tuple[shared_memory.SharedMemory, SMATable]:
+    """
+    Map a table of averages made by `share_smas` in another process.
+
+    The block must be kept open for as long as the table is used.
+    """
+    block = shared_memory.SharedMemory(name=description['name'])
+    matrix = numpy.ndarray(description['shape'], dtype=float, buffer=block.buf)
+    matrix.flags.writeable = False
+    return block, SMATable(matrix, description['keys'])
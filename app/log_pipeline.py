@@ -0,0 +1,161 @@
+"""
+Logging that stays out of the way of the backtest loop.
+
+Log records are put on a queue by the thread that logs them, and
+formatted and written out by a listener on a background thread, so the
+backtest never waits on the file or the terminal. Messages logged for
+every tick or every fill go through the loggers of `tick_logger`, under
+`TICKS`: they are rate limited per line of code, and dropped altogether
+in the quiet profile, while the rest of the log is kept as it is.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from time import monotonic
+from typing import Dict, Tuple
+import atexit
+import logging
+import os
+import threading
+
+# Parent of the loggers of per-tick and per-fill messages
+TICKS = 'ticks'
+
+# Default rate of per-tick messages, by line of code
+TICK_RATE = 1000.
+TICK_BURST = 1000
+
+LOG_FORMAT = '{asctime} - {name}: {levelname} $ {message}'
+
+logger = logging.getLogger(__name__)
+
+
+def tick_logger(name: str) -> logging.Logger:
+    """The logger for the per-tick and per-fill messages of a module."""
+    return logging.getLogger(f'{TICKS}.{name}')
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most `rate` per-tick records a second from each line of
+    code, after a first `burst` of them.
+
+    Each line has a bucket of `burst` tokens, refilled at `rate` tokens a
+    second, and every record takes one. Records logged outside `TICKS`
+    are never dropped. The number of records dropped is kept in
+    `dropped`. Records are filtered on the threads that log them, so
+    the buckets are only counted holding a lock.
+    """
+
+    def __init__(self, rate: float = TICK_RATE, burst: int = TICK_BURST):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.dropped = 0
+        # Tokens left and when they were last counted, by line of code
+        self._buckets: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.rate or not record.name.startswith(TICKS + '.'):
+            return True
+        with self._lock:
+            now = monotonic()
+            bucket = self._buckets.get((record.pathname, record.lineno))
+            if bucket is None:
+                bucket = self._buckets[record.pathname, record.lineno] = [self.burst, now]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                self.dropped += 1
+                return False
+            bucket[0] = tokens - 1
+            return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Queue records as they are, leaving the formatting to the listener.
+
+    The arguments of a record are formatted into its message on the
+    listener's thread, so they must not be changed after being logged.
+    The queue stays within the process, so records are not pickled.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class LogPipeline:
+    """
+    The handlers of the root logger, behind a queue.
+
+    `handlers` format and write the records on the listener's thread.
+    The listener is stopped when the interpreter exits, once it has
+    written out every record still queued.
+    """
+
+    def __init__(self, *handlers: logging.Handler, level: int = logging.INFO):
+        queue = SimpleQueue()
+        self.rate_limit = RateLimitFilter()
+        self.handler = LazyQueueHandler(queue)
+        self.handler.addFilter(self.rate_limit)
+        formatter = logging.Formatter(LOG_FORMAT, style='{')
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        self.listener = QueueListener(queue, *handlers, respect_handler_level=True)
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(self.handler)
+        self.listener.start()
+        self.running = True
+        atexit.register(self.stop)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def stop(self):
+        """
+        Write out the records still queued, and stop the listener.
+
+        Ends the log with the number of per-tick records the rate limit
+        dropped, if any.
+        """
+        if self.running:
+            if self.rate_limit.dropped:
+                logger.info(
+                    f"Dropped {self.rate_limit.dropped} per-tick log records "
+                    "over the rate limit."
+                )
+            logging.getLogger().removeHandler(self.handler)
+            self.listener.stop()
+            self.running = False
+
+    def _after_fork(self):
+        """Have a forked process write its records itself."""
+        # Only the thread that forked lives on in the child, not the listener
+        if self.running:
+            root = logging.getLogger()
+            root.removeHandler(self.handler)
+            for handler in self.listener.handlers:
+                root.addHandler(handler)
+            self.running = False
+
+    def tick_messages(self, quiet: bool = False, rate: float = TICK_RATE):
+        """
+        Set how many per-tick messages are logged.
+
+        In the quiet profile they are all dropped, by the loggers
+        themselves so that not even their records are made. Otherwise at
+        most `rate` a second are let through from each line, or all of
+        them with a rate of zero.
+        """
+        logging.getLogger(TICKS).setLevel(logging.WARNING if quiet else logging.NOTSET)
+        self.rate_limit.rate = rate
+
+
+def configure(path: str = 'last_run.log', level: int = logging.INFO) -> LogPipeline:
+    """Log to a file, overwritten on each run, and to the terminal."""
+    return LogPipeline(
+        logging.FileHandler(path, mode='w'), logging.StreamHandler(), level=level
+    )
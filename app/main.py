@@ -4,22 +4,20 @@ import curio      # async library
 import logging    # python standard logging library
 import click      # command line interface creation kit (click)
 import click_log  # connects the logger output to click output
+from functools import partial
 
 from datasources.binance_csv import BinanceCSV
+from datasources.binance_csv_stream import BinanceCSVStream
+from datasources.kline_store import KlineStore, KlineStoreSource
 from datasources.binance_api import binance_api
 from strategies.moving_average import moving_average
 from strategies.dca import DCA
 from exchanges.fake_exchange import FakeExchange
+from exchanges.matching_exchange import MatchingExchange
+from log_pipeline import TICK_RATE, configure as configure_logging
 
-logging.basicConfig(
-        format='{asctime} - {name}: {levelname} $ {msg}',
-        style='{',
-        level=logging.INFO,
-        handlers=[
-            logging.FileHandler("last_run.log", mode='w'),
-            logging.StreamHandler()
-        ]
-)
+# Log records are written out on a background thread
+log_pipeline = configure_logging("last_run.log", level=logging.INFO)
 logger = logging.getLogger(__name__)
 click_log.basic_config(logger)
 
@@ -42,28 +40,61 @@ strategy_dict = {
 
 exchange_dict = {
     "fake_exchange": FakeExchange,
+    "matching_exchange": MatchingExchange,
 }
 
 datasource_dict = {
     "binance_csv": BinanceCSV,
+    "binance_csv_stream": BinanceCSVStream,
     "binance_api": binance_api,
+    "kline_store": KlineStoreSource,
 }
 
 
+def select_datasource(datasource: str, symbol, interval, start, end):
+    """
+    Return the datasource class of a name, ready to be opened with a path.
+
+    The local kline store also needs a symbol and an interval to select
+    its klines by.
+    """
+    if datasource_dict[datasource] is not KlineStoreSource:
+        return datasource_dict[datasource]
+    if symbol is None or interval is None:
+        raise click.UsageError(
+            'The kline_store datasource needs a --symbol and an --interval.'
+        )
+    return partial(
+        KlineStoreSource, symbol=symbol, interval=interval, start=start, end=end
+    )
+
+
 @click.command()
 @click.option(
     '--strategy',
-    help='Which strategy to use',
-    type=click.Choice(strategy_dict.keys(), case_sensitive=False)
+    help=(
+        'Which strategy to use. Repeat it to backtest several strategies '
+        'over a single read of the data'
+    ),
+    type=click.Choice(strategy_dict.keys(), case_sensitive=False),
+    multiple=True
 )
 @click.option(
     '--strategy_params',
-    help='The parameters for the strategy, as a comma-separated list'
+    help=(
+        'The parameters for the strategy, as a comma-separated list. Repeat '
+        'it once per --strategy, in the same order'
+    ),
+    multiple=True
 )
 @click.option(
     '--exchange',
-    help='Which exchange to use',
-    type=click.Choice(exchange_dict.keys())
+    help=(
+        'Which exchange to use. Give it once to use it for every strategy, '
+        'or once per --strategy; each strategy has an account of its own'
+    ),
+    type=click.Choice(exchange_dict.keys()),
+    multiple=True
 )
 @click.option(
     '--datasource',
@@ -72,11 +103,14 @@ datasource_dict = {
 )
 @click.option(
     '--datasource_path',
-    help='The path to the datasource csv or api endpoint',
+    help=(
+        'The path to the datasource csv or api endpoint, or to the folder of '
+        'the local kline store'
+    ),
     type=click.Path(
         exists=True,
         file_okay=True,
-        dir_okay=False,
+        dir_okay=True,
         writable=False,
         readable=True,
         resolve_path=False,
@@ -85,14 +119,70 @@ datasource_dict = {
     ),
     required=False
 )
+@click.option(
+    '--engine',
+    help=(
+        'Which backtest engine to use: the tick by tick event loop, or the '
+        'vectorised one for strategies that support it'
+    ),
+    type=click.Choice(['event', 'vector']),
+    default='event',
+    show_default=True
+)
+@click.option(
+    '--batch_size',
+    help='How many rows the data source sends to the strategy at once',
+    type=click.IntRange(min=1),
+    default=BinanceCSV.BATCH_SIZE,
+    show_default=True
+)
+@click.option('--symbol', help='Which symbol to select from the local kline store')
+@click.option('--interval', help='Which kline interval to select from the local kline store')
+@click.option('--start', help='Select klines from the local kline store opened from this date')
+@click.option('--end', help='Select klines from the local kline store opened until this date')
+@click.option(
+    '--profile',
+    help='Time each stage of the backtest and print a summary table at the end',
+    is_flag=True
+)
+@click.option(
+    '--cprofile',
+    help='Also run the backtest under cProfile, saving the statistics to this file',
+    type=click.Path(dir_okay=False, writable=True)
+)
+@click.option(
+    '--quiet',
+    help=(
+        'Leave out the lines logged for every tick and every fill, keeping '
+        'the summary of each strategy at the end'
+    ),
+    is_flag=True
+)
+@click.option(
+    '--log_rate',
+    help=(
+        'At most how many lines a second to log from each per-tick or '
+        'per-fill message, 0 for all of them'
+    ),
+    type=click.FloatRange(min=0),
+    default=TICK_RATE,
+    show_default=True
+)
 @click_log.simple_verbosity_option(logger)
-def backtest(strategy, strategy_params, exchange, datasource, datasource_path):
+def backtest(
+    strategy, strategy_params, exchange, datasource, datasource_path, engine,
+    batch_size, symbol, interval, start, end, profile, cprofile, quiet, log_rate
+):
     """TODO: Add description."""
+    log_pipeline.tick_messages(quiet=quiet, rate=log_rate)
+    # Selecting data by symbol and interval means reading the kline store
+    if symbol is not None:
+        datasource = datasource or 'kline_store'
     if any(
         [
-            strategy is None,
-            strategy_params is None,
-            exchange is None,
+            not strategy,
+            not strategy_params,
+            not exchange,
             datasource is None
         ]
     ):
@@ -102,18 +192,59 @@ def backtest(strategy, strategy_params, exchange, datasource, datasource_path):
                 'arguments'
             )
         )
+    if len(strategy_params) != len(strategy):
+        raise click.UsageError('Give one --strategy_params per --strategy.')
+    if len(exchange) == 1:
+        exchange = exchange * len(strategy)
+    elif len(exchange) != len(strategy):
+        raise click.UsageError('Give one --exchange, or one per --strategy.')
+    if profile and len(strategy) > 1:
+        raise click.UsageError('--profile backtests a single strategy.')
+    if engine == 'vector' and datasource is not None \
+            and not datasource_dict[datasource].IN_MEMORY:
+        raise click.UsageError(
+            f'The {datasource} datasource streams its rows, which the vector '
+            'engine cannot use. Use --engine event or another datasource.'
+        )
     # We don't need to handle the case of these assignments failing because
     # validaiton is handled for us by click
     # TODO: --datasource_path is required for some strategies but not others
     # - not sure how to get this working properly in click.
-    strategy_object = strategy_dict[strategy]
-    exchange_object = exchange_dict[exchange]
-    datasrce_object = datasource_dict[datasource]
+    runs = [
+        (strategy_dict[name], params, exchange_dict[exchange_name])
+        for name, params, exchange_name in zip(strategy, strategy_params, exchange)
+    ]
+    datasrce_object = select_datasource(datasource, symbol, interval, start, end)
     from backtest import backtest_runner as bt
-    curio.run(
-        bt.run, strategy_object, exchange_object, datasrce_object,
-        strategy_params, datasource_path
-    )
+    from profiling import PipelineProfile, cprofiled
+    pipeline_profile = PipelineProfile() if profile else None
+    if len(runs) > 1:
+        if engine == 'vector':
+            run = partial(bt.run_vector_many, runs, datasrce_object, datasource_path)
+        else:
+            run = partial(
+                curio.run, bt.run_many, runs, datasrce_object, datasource_path,
+                batch_size
+            )
+    elif engine == 'vector':
+        strategy_object, params, exchange_object = runs[0]
+        run = partial(
+            bt.run_vector, strategy_object, exchange_object, datasrce_object,
+            params, datasource_path, pipeline_profile
+        )
+    else:
+        strategy_object, params, exchange_object = runs[0]
+        run = partial(
+            curio.run, bt.run, strategy_object, exchange_object,
+            datasrce_object, params, datasource_path, batch_size,
+            pipeline_profile
+        )
+    if cprofile is None:
+        run()
+    else:
+        cprofiled(cprofile, run).sort_stats('cumulative').print_stats(20)
+    if pipeline_profile is not None:
+        click.echo(pipeline_profile.summary())
 
     # output_ddca = strategy_ddca.run('app/strategies/ddca.ini')
 
@@ -135,18 +266,272 @@ def connect_to_api(strategy, strategy_params, exchange, datasource):
 
 
 @click.command()
-@click.option('--strategy', help='Which strategy to use')
-@click.option('--datasource', help='Which data source class to use')
+@click.option(
+    '--strategy',
+    help='Which strategy to use',
+    type=click.Choice(strategy_dict.keys(), case_sensitive=False),
+    required=True
+)
+@click.option(
+    '--param_grid',
+    help=(
+        'The grid of parameters for the strategy, as a comma-separated list '
+        'of values, start:stop[:step] ranges or a|b|c choices'
+    ),
+    required=True
+)
+@click.option(
+    '--exchange',
+    help='Which exchange to use',
+    type=click.Choice(exchange_dict.keys()),
+    default='fake_exchange',
+    show_default=True
+)
+@click.option(
+    '--datasource',
+    help='Which data source class to use',
+    type=click.Choice(list(datasource_dict.keys())),
+    required=True
+)
 @click.option(
     '--datasource_path',
-    help='The path to the datasource csv (if applicable)'
+    help=(
+        'The path to the datasource csv (if applicable), or to the folder of '
+        'the local kline store'
+    )
 )
-def optimise(strategy, datasource, datasource_path):
-    """TODO: Add description."""
-    logger.info((
-        "This is where in the future we will run a training algorithm to "
-        "optimise the params of the strategy"
-    ))
+@click.option('--symbol', help='Which symbol to select from the local kline store')
+@click.option('--interval', help='Which kline interval to select from the local kline store')
+@click.option('--start', help='Select klines from the local kline store opened from this date')
+@click.option('--end', help='Select klines from the local kline store opened until this date')
+@click.option(
+    '--workers',
+    help='How many worker processes to use. Defaults to one per core',
+    type=click.IntRange(min=1)
+)
+@click.option(
+    '--output',
+    help='Where to write the ranked results table',
+    type=click.Path(dir_okay=False, writable=True),
+    default='optimise_results.csv',
+    show_default=True
+)
+@click.option(
+    '--halving_rate',
+    help=(
+        'Search by successive halving: backtest every combination on a short '
+        'stretch of history, then keep the best 1 in this many for a stretch '
+        'this many times longer, until the whole history'
+    ),
+    type=click.IntRange(min=2)
+)
+@click.option(
+    '--max_drawdown',
+    help=(
+        'Abort a backtest when its drawdown goes over this amount of the '
+        'quote currency, and rank it below those that were not aborted'
+    ),
+    type=click.FloatRange(min=0)
+)
+@click.option(
+    '--cache/--no-cache',
+    help='Reuse the results of combinations backtested before on the same data',
+    default=True,
+    show_default=True
+)
+@click.option(
+    '--cache_dir',
+    help='Where to keep the results of backtests',
+    type=click.Path(file_okay=False, writable=True),
+    default='data/result_cache',
+    show_default=True
+)
+@click.option(
+    '--cache_size',
+    help='How many MB of results to keep, dropping the least recently used ones',
+    type=click.IntRange(min=1),
+    default=512,
+    show_default=True
+)
+@click_log.simple_verbosity_option(logger)
+def optimise(
+    strategy, param_grid, exchange, datasource, datasource_path, symbol, interval,
+    start, end, workers, output, halving_rate, max_drawdown, cache, cache_dir,
+    cache_size
+):
+    """Backtest every combination of a parameter grid and rank them."""
+    if not datasource_dict[datasource].IN_MEMORY:
+        raise click.UsageError(
+            f'The {datasource} datasource streams its rows, which the '
+            'optimiser cannot use. Use another datasource.'
+        )
+    datasrce_object = select_datasource(datasource, symbol, interval, start, end)
+    from optimise import optimiser
+    from result_cache import ResultCache
+    result_cache = ResultCache(cache_dir, cache_size * 2 ** 20) if cache else None
+    ranking = optimiser.run(
+        strategy_dict[strategy], exchange_dict[exchange],
+        datasrce_object, param_grid, datasource_path, workers,
+        result_cache, halving_rate, max_drawdown
+    )
+    ranking.to_csv(output, index=False)
+    logger.info(f"Best parameters:\n{ranking.head(10).to_string(index=False)}")
+    logger.info(f"Wrote {len(ranking)} results to {output}")
+
+
+@click.command()
+@click.option('--symbol', help='Which currency symbol to download', required=True)
+@click.option('--interval', help='The kline interval, e.g. 1m or 1h', required=True)
+@click.option('--start', help='Download klines opened from this date', required=True)
+@click.option('--end', help='Download klines opened until this date', required=True)
+@click.option(
+    '--output',
+    help='The csv file to write the klines to',
+    type=click.Path(dir_okay=False, writable=True),
+    required=True
+)
+@click.option('--url', help='The Binance API URL to download from')
+@click.option(
+    '--workers',
+    help='How many pages to download at the same time',
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True
+)
+@click_log.simple_verbosity_option(logger)
+def download(symbol, interval, start, end, output, url, workers):
+    """Download historical klines from the Binance API."""
+    from binance import Binance
+    from datasources.kline_downloader import KlineDownloader, write_csv
+    downloader = KlineDownloader(Binance(url=url).public, workers)
+    klines = downloader.download(symbol, interval, start, end)
+    write_csv(klines, output, symbol)
+    logger.info(f"Wrote {len(klines)} klines to {output}")
+
+
+@click.command()
+@click.option('--symbol', help='Which currency symbol to sync', required=True)
+@click.option('--interval', help='The kline interval, e.g. 1m or 1h', required=True)
+@click.option(
+    '--start',
+    help='Where to start from if nothing is stored yet for the symbol and interval'
+)
+@click.option(
+    '--store',
+    help='The folder of the local kline store',
+    default=KlineStore.ROOT,
+    show_default=True
+)
+@click.option('--url', help='The Binance API URL to download from')
+@click.option(
+    '--workers',
+    help='How many pages to download at the same time',
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True
+)
+@click_log.simple_verbosity_option(logger)
+def sync(symbol, interval, start, store, url, workers):
+    """Download the klines closed since the last one in the local kline store."""
+    from binance import Binance
+    from datasources.kline_downloader import KlineDownloader
+    downloader = KlineDownloader(Binance(url=url).public, workers)
+    KlineStore(store).sync(downloader, symbol, interval, start)
+
+
+@click.command()
+@click.option(
+    '--cases',
+    help='Which cases to run, as a comma-separated list. Defaults to all of them'
+)
+@click.option(
+    '--sizes',
+    help='How many rows of synthetic data to run each case on, comma-separated',
+    default='10000,1000000,10000000',
+    show_default=True
+)
+@click.option(
+    '--data_dir',
+    help='Where to keep the synthetic data, reused between runs',
+    type=click.Path(file_okay=False, writable=True),
+    default='data/benchmark',
+    show_default=True
+)
+@click.option(
+    '--output',
+    help='Where to write the results, as JSON',
+    type=click.Path(dir_okay=False, writable=True),
+    default='benchmark_results.json',
+    show_default=True
+)
+@click.option(
+    '--baseline',
+    help='Results of an earlier run to check for regressions against',
+    type=click.Path(exists=True, dir_okay=False)
+)
+@click.option(
+    '--tolerance',
+    help='Drop in ticks per second from the baseline tolerated, as a fraction',
+    type=click.FloatRange(min=0),
+    default=0.1,
+    show_default=True
+)
+@click_log.simple_verbosity_option(logger)
+def benchmark(cases, sizes, data_dir, output, baseline, tolerance):
+    """Benchmark the throughput of the backtest pipeline."""
+    import json
+    from benchmark import CASES, benchmark as benchmark_runner, compare, shortfalls
+    cases = cases.split(',') if cases else list(CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        raise click.BadParameter(
+            f"Unknown cases {', '.join(sorted(unknown))}, "
+            f"valid options are {', '.join(CASES)}.",
+            param_hint='--cases'
+        )
+    if baseline:
+        # Read before running, the output may overwrite it
+        with open(baseline) as file:
+            baseline_report = json.load(file)
+
+    report = benchmark_runner.run(
+        cases, [int(size) for size in sizes.split(',')], data_dir
+    )
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    logger.info(f"Wrote {len(report['results'])} results to {output}")
+
+    missed = shortfalls(report)
+    for shortfall in missed:
+        logger.warning(f"Too slow: {shortfall}")
+    if baseline:
+        regressions = compare(baseline_report, report, tolerance)
+        for regression in regressions:
+            logger.warning(f"Regression: {regression}")
+        if regressions:
+            raise click.ClickException(
+                f"{len(regressions)} cases are slower than in {baseline}."
+            )
+    if missed:
+        raise click.ClickException(
+            f"{len(missed)} cases are slower than they are required to be."
+        )
+
+
+@click.command()
+@click.option(
+    '--cache_dir',
+    help='The folder of backtest results to empty',
+    type=click.Path(file_okay=False),
+    default='data/result_cache',
+    show_default=True
+)
+@click_log.simple_verbosity_option(logger)
+def clear_cache(cache_dir):
+    """Remove every stored backtest result."""
+    from result_cache import ResultCache
+    removed = ResultCache(cache_dir).clear()
+    logger.info(f"Removed {removed} backtest results from {cache_dir}")
 
 
 # Register the CLI commands
@@ -159,6 +544,10 @@ def cli():
 cli.add_command(backtest)
 cli.add_command(connect_to_api)
 cli.add_command(optimise)
+cli.add_command(download)
+cli.add_command(sync)
+cli.add_command(benchmark)
+cli.add_command(clear_cache)
 
 # Entrypoint
 if __name__ == '__main__':
@@ -0,0 +1,195 @@
+"""
+Performance metrics of a backtest, kept up to date as it runs.
+
+An exchange feeds every fill, and every price it is told about, to a
+`Metrics` accumulator. Each update costs the same however long the
+backtest has run: the mean and variance of the returns are kept with
+Welford's online algorithm, and the drawdown against the running peak of
+the equity. At the end of the run the metrics are read off in one go, so
+scoring a backtest never means reading its logs back.
+"""
+
+from array import array
+from math import isnan, nan, sqrt
+from typing import Dict
+import numpy
+
+# The metrics of a run, as exported by `Metrics.to_array`
+METRICS_DTYPE = numpy.dtype([
+    ('equity', 'f8'),
+    ('max_drawdown', 'f8'),
+    ('sharpe', 'f8'),
+    ('sortino', 'f8'),
+    ('exposure', 'f8'),
+    ('turnover', 'f8'),
+    ('fees', 'f8'),
+    ('trades', 'i8'),
+    ('marks', 'i8'),
+])
+
+
+class Metrics:
+    """
+    Streaming metrics of a trading account.
+
+    The account is marked to market on every fill, at the price of the
+    fill, and on every call to `mark`. Each mark adds a point to the
+    equity curve (cash plus the position at the mark's price), and from
+    the second one on a return: the change in equity since the previous
+    mark, in the quote currency like the equity itself. The drawdown is
+    how far the equity is below its highest mark so far. Sharpe and
+    Sortino ratios are per mark, not annualised, and the exposure is the
+    share of the marks taken with a position open.
+    """
+
+    def __init__(self, cash: float = 0., position: float = 0.):
+        self.cash = cash
+        self.position = position
+        self.turnover = 0.
+        self.fees = 0.
+        self.trades = 0
+        # Marks, and those taken with a position open
+        self.marks = 0
+        self.exposed = 0
+        self.peak = nan
+        self.max_drawdown = 0.
+        # Welford's running mean and sum of squared deviations of the
+        # returns, and the sum of squares of the negative ones
+        self.returns = 0
+        self.mean = 0.
+        self.m2 = 0.
+        self.downside = 0.
+        # The equity at each mark, as a compact array of doubles
+        self.curve = array('d')
+
+    def fill(self, qty: float, price: float, fee: float = 0.):
+        """Record a fill of `qty` (negative to sell) at `price`."""
+        self.cash -= qty * price + fee
+        self.position += qty
+        self.turnover += abs(qty) * price
+        self.fees += fee
+        self.trades += 1
+        self.mark(price)
+
+    def mark(self, price: float):
+        """Mark the account to market at `price`."""
+        equity = self.cash + self.position * price
+        if self.marks:
+            change = equity - self.curve[-1]
+            self.returns += 1
+            delta = change - self.mean
+            self.mean += delta / self.returns
+            self.m2 += delta * (change - self.mean)
+            if change < 0:
+                self.downside += change * change
+        if not equity <= self.peak:
+            self.peak = equity
+        elif self.peak - equity > self.max_drawdown:
+            self.max_drawdown = self.peak - equity
+        self.marks += 1
+        self.exposed += self.position != 0
+        self.curve.append(equity)
+
+    def fill_vector(self, quantities, prices, fees=0.):
+        """
+        Record a vector of rows, each a fill or a mark.
+
+        A row with a zero quantity is a mark. The same as calling `fill`
+        or `mark` for each row in turn, with the returns of the rows
+        folded into the running mean and variance at once.
+        """
+        quantities = numpy.asarray(quantities, dtype=float)
+        prices = numpy.asarray(prices, dtype=float)
+        if not len(quantities):
+            return
+        fees = numpy.where(quantities != 0, fees, 0.)
+        cash = self.cash - numpy.cumsum(quantities * prices + fees)
+        position = self.position + numpy.cumsum(quantities)
+        equity = cash + position * prices
+
+        self.cash = float(cash[-1])
+        self.position = float(position[-1])
+        self.turnover += float(numpy.abs(quantities) @ prices)
+        self.fees += float(fees.sum())
+        self.trades += int(numpy.count_nonzero(quantities))
+
+        if self.marks:
+            changes = numpy.diff(equity, prepend=self.curve[-1])
+        else:
+            changes = numpy.diff(equity)
+        if len(changes):
+            # Chan et al.'s update, merging the statistics of the new returns
+            count = self.returns + len(changes)
+            mean = float(changes.mean())
+            delta = mean - self.mean
+            self.m2 += float(((changes - mean) ** 2).sum()) \
+                + delta * delta * self.returns * len(changes) / count
+            self.mean += delta * len(changes) / count
+            self.returns = count
+            self.downside += float((numpy.minimum(changes, 0.) ** 2).sum())
+
+        peaks = numpy.fmax.accumulate(numpy.concatenate(([self.peak], equity)))[1:]
+        self.peak = float(peaks[-1])
+        self.max_drawdown = max(self.max_drawdown, float((peaks - equity).max()))
+        self.marks += len(equity)
+        self.exposed += int(numpy.count_nonzero(position))
+        self.curve.frombytes(equity.tobytes())
+
+    # Results
+
+    @property
+    def equity(self) -> float:
+        """The equity at the last mark."""
+        return self.curve[-1] if self.marks else self.cash
+
+    @property
+    def sharpe(self) -> float:
+        """Mean return over its standard deviation, per mark."""
+        if self.returns < 2 or self.m2 <= 0:
+            return nan
+        return self.mean / sqrt(self.m2 / (self.returns - 1))
+
+    @property
+    def sortino(self) -> float:
+        """Mean return over its downside deviation, per mark."""
+        if not self.returns or self.downside <= 0:
+            return nan
+        return self.mean / sqrt(self.downside / self.returns)
+
+    @property
+    def exposure(self) -> float:
+        """The share of the marks taken with a position open."""
+        return self.exposed / self.marks if self.marks else 0.
+
+    def equity_curve(self) -> numpy.ndarray:
+        """The equity at each mark, oldest first."""
+        # A copy, as the curve cannot grow while a view of it is alive
+        return numpy.array(self.curve, dtype=float)
+
+    def to_array(self) -> numpy.ndarray:
+        """The metrics, as a single record of `METRICS_DTYPE`."""
+        return numpy.array([tuple(
+            getattr(self, name) for name in METRICS_DTYPE.names
+        )], dtype=METRICS_DTYPE)[0]
+
+    def summary(self) -> Dict:
+        """
+        The metrics, as a dictionary of plain numbers.
+
+        Ratios that are not defined, without enough returns to work them
+        out, are None rather than NaN, so the summary survives a round
+        trip through JSON.
+        """
+        summary = {name: getattr(self, name) for name in METRICS_DTYPE.names}
+        for name in ('sharpe', 'sortino'):
+            if isnan(summary[name]):
+                summary[name] = None
+        return summary
+
+    def __str__(self):
+        return (
+            f"equity {self.equity}, max drawdown {self.max_drawdown}, "
+            f"Sharpe {self.sharpe:.4f}, Sortino {self.sortino:.4f}, "
+            f"exposure {self.exposure:.1%}, turnover {self.turnover}, "
+            f"{self.trades} trades"
+        )
@@ -0,0 +1,220 @@
+"""
+Optimise the parameters of a strategy.
+
+Every combination of a grid of strategy parameters is backtested with the
+vectorised engine, spread over a pool of worker processes, and the results
+are ranked by profit/loss. Large grids can be searched by successive
+halving instead: every combination is backtested on a short stretch of the
+history, and only the best ones go on to longer stretches.
+"""
+
+from backtest import backtest_runner
+from strategies.base_class import StrategyBaseClass as strat
+from exchanges.base_class import ExchangeBaseClass as exch
+from indicators import attach_smas, share_smas
+from result_cache import ResultCache, data_digest
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import List
+import math
+import os
+import pandas as pd
+import logging
+logger = logging.getLogger(__name__)
+
+# The data set, loaded once by every worker process, its result cache and
+# the moving averages shared by the sweep
+_worker_data = None
+_worker_cache = None
+_worker_smas = None
+_worker_smas_block = None
+# Digest of the data set, by the number of rows backtested on
+_worker_digests = {}
+
+# Fewest rows of history the first rung of successive halving runs on
+MIN_HALVING_ROWS = 1000
+
+
+def parse_grid(param_grid: str) -> List[str]:
+    """
+    Expand a parameter grid into the list of strategy parameters it covers.
+
+    The grid is a comma-separated list like the strategy parameters, where
+    each field is either a single value, an inclusive integer range written
+    `start:stop` or `start:stop:step`, or a list of choices written `a|b|c`.
+    For example `5:200:5,10:400:10` covers every moving average with a fast
+    window of 5, 10, ..., 200 and a slow window of 10, 20, ..., 400.
+    """
+    fields = []
+    for field in param_grid.split(','):
+        if ':' in field:
+            start, stop, *step = (int(bound) for bound in field.split(':'))
+            fields.append([str(value) for value in range(start, stop + 1, *step)])
+        else:
+            fields.append(field.split('|'))
+    return [','.join(combination) for combination in product(*fields)]
+
+
+def halving_rungs(
+    candidates: int, rows: int, rate: int, min_rows: int = MIN_HALVING_ROWS
+) -> List[int]:
+    """
+    Plan the rungs of a successive halving search.
+
+    Each rung backtests the candidates left on `rate` times more history
+    than the one before, and keeps the best 1 in `rate` of them for the
+    next. There are as many rungs as it takes to get close to a single
+    candidate, as long as the first one still has `min_rows` rows of
+    history. Returns the number of rows of each rung, the last one being
+    all `rows` of the data set.
+    """
+    halvings = 0
+    while (
+        rate ** (halvings + 1) <= candidates
+        and rows // rate ** (halvings + 1) >= min_rows
+    ):
+        halvings += 1
+    return [rows // rate ** (halvings - rung) for rung in range(halvings + 1)]
+
+
+def _init_worker(
+    datasource, datasource_path: str, cache: ResultCache = None,
+    smas: dict = None
+):
+    """Load the data set once for all the combinations run by this worker."""
+    global _worker_data, _worker_cache, _worker_smas, _worker_smas_block
+    # Keep the logs of every single backtest out of the sweep output
+    logging.getLogger().setLevel(logging.WARNING)
+    _worker_data = datasource(datasource_path, None).data
+    _worker_cache = cache
+    _worker_digests.clear()
+    if smas is not None:
+        _worker_smas_block, _worker_smas = attach_smas(smas)
+
+
+def _evaluate(
+    strategy: strat,
+    exchange: exch,
+    strategy_params: str,
+    rows: int = None,
+    max_drawdown: float = None
+) -> dict:
+    """Backtest one combination of parameters on the worker's data set."""
+    data = _worker_data if rows is None else _worker_data.iloc[:rows]
+    digest = None
+    if _worker_cache is not None:
+        if rows not in _worker_digests:
+            _worker_digests[rows] = data_digest(data)
+        digest = _worker_digests[rows]
+    result = backtest_runner.evaluate(
+        strategy, exchange, data, strategy_params, _worker_cache, digest,
+        max_drawdown, _worker_smas
+    )
+    return {
+        'strategy_params': strategy_params,
+        'profit_loss': result['profit_loss'],
+        'num_purchases': result['num_purchases'],
+        'num_sales': result['num_sales'],
+        'rows': result['rows'],
+        'aborted': result['aborted'],
+    }
+
+
+def _rank(results: List[dict]) -> pd.DataFrame:
+    """Rank results by profit/loss, the aborted backtests last."""
+    return pd.DataFrame(results) \
+        .sort_values(['aborted', 'profit_loss'], ascending=[True, False], kind='stable') \
+        .reset_index(drop=True)
+
+
+class optimiser:
+    """
+    Optimise strategies.
+
+    This class allows sweeping strategy parameters in parallel.
+    """
+
+    def run(
+        strategy: strat,
+        exchange: exch,
+        datasource,
+        param_grid: str,
+        datasource_path: str,
+        workers: int = None,
+        cache: ResultCache = None,
+        halving_rate: int = None,
+        max_drawdown: float = None
+    ) -> pd.DataFrame:
+        """
+        Backtest every combination of `param_grid` and rank the results.
+
+        One worker process is started per core unless `workers` says
+        otherwise. Combinations found in `cache` are not backtested again,
+        and the others are added to it.
+
+        With a `halving_rate`, combinations are searched by successive
+        halving (see `halving_rungs`) rather than all backtested on the
+        whole history. With a `max_drawdown` (in the quote currency),
+        backtests are aborted as soon as their drawdown goes over it, and
+        rank below every backtest that was not.
+
+        Returns a data frame with one row per combination. Those that made
+        it to the last rung come first, then those dropped at each rung
+        before it; each is ranked by its profit/loss at the end of the
+        `rows` it was last backtested on.
+        """
+        combinations = parse_grid(param_grid)
+        workers = workers or os.cpu_count()
+        windows = set().union(*(
+            strategy.sma_windows(combination) for combination in combinations
+        ))
+        data = None
+        if halving_rate is not None or windows:
+            data = datasource(datasource_path, None).data
+        rungs = [None] if halving_rate is None \
+            else halving_rungs(len(combinations), len(data), halving_rate)
+        logger.info(
+            f"Optimising over {len(combinations)} combinations "
+            f"with {workers} workers."
+        )
+
+        # Every moving average of the sweep, computed once for all workers
+        smas_block, smas = share_smas(data, windows) if windows else (None, None)
+        dropped = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(datasource, datasource_path, cache, smas)
+            ) as executor:
+                candidates = combinations
+                for rung, rows in enumerate(rungs):
+                    if rows is not None:
+                        logger.info(
+                            f"Rung {rung + 1} of {len(rungs)}: backtesting "
+                            f"{len(candidates)} combinations on {rows} rows."
+                        )
+                    count = len(candidates)
+                    ranking = _rank(list(executor.map(
+                        _evaluate,
+                        [strategy] * count,
+                        [exchange] * count,
+                        candidates,
+                        [rows] * count,
+                        [max_drawdown] * count,
+                        chunksize=max(1, count // (workers * 4))
+                    )))
+                    if rung < len(rungs) - 1:
+                        kept = math.ceil(count / halving_rate)
+                        dropped.append(ranking.iloc[kept:])
+                        candidates = ranking['strategy_params'].iloc[:kept].tolist()
+        finally:
+            if smas_block is not None:
+                smas_block.close()
+                smas_block.unlink()
+
+        # Combinations dropped later made it further, so rank them higher
+        ranking = pd.concat([ranking] + dropped[::-1], ignore_index=True)
+        logger.info("Optimisation complete, exiting cleanly.")
+        return ranking
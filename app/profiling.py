@@ -0,0 +1,191 @@
+"""
+Per-stage timing of the backtest pipeline.
+
+A `PipelineProfile` handed to `backtest_runner.run` swaps in queues that
+count what goes through them, and wraps the methods of the datasource, the
+strategy and the exchange with timers. Nothing is swapped or wrapped when
+no profile is given, so a normal run pays nothing for it.
+
+Date: 2026-10-18
+"""
+
+from functools import wraps
+from time import perf_counter
+from typing import Dict
+import cProfile
+import inspect
+import pstats
+import numpy
+import curio
+
+
+class ProfiledQueue(curio.Queue):
+    """
+    Curio queue keeping count of what goes through it.
+
+    Batches of ticks or transactions (NumPy arrays) count as many rows as
+    they hold, anything else as one.
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self.puts = 0
+        self.rows = 0
+        self.max_depth = 0
+        self.wait_time = 0.
+
+    async def put(self, item):
+        await super().put(item)
+        self.puts += 1
+        self.rows += len(item) if isinstance(item, numpy.ndarray) else 1
+        self.max_depth = max(self.max_depth, self.qsize())
+
+    async def get(self):
+        # Time the consumer spent idle, waiting for something to do
+        started = perf_counter()
+        item = await super().get()
+        self.wait_time += perf_counter() - started
+        return item
+
+
+class Stage:
+    """Number of calls to a stage and the time spent in them."""
+
+    __slots__ = ('calls', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.
+
+
+class PipelineProfile:
+    """
+    Counters and timers of the stages of a backtest.
+
+    Stages are named after the methods they time. Methods doing the same
+    job share a stage, e.g. `fill` times both the `buy` and the `sell` of
+    the exchange.
+    """
+
+    # Stage timing each method, by the object the method belongs to
+    DATASOURCE_STAGES = {'next_batch': 'next_batch'}
+    STRATEGY_STAGES = {
+        'process_batch': 'process_batch',
+        'process_tick': 'process_tick',
+        'process_vector': 'process_vector',
+    }
+    EXCHANGE_STAGES = {
+        'buy': 'fill',
+        'sell': 'fill',
+        'fill_batch': 'fill_batch',
+        'fill_vector': 'fill_vector',
+    }
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+        self.queues: Dict[str, ProfiledQueue] = {}
+        self.started = None
+        self.wall_time = 0.
+
+    def queue(self, name: str) -> ProfiledQueue:
+        """Create a queue whose traffic is reported under `name`."""
+        self.queues[name] = ProfiledQueue()
+        return self.queues[name]
+
+    def timed(self, name: str, function):
+        """Wrap `function`, coroutine function or not, to time its calls."""
+        stage = self.stages.setdefault(name, Stage())
+
+        if inspect.iscoroutinefunction(function):
+            async def timed(*args, **kwargs):
+                started = perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    stage.calls += 1
+                    stage.seconds += perf_counter() - started
+        else:
+            def timed(*args, **kwargs):
+                started = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    stage.calls += 1
+                    stage.seconds += perf_counter() - started
+        return wraps(function)(timed)
+
+    def instrument(self, datasource=None, strategy=None, exchange=None):
+        """
+        Time the stages of the pipeline objects, from now on.
+
+        The methods are only wrapped on these objects, not on their
+        classes. Overrides calling each other, like the default
+        `process_batch` calling `process_tick`, are each timed.
+        """
+        for owner, stages in [
+            (datasource, self.DATASOURCE_STAGES),
+            (strategy, self.STRATEGY_STAGES),
+            (exchange, self.EXCHANGE_STAGES),
+        ]:
+            if owner is None:
+                continue
+            for method, name in stages.items():
+                setattr(owner, method, self.timed(name, getattr(owner, method)))
+        self.start()
+
+    def start(self):
+        """Start the wall clock of the run, unless it is running already."""
+        if self.started is None:
+            self.started = perf_counter()
+
+    def finish(self):
+        """Stop the wall clock of the run."""
+        self.wall_time = perf_counter() - self.started
+
+    def summary(self) -> str:
+        """Format the counters as tables, for printing at the end of a run."""
+        lines = [
+            f"{'stage':<16}{'calls':>12}{'total s':>12}{'mean us':>12}"
+            f"{'% of run':>10}"
+        ]
+        for name, stage in self.stages.items():
+            if not stage.calls:
+                continue
+            share = stage.seconds / self.wall_time if self.wall_time else 0.
+            lines.append(
+                f"{name:<16}{stage.calls:>12,}{stage.seconds:>12.3f}"
+                f"{stage.seconds / stage.calls * 1e6:>12.1f}{share:>10.1%}"
+            )
+        if self.queues:
+            lines.append('')
+            lines.append(
+                f"{'queue':<16}{'puts':>12}{'rows':>12}{'max depth':>12}"
+                f"{'wait s':>10}"
+            )
+            for name, queue in self.queues.items():
+                lines.append(
+                    f"{name:<16}{queue.puts:>12,}{queue.rows:>12,}"
+                    f"{queue.max_depth:>12,}{queue.wait_time:>10.3f}"
+                )
+        lines.append('')
+        lines.append(f"Run took {self.wall_time:.3f} s.")
+        ticks = self.queues.get('ticks')
+        if ticks is not None and self.wall_time:
+            lines.append(
+                f"{ticks.rows:,} ticks emitted, "
+                f"{ticks.rows / self.wall_time:,.0f} ticks/s."
+            )
+        return '\n'.join(lines)
+
+
+def cprofiled(path: str, function, *args):
+    """
+    Call `function` under cProfile and save the statistics to `path`.
+
+    Returns the statistics, to be sorted and printed by the caller, e.g.
+    `stats.sort_stats('cumulative').print_stats(20)`.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(function, *args)
+    profiler.dump_stats(path)
+    return pstats.Stats(profiler)
@@ -0,0 +1,200 @@
+"""
+On-disk cache of backtest results.
+
+A result is keyed by a hash of the data it was run on, the code of the
+strategy and exchange classes and of the modules they rely on, and the
+strategy parameters, so running the same combination again reads the
+result back instead of backtesting it. Editing a strategy or an indicator
+changes its key, so results of older code are never returned. Results are
+kept as one JSON file each, and the least recently used ones are removed
+once the folder grows past its size cap.
+"""
+
+from contextlib import suppress
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Optional
+import importlib
+import inspect
+import json
+import os
+import tempfile
+import numpy
+import pandas as pd
+import logging
+logger = logging.getLogger(__name__)
+
+# Bump this when the content of the results changes, to ignore older ones
+CACHE_VERSION = 3
+
+# Modules the results depend on besides those of the strategy and exchange
+# classes, hashed into every key
+HELPER_MODULES = (
+    'backtest', 'common.common_classes', 'exchanges.order_book', 'indicators', 'metrics'
+)
+
+DEFAULT_FOLDER = 'data/result_cache'
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+
+def data_digest(data: pd.DataFrame) -> str:
+    """Hash the columns of a data set, names and types included."""
+    digest = sha256()
+    for column in data.columns:
+        values = data[column].to_numpy()
+        if values.dtype == object:
+            values = pd.util.hash_pandas_object(data[column], index=False).to_numpy()
+        digest.update(f'{column}:{values.dtype.str}:{len(values)};'.encode())
+        digest.update(numpy.ascontiguousarray(values))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_digest(cls: type) -> str:
+    """Hash the source of a class and of the classes it derives from."""
+    digest = sha256()
+    for klass in cls.__mro__:
+        if klass.__module__ in ('builtins', 'abc'):
+            continue
+        digest.update(f'{klass.__module__}.{klass.__qualname__};'.encode())
+        try:
+            digest.update(inspect.getsource(klass).encode())
+        except (OSError, TypeError):
+            # No source to read, e.g. in a frozen application
+            pass
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def helpers_digest(modules: tuple = HELPER_MODULES) -> str:
+    """Hash the source of the helper modules."""
+    digest = sha256()
+    for name in modules:
+        digest.update(f'{name};'.encode())
+        try:
+            digest.update(inspect.getsource(importlib.import_module(name)).encode())
+        except (OSError, TypeError):
+            # No source to read, e.g. in a frozen application
+            pass
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Folder of backtest results, capped in size.
+
+    The cap is enforced by each process on its own view of the folder, so
+    workers sharing a folder may overshoot it a little between them.
+    """
+
+    def __init__(self, folder: str = DEFAULT_FOLDER, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self._size = None
+
+    def key(
+        self, digest: str, strategy, exchange, strategy_params: str, **options
+    ) -> str:
+        """
+        Return the key of a backtest.
+
+        `digest` is the `data_digest` of the data the backtest runs on,
+        worked out once by the caller for all the backtests on that data.
+        `options` are any other settings the result depends on.
+        """
+        return sha256(json.dumps([
+            CACHE_VERSION, digest, code_digest(strategy), code_digest(exchange),
+            helpers_digest(), strategy_params, options
+        ], sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Return the file the result stored under `key` is kept in."""
+        return self.folder / f'{key}.json'
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the result stored under `key`, if there is one."""
+        path = self._path(key)
+        try:
+            with open(path) as file:
+                result = json.load(file)
+        except (OSError, ValueError):
+            return None
+        # Mark it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        result['trades'] = [tuple(trade) for trade in result['trades']]
+        return result
+
+    def put(self, key: str, result: Dict):
+        """
+        Store a result under `key`, then enforce the size cap.
+
+        A result that cannot be written, such as on a full disk, is left
+        out of the cache with a warning.
+        """
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            # Write it aside and swap it in, so a half-written result is
+            # never picked up by a concurrent read.
+            descriptor, staging = tempfile.mkstemp(suffix='.partial', dir=self.folder)
+            try:
+                with os.fdopen(descriptor, 'w') as file:
+                    json.dump(result, file, default=lambda value: value.item())
+                os.replace(staging, self._path(key))
+            except BaseException:
+                with suppress(OSError):
+                    os.unlink(staging)
+                raise
+        except OSError as error:
+            logger.warning(f"Could not cache a result in {self.folder}: {error}")
+            return
+
+        if self._size is None:
+            self._size = sum(entry.st_size for entry in self._entries().values())
+        else:
+            self._size += os.path.getsize(self._path(key))
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self) -> Dict[Path, os.stat_result]:
+        """Return the status of every stored result."""
+        entries = {}
+        for path in self.folder.glob('*.json'):
+            try:
+                entries[path] = path.stat()
+            except OSError:
+                # Removed by another process in the meantime
+                pass
+        return entries
+
+    def _evict(self):
+        """Remove the least recently used results until under the cap."""
+        entries = self._entries()
+        self._size = sum(entry.st_size for entry in entries.values())
+        by_use = sorted(entries, key=lambda path: entries[path].st_mtime_ns)
+        # Leave some room, rather than evicting again on the next put
+        target = self.max_bytes * 0.9
+        for path in by_use:
+            if self._size <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._size -= entries[path].st_size
+        logger.debug(f"Evicted results down to {self._size} bytes in {self.folder}")
+
+    def clear(self) -> int:
+        """Remove every stored result, and return how many there were."""
+        removed = 0
+        for path in list(self.folder.glob('*.json')) + list(self.folder.glob('*.partial')):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += path.suffix == '.json'
+        self._size = 0
+        return removed
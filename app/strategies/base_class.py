@@ -4,8 +4,10 @@ Author: Petter Ooms.
 TODO: Add description.
 """
 
-from common.common_classes import transaction as t
+from common.common_classes import BUY, transaction as t, transaction_batch
+from indicators import SMATable, sma_matrix
 from abc import ABCMeta, abstractmethod
+from typing import List, Sequence, Tuple
 
 import curio
 import logging
@@ -18,6 +20,18 @@ class StrategyBaseClass(metaclass=ABCMeta):
     transaction_queue: curio.Queue = []
     ticker_queue: curio.Queue = []
 
+    # Moving averages precomputed for a whole parameter sweep, if any
+    indicators: SMATable = None
+
+    # The column of the ticks the strategy trades on, and is marked at
+    price_open_close = 'close'
+
+    # The prices of the batch going through `process_tick`, the tick it
+    # is at and the first one not yet marked or traded on
+    _prices = None
+    _tick = 0
+    _marked = 0
+
     def __init__(self, transaction_queue: curio.Queue, ticker_queue: curio.Queue):
         """TODO: Add description."""
         self.transaction_queue = transaction_queue
@@ -26,12 +40,38 @@ class StrategyBaseClass(metaclass=ABCMeta):
 
     async def buy(self, amount: float, value: float):
         """TODO: Add description."""
+        await self._mark_ticks()
         await self.transaction_queue.put(t.buyTransactionFactory(amount, value))
 
     async def sell(self, amount: float, value):
         """TODO: Add description."""
+        await self._mark_ticks()
         await self.transaction_queue.put(t.sellTransactionFactory(amount, value))
 
+    async def _mark_ticks(self):
+        """
+        Ask the exchange to mark the ticks before the current one.
+
+        Those of them not marked or traded on yet, as a batch of
+        transactions for nothing at their price. The current tick counts
+        as marked from then on, by the transaction it requests.
+        """
+        if self._prices is not None and self._marked < self._tick:
+            await self.transaction_queue.put(
+                transaction_batch(BUY, 0., self._prices[self._marked:self._tick])
+            )
+        self._marked = self._tick + 1
+
+    async def submit(self, batch):
+        """
+        Request a whole batch of transactions from the exchange at once.
+
+        `batch` is made by `transaction_batch`. It goes through the queue
+        as one item, and the exchange acknowledges it as one.
+        """
+        if len(batch):
+            await self.transaction_queue.put(batch)
+
     @abstractmethod
     async def process_tick(self, data):
         """Process the logic of a strategy tick by tick."""
@@ -39,9 +79,66 @@ class StrategyBaseClass(metaclass=ABCMeta):
             "If you are reading this you did not override the process_tick function properly."
         )
 
+    async def process_batch(self, batch):
+        """
+        Process the logic of a strategy on a batch of ticks.
+
+        Datasources deliver ticks in batches (NumPy record arrays). By
+        default each tick of the batch goes through `process_tick`;
+        strategies that can do better with the whole batch override this.
+        Either way the exchange must get a transaction for every tick, in
+        order, those for nothing marking the account at the tick's price,
+        like the vectorised engine marks every row.
+        """
+        self._prices, self._marked = batch[self.price_open_close], 0
+        for self._tick, tick in enumerate(batch):
+            await self.process_tick(tick)
+        self._tick = len(batch)
+        await self._mark_ticks()
+        self._prices = None
+
+    def process_vector(self, data):
+        """
+        Process the logic of a strategy over the whole data set at once.
+
+        Used by the vectorised backtest engine. Strategies that support it
+        return a tuple of two arrays, each with one entry per row of `data`:
+        the signed quantity to trade on that row (positive to buy, negative
+        to sell, zero to do nothing) and the price the trade is requested at.
+        The trades must be the same as the ones `process_tick` would request
+        when fed the same rows one by one.
+        """
+        raise NotImplementedError(
+            f"The {type(self).__name__} strategy has no vectorised implementation."
+        )
+
+    @classmethod
+    def sma_windows(cls, strategy_params: str) -> List[Tuple[str, int]]:
+        """
+        List the simple moving averages `process_vector` reads.
+
+        As (column, window) pairs, for the given strategy parameters. A
+        parameter sweep computes these once for every combination and
+        hands them to the strategy as its `indicators`.
+        """
+        return []
+
+    def moving_averages(self, data, column: str, windows: Sequence[int]):
+        """
+        Return the simple moving averages of a column over some windows.
+
+        Read from `indicators` when they were precomputed, and computed
+        from a single cumulative sum of the column otherwise.
+        """
+        if self.indicators is not None:
+            averages = self.indicators.get(column, windows, len(data))
+            if averages is not None:
+                return averages
+        return list(sma_matrix(data[column], windows))
+
     async def run(self):
         """TODO: Add description."""
         while True:
-            item = await self.ticker_queue.get()
-            await self.process_tick(item)
+            batch = await self.ticker_queue.get()
+            await self.process_batch(batch)
             await self.ticker_queue.task_done()
@@ -5,6 +5,9 @@ Author: Peter Ooms.
 """
 
 from .base_class import StrategyBaseClass as strategy
+from common.common_classes import BUY, transaction_batch
+
+import numpy
 
 import logging
 logger = logging.getLogger(__name__)
@@ -17,7 +20,7 @@ class DCA(strategy):
     dollar_amount = 0
     count = 0
 
-    async def configure(self, params: str):
+    def configure(self, params: str):
         ParamsList = params.split(',')
         self.interval = int(ParamsList[0])
         self.dollar_amount = int(ParamsList[1])
@@ -33,3 +36,18 @@ class DCA(strategy):
             await super().buy(buy_qty, tick['close'])
         self.count += 1
         return None
+
+    async def process_batch(self, batch):
+        prices = batch['close']
+        ticks = numpy.arange(self.count, self.count + len(batch))
+        # The ticks without a purchase go along for nothing, as marks
+        quantities = numpy.where(ticks % self.interval == 0, self.dollar_amount / prices, 0.)
+        await self.submit(transaction_batch(BUY, quantities, prices))
+        self.count += len(batch)
+        return None
+
+    def process_vector(self, data):
+        prices = numpy.asarray(data['close'], dtype=float)
+        quantities = numpy.zeros(len(prices))
+        quantities[::self.interval] = self.dollar_amount / prices[::self.interval]
+        return quantities, prices
@@ -6,14 +6,17 @@ Author: Peter Ooms.
 
 # import curio
 # import pandas as pd
-from typing import List, Union
+from typing import Union
 import numpy
 # import matplotlib.pyplot as plt
 
 from .base_class import StrategyBaseClass as strategy
+from .rolling_window import RollingWindow
 # from common.common_classes import transaction as t
+from log_pipeline import tick_logger
 import logging
 logger = logging.getLogger(__name__)
+tick_log = tick_logger(__name__)
 
 
 class moving_average(strategy):
@@ -22,7 +25,8 @@ class moving_average(strategy):
     currently_holding = False
     ma_fast_window = 0
     ma_slow_window = 0
-    moving_average_window: List = list()
+    ma_fast: RollingWindow = None
+    ma_slow: RollingWindow = None
     price_open_close: Union[str, bool] = 'close'
 
     async def buy(self, amount: float, value: float):
@@ -33,36 +37,66 @@ class moving_average(strategy):
         await super().sell(amount, value)
         self.currently_holding = False
 
-    async def configure(self, params: str):
+    def configure(self, params: str):
         ParamsList = params.split(',')
-        self.ma_fast_window = int(ParamsList[0])
         self.ma_slow_window = int(ParamsList[1])
+        # The fast average is taken over at most the slow window, so a fast
+        # window as long as the slow one or longer never trades
+        self.ma_fast_window = min(int(ParamsList[0]), self.ma_slow_window)
         if len(ParamsList) > 2:
             self.price_open_close = bool(ParamsList[2])
+        # One pair of windows per instance, filled as the ticks come in
+        self.ma_fast = RollingWindow(self.ma_fast_window)
+        self.ma_slow = RollingWindow(self.ma_slow_window)
         logger.info(f"Parameters are: ma_fast = {self.ma_fast_window} "
                     f"ma_slow = {self.ma_slow_window} open = {self.price_open_close}")
 
     async def process_tick(self, tick):
-        self.moving_average_window.append(tick[self.price_open_close])
+        price = float(tick[self.price_open_close])
+        self.ma_fast.append(price)
+        self.ma_slow.append(price)
 
-        while len(self.moving_average_window) > self.ma_slow_window:
-            self.moving_average_window.pop(0)
-
-        if len(self.moving_average_window) == self.ma_slow_window:
-            ma_fast = numpy.mean(self.moving_average_window[(-1 * self.ma_fast_window):])
-            ma_slow = numpy.mean(self.moving_average_window)
+        if self.ma_slow.full():
+            ma_fast = self.ma_fast.mean()
+            ma_slow = self.ma_slow.mean()
 
             if ma_fast > ma_slow:
                 if not self.currently_holding:
-                    logger.info(f"Asking the exchange to buy 1 security because ma_fast "
-                                f"({ma_fast}) is bigger than ma_slow ({ma_slow})")
+                    tick_log.info("Asking the exchange to buy 1 security because ma_fast "
+                                  "(%s) is bigger than ma_slow (%s)", ma_fast, ma_slow)
                     await self.buy(1, tick[self.price_open_close])
 
             else:
                 if self.currently_holding:
-                    logger.info(f"Asking the exchange to sell 1 security because ma_fast "
-                                f"({ma_fast}) is no longer bigger than ma_slow ({ma_slow}) "
-                                "and I have a position open")
+                    tick_log.info("Asking the exchange to sell 1 security because ma_fast "
+                                  "(%s) is no longer bigger than ma_slow (%s) "
+                                  "and I have a position open", ma_fast, ma_slow)
                     await self.sell(1, tick[self.price_open_close])
 
         return None
+
+    @classmethod
+    def sma_windows(cls, strategy_params: str):
+        fast, slow, *other = strategy_params.split(',')
+        if other:
+            return []
+        return [
+            (cls.price_open_close, min(int(fast), int(slow))),
+            (cls.price_open_close, int(slow))
+        ]
+
+    def process_vector(self, data):
+        prices = numpy.asarray(data[self.price_open_close], dtype=float)
+        holding = numpy.zeros(len(prices), dtype=bool)
+
+        if len(prices) >= self.ma_slow_window:
+            ma_fast, ma_slow = self.moving_averages(
+                data, self.price_open_close,
+                [self.ma_fast_window, self.ma_slow_window]
+            )
+            full = self.ma_slow_window - 1
+            holding[full:] = ma_fast[full:] > ma_slow[full:]
+
+        # Buy 1 security when we start holding, sell it when we stop
+        quantities = numpy.diff(holding.astype(float), prepend=0.)
+        return quantities, prices
@@ -0,0 +1,51 @@
+"""
+Fixed-size rolling window over a stream of values.
+"""
+
+
+class RollingWindow:
+    """
+    Rolling mean of the last `size` values appended to it.
+
+    Like `indicators.sma_matrix`, the window keeps the running total of
+    every value appended so far, and the mean of the window is the
+    difference between that total and the total before the oldest value
+    of the window, over the size. Appending a value and reading the mean
+    both cost O(1) whatever the window size, and the means are the same,
+    to the last bit, as the ones the vectorised engine reads.
+    """
+
+    def __init__(self, size: int):
+        """Create an empty window holding up to `size` values."""
+        if size < 1:
+            raise ValueError(f"A rolling window needs a size of at least 1, got {size}.")
+        self.size = size
+        # The running total before each value of the window, as a ring
+        self.totals = [0.0] * size
+        self.position = 0
+        self.count = 0
+        self.total = 0.0
+
+    def __len__(self):
+        """Return the number of values currently in the window."""
+        return self.count
+
+    def append(self, value: float):
+        """Add a value to the window, dropping the oldest one if it is full."""
+        self.totals[self.position] = self.total
+        self.total += value
+        self.position += 1
+        if self.position == self.size:
+            self.position = 0
+        if self.count < self.size:
+            self.count += 1
+
+    def full(self) -> bool:
+        """Return true once the window holds `size` values."""
+        return self.count == self.size
+
+    def mean(self) -> float:
+        """Return the mean of the values in the window."""
+        # Until the window is full, the oldest value is the first one
+        oldest = self.position if self.count == self.size else 0
+        return (self.total - self.totals[oldest]) / self.count
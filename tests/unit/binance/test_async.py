@@ -0,0 +1,72 @@
+"""
+Test the awaitable Binance APIs.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+import time
+
+# Import third-party modules
+import curio
+from pytest import raises
+
+# Import local modules
+from binance import Binance  # type: ignore
+from binance.api_calls import asynchronous  # type: ignore
+from binance.api_calls.asynchronous import run  # type: ignore
+
+
+def test_async_methods_match_sync_ones(stand_in_binance):
+    """The awaitable APIs expose the same methods, with the same results."""
+    binance = Binance(url=stand_in_binance.url)
+
+    klines = run(binance.async_public.klines, 'btcusdt', '1m', None, None, 5)
+
+    assert klines == binance.public.klines('btcusdt', '1m', limit=5)
+    assert binance.async_public.klines.__doc__ == binance.public.klines.__doc__
+    assert hasattr(binance.async_trade, 'openOrders')
+
+
+def test_async_calls_run_concurrently(stand_in_binance):
+    """Many calls are in flight at once, without blocking the event loop."""
+    stand_in_binance.delay = 0.2
+    binance = Binance(url=stand_in_binance.url)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await curio.sleep(0.01)
+
+    async def poll():
+        ticking = await curio.spawn(ticker)
+        async with curio.TaskGroup() as group:
+            for symbol in ['btcusdt', 'ethusdt', 'bnbusdt'] * 4:
+                await group.spawn(binance.async_public.klines, symbol, '1m')
+        await ticking.cancel()
+        return group.results
+
+    started = time.monotonic()
+    results = run(poll)
+
+    assert len(results) == 12
+    assert time.monotonic() - started < 12 * 0.2 / 2
+    assert len(ticks) > 10
+
+
+def test_run_shuts_its_thread_pool_down(stand_in_binance):
+    """The calls made inside `run` go to a pool that is shut down with it."""
+    binance = Binance(url=stand_in_binance.url)
+
+    async def poll():
+        async with curio.TaskGroup() as group:
+            for symbol in ['btcusdt', 'ethusdt', 'bnbusdt']:
+                await group.spawn(binance.async_public.klines, symbol, '1m')
+        return asynchronous._executor.get()
+
+    executor = run(poll)
+    assert executor is not None
+    assert asynchronous._executor.get() is None
+    with raises(RuntimeError):
+        executor.submit(time.monotonic)
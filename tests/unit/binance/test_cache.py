@@ -0,0 +1,75 @@
+"""
+Test the response cache of the Binance client.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+import time
+
+# Import third-party modules
+import curio
+
+# Import local modules
+from binance import Binance  # type: ignore
+from binance.api_calls.asynchronous import run  # type: ignore
+from binance.helpers.cache import ResponseCache  # type: ignore
+
+
+def test_responses_are_cached(stand_in_binance):
+    """Cached endpoints are only requested again once their TTL is over."""
+    binance = Binance(
+        url=stand_in_binance.url, cache=ResponseCache({'exchangeInfo': 0.2})
+    )
+
+    first = binance.public.exchangeInfo('btcusdt')
+    assert binance.public.exchangeInfo('btcusdt') == first
+    binance.public.exchangeInfo('ethusdt')
+    binance.public.klines('btcusdt', '1m', limit=5)
+    binance.public.klines('btcusdt', '1m', limit=5)
+    assert [call[0] for call in stand_in_binance.calls] == [
+        'exchangeInfo', 'exchangeInfo', 'klines', 'klines'
+    ]
+
+    time.sleep(0.2)
+    binance.public.exchangeInfo('btcusdt')
+    assert len(stand_in_binance.calls) == 5
+
+
+def test_cache_is_opt_in(stand_in_binance):
+    """Without a cache, every call is sent."""
+    binance = Binance(url=stand_in_binance.url)
+
+    binance.public.exchangeInfo('btcusdt')
+    binance.public.exchangeInfo('btcusdt')
+
+    assert len(stand_in_binance.calls) == 2
+
+
+def test_concurrent_requests_share_one_flight(stand_in_binance):
+    """Fifty tasks asking for the same thing at once send one request."""
+    stand_in_binance.delay = 0.2
+    binance = Binance(url=stand_in_binance.url, cache=True)
+
+    async def ask():
+        async with curio.TaskGroup() as group:
+            for _ in range(50):
+                await group.spawn(binance.async_public.exchangeInfo, 'btcusdt')
+        return group.results
+
+    results = run(ask)
+
+    assert len(results) == 50
+    assert all(result == results[0] for result in results)
+    assert len(stand_in_binance.calls) == 1
+
+
+def test_least_recently_used_are_evicted():
+    """Once full, the cache drops the response used least recently."""
+    cache = ResponseCache(max_size=2)
+
+    for key in 'abc':
+        cache.fetch('exchangeInfo', key, lambda: key)
+        cache.fetch('exchangeInfo', 'a', lambda: 'a')
+
+    assert list(cache.responses) == [('exchangeInfo', 'c'), ('exchangeInfo', 'a')]
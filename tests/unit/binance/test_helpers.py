@@ -27,3 +27,86 @@ def test_to_timestamp():
     ) * 1000
 
     assert timestamp == test_timestamp
+
+
+def test_to_timestamp_detects_formats():
+    """
+    Test format detection of the `to_timestamp` helper function.
+
+    The format of each shape of string is only looked for once.
+    """
+    # Import standard modules
+    from datetime import date, datetime
+
+    # Import local modules
+    from binance.helpers import timestamps, to_timestamp
+
+    expected = datetime.timestamp(datetime(2021, 4, 13, 13)) * 1000
+
+    assert to_timestamp('13/04/2021 13:00') == expected
+    assert to_timestamp('2021-04-13 01-PM') == expected
+    assert to_timestamp('2021-04-13T13:00:00') == expected
+    assert to_timestamp(date(2021, 4, 13)) == to_timestamp('2021-04-13')
+    assert timestamps._formats['dd/dd/dddd dd:dd'] == '%d/%m/%Y %H:%M'
+
+
+def test_to_timestamps():
+    """
+    Test `to_timestamps` helper function.
+
+    Whole columns of dates, in mixed formats, are converted at once to the
+    same timestamps as `to_timestamp` would.
+    """
+    # Import standard modules
+    from pathlib import Path
+
+    # Import third-party modules
+    import pandas as pd
+    import pytest
+
+    # Import local modules
+    from binance.helpers import to_timestamp, to_timestamps
+
+    path = Path(__file__).resolve().parents[3] / 'data' / 'Binance_BTCUSDT_1h.csv'
+    dates = pd.read_csv(path, usecols=['date'])['date']
+    dates = list(dates[::50]) + [
+        '2021-04-13T01:02:03.5+0200', '1/4/2021 07:05', '2021-04-13'
+    ]
+
+    assert list(to_timestamps(dates)) == [to_timestamp(date) for date in dates]
+    assert len(to_timestamps([])) == 0
+    with pytest.raises(ValueError):
+        to_timestamps(['31/02/2021 00:00'])
+
+
+def test_to_timestamps_across_clock_changes(monkeypatch):
+    """
+    Test `to_timestamps` around daylight saving time changes.
+
+    Local times skipped or repeated by a clock change are converted like
+    `to_timestamp` converts them.
+    """
+    # Import standard modules
+    import time
+
+    # Import third-party modules
+    import pytest
+
+    # Import local modules
+    from binance.helpers import to_timestamp, to_timestamps
+
+    if not hasattr(time, 'tzset'):
+        pytest.skip('The time zone can only be changed on Unix')
+
+    dates = [
+        '27/03/2021 23:00', '28/03/2021 01:00', '28/03/2021 01:30',
+        '28/03/2021 02:00', '31/10/2021 01:30', '31/10/2021 02:00'
+    ]
+    monkeypatch.setenv('TZ', 'Europe/London')
+    time.tzset()
+    try:
+        assert list(to_timestamps(dates)) == [to_timestamp(date) for date in dates]
+        assert to_timestamps(['28/03/2021 01:00'])[0] == 1616893200000
+    finally:
+        monkeypatch.undo()
+        time.tzset()
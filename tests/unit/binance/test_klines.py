@@ -0,0 +1,44 @@
+"""
+Test the NumPy kline arrays of the Binance client.
+
+Date: 2026-10-18
+"""
+
+# Import third-party modules
+import numpy
+
+# Import local modules
+from binance import Binance  # type: ignore
+from binance.helpers.klines import (  # type: ignore
+    KLINE_DTYPE, concat_klines, klines_to_array
+)
+from tests.unit.stand_in_binance import FIRST_KLINE, KLINE_MS
+
+
+def test_klines_as_array(stand_in_binance):
+    """Klines are parsed to typed columns holding the same values."""
+    binance = Binance(url=stand_in_binance.url)
+
+    klines = binance.public.klines('btcusdt', '1m', limit=20)
+    array = binance.public.klines('btcusdt', '1m', limit=20, as_array=True)
+
+    assert array.dtype == KLINE_DTYPE
+    assert array['open_time'].tolist() == [kline[0] for kline in klines]
+    assert array['close'].tolist() == [float(kline[4]) for kline in klines]
+    assert array['trades'].tolist() == [kline[8] for kline in klines]
+
+
+def test_concat_drops_overlaps(stand_in_binance):
+    """Overlapping and empty pages are joined into one sorted array."""
+    binance = Binance(url=stand_in_binance.url)
+    pages = [
+        binance.public.klines('btcusdt', '1m', start, limit=10, as_array=True)
+        for start in (FIRST_KLINE, FIRST_KLINE + 5 * KLINE_MS)
+    ]
+
+    klines = concat_klines([pages[0], klines_to_array([]), pages[1]])
+
+    assert numpy.array_equal(
+        klines['open_time'], FIRST_KLINE + KLINE_MS * numpy.arange(15)
+    )
+    assert len(concat_klines([])) == 0
@@ -0,0 +1,53 @@
+"""
+Test the request weight rate limiting of the Binance client.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+import time
+
+# Import local modules
+from binance import Binance  # type: ignore
+from binance.helpers.rate_limit import (  # type: ignore
+    WeightLimiter, limiter, request_weight
+)
+
+
+def test_request_weight():
+    """Calls weigh what the Binance documentation says."""
+    assert request_weight('get', 'klines', {'symbol': 'BTCUSDT'}) == 1
+    assert request_weight('get', 'exchangeInfo', {}) == 10
+    assert request_weight('get', 'depth', {'limit': 5000}) == 50
+    assert request_weight('get', 'ticker/24hr', {'symbol': 'BTCUSDT'}) == 1
+    assert request_weight('get', 'ticker/24hr', {'symbol': None}) == 40
+    assert request_weight('delete', 'openOrders', {'symbol': 'BTCUSDT'}) == 1
+
+
+def test_limiter_waits_for_weight():
+    """Once the bucket is empty, calls wait for the weight to come back."""
+    weight_limiter = WeightLimiter(600)
+
+    started = time.monotonic()
+    weight_limiter.acquire(600)
+    assert time.monotonic() - started < 0.1
+
+    # 600 per minute comes back at 10 per second
+    weight_limiter.acquire(5)
+    assert 0.4 < time.monotonic() - started < 1
+
+
+def test_calls_are_charged_and_corrected(stand_in_binance):
+    """Every call is charged, and the server has the last word."""
+    binance = Binance(url=stand_in_binance.url)
+    shared = limiter(stand_in_binance.url)
+
+    for _ in range(10):
+        binance.public.klines('btcusdt', '1m', limit=5)
+    assert shared is limiter(Binance(url=stand_in_binance.url)._url)
+    assert 1190 - 1 < shared.tokens < 1190 + 1
+
+    # Weight used by other processes is taken out of the budget too
+    stand_in_binance.used_weight = 1000
+    binance.public.serverTime()
+    assert shared.tokens < 1200 - 1000
@@ -0,0 +1,49 @@
+"""
+Test the pooled HTTP session of the Binance client.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+# Import local modules
+from binance import Binance  # type: ignore
+from binance.helpers import session  # type: ignore
+
+
+def test_calls_share_connections(stand_in_binance):
+    """Calls made through one client reuse the same open connection."""
+    binance = Binance(url=stand_in_binance.url)
+
+    for _ in range(5):
+        binance.public.serverTime()
+        binance.public.klines('btcusdt', '1m', limit=10)
+
+    assert len(stand_in_binance.calls) == 10
+    assert len(stand_in_binance.connections) == 1
+
+
+def test_session_is_shared(stand_in_binance):
+    """Market data and trade APIs share the client's session."""
+    binance = Binance('key', 'secret', url=stand_in_binance.url, timeout=3)
+
+    assert binance.public._session is binance.session
+    assert binance.trade._session is binance.session
+    assert binance.session.timeout == 3
+
+
+def test_threads_share_the_default_session(monkeypatch):
+    """Threads asking for the default session at once all get the same one."""
+    class SlowSession(session.Session):
+        def __init__(self):
+            sleep(0.05)
+            super().__init__()
+
+    monkeypatch.setattr(session, '_default_session', None)
+    monkeypatch.setattr(session, 'Session', SlowSession)
+    with ThreadPoolExecutor(8) as executor:
+        sessions = list(executor.map(lambda _: session.default_session(), range(8)))
+
+    assert len({id(shared) for shared in sessions}) == 1
@@ -0,0 +1,75 @@
+"""
+Test the signing of account and trade requests.
+
+Date: 2026-10-18
+"""
+
+# Import standard modules
+import hmac
+import time
+from urllib.parse import parse_qsl
+
+# Import local modules
+from binance import Binance  # type: ignore
+from binance.helpers.sign_request import Signer  # type: ignore
+
+ORDER = {
+    'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT',
+    'timeInForce': 'GTC', 'quantity': 0.01, 'price': 30000.0,
+    'newClientOrderId': None
+}
+
+
+def test_signature():
+    """The query is signed with the secret, and empty values left out."""
+    query = Signer('secret').sign(ORDER)
+
+    unsigned, signature = query.rsplit('&signature=', 1)
+    assert signature == hmac.new(
+        b'secret', unsigned.encode('utf-8'), 'sha256'
+    ).hexdigest()
+    params = dict(parse_qsl(unsigned))
+    assert params['price'] == '30000.0'
+    assert params['recvWindow'] == '5000'
+    assert 'newClientOrderId' not in params
+
+
+def test_timestamps_follow_the_server_clock():
+    """Timestamps are shifted by the smoothed offset of the server clock."""
+    server_offset = 5000
+    signer = Signer('secret', lambda: time.time() * 1000 + server_offset)
+
+    assert abs(signer.timestamp() - time.time() * 1000 - 5000) < 50
+    assert signer._syncing.is_alive()
+
+    server_offset = 6000
+    signer.measure_offset()
+    assert abs(signer.offset - 5200) < 50
+    signer.stop()
+
+
+def test_signed_requests_use_server_time(stand_in_binance):
+    """Trade requests are timestamped with the server's time."""
+    binance = Binance('key', 'secret', url=stand_in_binance.url)
+
+    binance.trade.account()
+
+    endpoints = [call[0] for call in stand_in_binance.calls]
+    assert endpoints == ['time', 'account']
+    params = stand_in_binance.calls[-1][1]
+    assert abs(int(params['timestamp']) - stand_in_binance.server_time) < 1000
+
+
+def test_server_time_is_never_cached(stand_in_binance):
+    """The clock offset is measured on a fresh server time."""
+    with Binance(
+        'key', 'secret', url=stand_in_binance.url, cache=True
+    ) as binance:
+        binance.public.serverTime()
+        binance.trade.account()
+        signer = binance.trade._Trade__secret
+
+    endpoints = [call[0] for call in stand_in_binance.calls]
+    assert endpoints == ['time', 'time', 'account']
+    # Closing the client stops the clock sync
+    assert signer._stop.is_set()
@@ -0,0 +1,42 @@
+"""
+PyTest configuration for the application tests.
+
+The application modules import each other relative to the `app` folder
+(the way `app/main.py` is run), so that folder is put on the path here.
+"""
+
+# Import standard modules
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+# Import third-party modules
+from pytest import fixture
+
+# Import local modules
+from tests.unit.stand_in_binance import StandInBinanceHandler
+
+APP_DIR = Path(__file__).resolve().parents[2] / 'app'
+
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+
+@fixture
+def stand_in_binance():
+    """Run a local stand-in of the Binance API for the duration of a test."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInBinanceHandler)
+    server.calls = []
+    server.connections = set()
+    # Seconds the server takes to answer each request
+    server.delay = 0
+    # Request weight used this minute, as reported to the client
+    server.used_weight = 0
+    server.server_time = 1_600_000_000_000
+    server.url = f'http://127.0.0.1:{server.server_port}/api/v3'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
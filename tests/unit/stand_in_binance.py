@@ -0,0 +1,78 @@
+"""
+Local stand-in for the Binance API.
+
+Serves a few endpoints the way Binance does, so the Binance client and
+the tools built on it can be tested without a network connection.
+"""
+
+# Import standard modules
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qsl, urlsplit
+
+# First kline served by the stand-in server, and its interval (1 minute)
+FIRST_KLINE = 1_600_000_000_000 - 1_600_000_000_000 % 60_000
+KLINE_MS = 60_000
+
+
+def stand_in_kline(open_time: int) -> list:
+    """Build the kline opened at `open_time`, in the Binance API format."""
+    price = 100 + (open_time - FIRST_KLINE) // KLINE_MS % 50
+    return [
+        open_time, f'{price:.8f}', f'{price + 1:.8f}', f'{price - 1:.8f}',
+        f'{price + 0.5:.8f}', '10.00000000', open_time + KLINE_MS - 1,
+        f'{price * 10:.8f}', 7, '5.00000000', f'{price * 5:.8f}', '0'
+    ]
+
+
+class StandInBinanceHandler(BaseHTTPRequestHandler):
+    """Answer a few `Market Data Endpoint` calls like Binance would."""
+
+    # Keep connections open between requests, like Binance does
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # noqa: N802
+        """Serve `time`, `exchangeInfo`, `account` and 1 minute `klines`."""
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        endpoint = url.path.rsplit('/', 1)[-1]
+        self.server.calls.append((endpoint, params, dict(self.headers)))
+        self.server.connections.add(self.client_address)
+        self.server.used_weight += 1
+        time.sleep(self.server.delay)
+
+        if endpoint == 'time':
+            body = {'serverTime': self.server.server_time}
+        elif endpoint == 'exchangeInfo':
+            symbols = json.loads(params.get('symbols', '["BTCUSDT"]'))
+            body = {
+                'serverTime': self.server.server_time,
+                'symbols': [{'symbol': symbol} for symbol in symbols]
+            }
+        elif endpoint == 'account':
+            body = {'balances': []}
+        elif endpoint == 'klines':
+            limit = int(params.get('limit', 500))
+            start = max(int(params.get('startTime', FIRST_KLINE)), FIRST_KLINE)
+            start += -start % KLINE_MS
+            end = int(params.get('endTime', start + limit * KLINE_MS))
+            body = [
+                stand_in_kline(open_time)
+                for open_time in range(start, end + 1, KLINE_MS)
+            ][:limit]
+        else:
+            self.send_error(404)
+            return
+
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-MBX-USED-WEIGHT-1M', str(self.server.used_weight))
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        """Keep the request log out of the test output."""
+        pass
@@ -0,0 +1,142 @@
+"""Test cases for the event loop and vectorised backtest engines."""
+
+# Import standard modules
+from pathlib import Path
+
+# Import third-party modules
+import curio
+import numpy
+from pytest import approx, mark
+
+# Import local modules
+from backtest import backtest_runner, rows_within_drawdown
+from datasources.binance_csv import BinanceCSV
+from exchanges.fake_exchange import FakeExchange
+from exchanges.matching_exchange import MatchingExchange
+from profiling import PipelineProfile
+from strategies.dca import DCA
+from strategies.moving_average import moving_average
+
+DATA_PATH = str(
+    Path(__file__).resolve().parents[2] / 'data' / 'Binance_BTCUSDT_1h.csv'
+)
+
+
+@mark.parametrize(
+    'strategy, strategy_params',
+    [
+        (moving_average, '10,50'), (moving_average, '1,2'), (moving_average, '2,3'),
+        (moving_average, '5,20'), (moving_average, '2,1'), (moving_average, '50,10'),
+        (DCA, '10,24')
+    ]
+)
+def test_engines_produce_the_same_trades(strategy, strategy_params):
+    """Both engines fill the same trades on the Binance BTCUSDT data."""
+    event = curio.run(
+        backtest_runner.run, strategy, FakeExchange, BinanceCSV,
+        strategy_params, DATA_PATH, 5000
+    )
+    vector = backtest_runner.run_vector(
+        strategy, FakeExchange, BinanceCSV, strategy_params, DATA_PATH
+    )
+
+    assert event.trades == vector.trades
+    assert event.currency_held == approx(vector.currency_held)
+    assert event.current_balance == approx(vector.current_balance)
+
+
+@mark.parametrize(
+    'strategy, strategy_params',
+    [(moving_average, '10,50'), (DCA, '10,24')]
+)
+def test_engines_produce_the_same_metrics(strategy, strategy_params):
+    """Both engines mark the account on every row, at the same prices."""
+    event = curio.run(
+        backtest_runner.run, strategy, FakeExchange, BinanceCSV,
+        strategy_params, DATA_PATH, 777
+    )
+    vector = backtest_runner.run_vector(
+        strategy, FakeExchange, BinanceCSV, strategy_params, DATA_PATH
+    )
+
+    assert event.metrics.marks == len(BinanceCSV(DATA_PATH, None).data)
+    for name, value in vector.metrics.summary().items():
+        assert event.metrics.summary()[name] == approx(value), name
+    numpy.testing.assert_allclose(event.metrics.equity_curve(), vector.metrics.equity_curve())
+
+
+@mark.parametrize('strategy', [moving_average, DCA])
+def test_batch_size_does_not_change_trades(strategy):
+    """Batched and per-tick delivery fill the same trades."""
+    single, batched = (
+        curio.run(
+            backtest_runner.run, strategy, FakeExchange, BinanceCSV, '10,24',
+            DATA_PATH, batch_size
+        )
+        for batch_size in (1, 777)
+    )
+
+    assert len(single.trades) > 0
+    assert single.trades == batched.trades
+
+
+def test_profile_counts_every_stage():
+    """A profiled run counts the ticks and fills, and trades the same."""
+    profile = PipelineProfile()
+    profiled = curio.run(
+        backtest_runner.run, moving_average, FakeExchange, BinanceCSV,
+        '10,50', DATA_PATH, 1000, profile
+    )
+    plain = curio.run(
+        backtest_runner.run, moving_average, FakeExchange, BinanceCSV,
+        '10,50', DATA_PATH, 1000
+    )
+
+    ticks = len(BinanceCSV(DATA_PATH, None).data)
+    assert profiled.trades == plain.trades
+    assert profile.queues['ticks'].rows == ticks
+    assert profile.queues['ticks'].puts == profile.stages['next_batch'].calls
+    assert profile.stages['process_tick'].calls == ticks
+    assert profile.stages['fill'].calls == len(plain.trades)
+    assert profile.queues['transactions'].max_depth >= 1
+    assert 0 < profile.stages['process_batch'].seconds <= profile.wall_time
+    assert 'process_tick' in profile.summary()
+
+
+def test_run_many_matches_separate_runs():
+    """Strategies sharing a read of the data trade as if run on their own."""
+    runs = [
+        (moving_average, '10,50', FakeExchange),
+        (DCA, '10,24', FakeExchange),
+        (moving_average, '5,20', FakeExchange),
+    ]
+    together = curio.run(
+        backtest_runner.run_many, runs, BinanceCSV, DATA_PATH, 500
+    )
+
+    assert len(together) == len(runs)
+    for (strategy, strategy_params, exchange), shared in zip(runs, together):
+        alone = curio.run(
+            backtest_runner.run, strategy, exchange, BinanceCSV,
+            strategy_params, DATA_PATH, 500
+        )
+        assert len(shared.trades) > 0
+        assert shared.trades == alone.trades
+        assert shared.currency_held == approx(alone.currency_held)
+
+
+def test_drawdown_counts_the_fills_of_the_exchange():
+    """Slippage and fees of the exchange's fills count towards the drawdown."""
+    quantities = numpy.tile([10., -10.], 50)
+    prices = numpy.full(100, 100.)
+    fake = FakeExchange(None)
+    assert rows_within_drawdown(*fake.vector_fills(quantities, prices), prices, 1.) == 100
+
+    matching = MatchingExchange(None)
+    rows = rows_within_drawdown(*matching.vector_fills(quantities, prices), prices, 1.)
+    assert rows < 100
+    # The drawdown of the exchange's own metrics goes over on the same row
+    matching.fill_vector(quantities[:rows - 1], prices[:rows - 1])
+    assert matching.metrics.max_drawdown <= 1.
+    matching.fill_vector(quantities[rows - 1:rows], prices[rows - 1:rows])
+    assert matching.metrics.max_drawdown > 1.
@@ -0,0 +1,56 @@
+"""Test cases for the pipeline benchmark."""
+
+# Import local modules
+from benchmark import benchmark, compare, shortfalls, synthetic_ohlcv
+from datasources.binance_csv import BinanceCSV
+
+
+def test_benchmark_runs_cases_on_synthetic_data(tmp_path):
+    """Cases run on synthetic data, which reads back like a Binance export."""
+    data = synthetic_ohlcv(500)
+
+    assert len(data) == 500
+    assert (data['high'] >= data[['open', 'close']].max(axis=1)).all()
+    assert (data['low'] <= data[['open', 'close']].min(axis=1)).all()
+
+    report = benchmark.run(['binance_csv', 'backtest_dca'], [500], str(tmp_path))
+
+    assert list(BinanceCSV(str(tmp_path / 'synthetic_500.csv')).data['close']) \
+        == list(data['close'])
+    assert [(result['case'], result['rows']) for result in report['results']] == [
+        ('binance_csv', 500), ('backtest_dca', 500)
+    ]
+    for result in report['results']:
+        assert result['wall_time_s'] > 0
+        assert result['ticks_per_second'] == 500 / result['wall_time_s']
+        assert result['peak_rss_mb'] >= result['baseline_rss_mb'] > 0
+
+
+def test_compare_flags_regressions():
+    """Only cases slower than the baseline by more than the tolerance count."""
+    baseline = {'results': [
+        {'case': 'backtest_dca', 'rows': 10, 'ticks_per_second': 1000.},
+        {'case': 'binance_csv', 'rows': 10, 'ticks_per_second': 1000.},
+    ]}
+    report = {'results': [
+        {'case': 'backtest_dca', 'rows': 10, 'ticks_per_second': 950.},
+        {'case': 'binance_csv', 'rows': 10, 'ticks_per_second': 800.},
+        {'case': 'binance_csv', 'rows': 20, 'ticks_per_second': 1.},
+    ]}
+
+    assert compare(baseline, report, tolerance=0.1) == [
+        'binance_csv (10 rows): 800 ticks/s, down from 1,000 (-20%)'
+    ]
+
+
+def test_shortfalls_flag_cases_below_their_requirement():
+    """Cases with a required speed are checked against it, others are not."""
+    report = {'results': [
+        {'case': 'sign_requests', 'rows': 10, 'ticks_per_second': 9_000.},
+        {'case': 'sign_requests', 'rows': 20, 'ticks_per_second': 20_000.},
+        {'case': 'binance_csv', 'rows': 10, 'ticks_per_second': 1.},
+    ]}
+
+    assert shortfalls(report) == [
+        'sign_requests (10 rows): 9,000 ticks/s, 10,000 required'
+    ]
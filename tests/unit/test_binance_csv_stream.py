@@ -0,0 +1,51 @@
+"""Test cases for the streaming Binance CSV datasource."""
+
+# Import standard modules
+from pathlib import Path
+
+# Import third-party modules
+import numpy
+from pytest import mark
+
+# Import local modules
+from datasources.binance_csv import BinanceCSV
+from datasources.binance_csv_stream import BinanceCSVStream
+
+DATA_PATH = str(
+    Path(__file__).resolve().parents[2] / 'data' / 'Binance_BTCUSDT_1h_clean.csv'
+)
+
+
+def read_all(datasource) -> list:
+    """Drain a datasource, the way its run loop does."""
+    batches = []
+    while datasource.new_data_available():
+        batches.append(datasource.next_batch())
+    return batches
+
+
+@mark.parametrize('block_size', [64, 1 << 20])
+def test_stream_matches_loaded_file(monkeypatch, block_size):
+    """Streaming yields the same rows, oldest first, as loading the file."""
+    monkeypatch.setattr(BinanceCSVStream, 'BLOCK_SIZE', block_size)
+    expected = BinanceCSV(DATA_PATH).data
+
+    batches = read_all(BinanceCSVStream(DATA_PATH, batch_size=500))
+
+    assert [len(batch) for batch in batches] == [500] * 12 + [91]
+    rows = numpy.concatenate(batches)
+    assert list(rows['date']) == list(expected['date'])
+    numpy.testing.assert_array_equal(rows['close'], expected['close'])
+    numpy.testing.assert_array_equal(rows['tradecount'], expected['tradecount'])
+
+
+def test_stream_oldest_first_file(tmp_path, monkeypatch):
+    """Files already in time order are read forwards."""
+    lines = open(DATA_PATH).readlines()
+    path = tmp_path / 'oldest_first.csv'
+    path.write_text(lines[0] + ''.join(reversed(lines[1:])))
+    monkeypatch.setattr(BinanceCSVStream, 'REVERSE', False)
+
+    rows = numpy.concatenate(read_all(BinanceCSVStream(str(path), batch_size=1000)))
+
+    numpy.testing.assert_array_equal(rows['close'], BinanceCSV(DATA_PATH).data['close'])
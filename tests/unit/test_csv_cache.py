@@ -0,0 +1,93 @@
+"""Test cases for the columnar cache of Binance CSV files."""
+
+# Import standard modules
+import os
+import shutil
+from pathlib import Path
+
+# Import third-party modules
+import pandas as pd
+from pytest import fixture, mark
+
+# Import local modules
+from binance.helpers import to_timestamps  # type: ignore
+from datasources import csv_cache
+from datasources.binance_csv import BinanceCSV
+
+DATA_PATH = Path(__file__).resolve().parents[2] / 'data' / 'Binance_BTCUSDT_1h_clean.csv'
+
+
+@fixture
+def csv_path(tmp_path) -> str:
+    """Copy the test data where its cache can be written."""
+    path = tmp_path / DATA_PATH.name
+    shutil.copy(DATA_PATH, path)
+    return str(path)
+
+
+def test_cache_matches_csv(csv_path):
+    """The cached data is the parsed CSV, oldest row first, with typed columns."""
+    expected = pd.read_csv(csv_path).iloc[::-1].reset_index(drop=True)
+    expected['date'] = to_timestamps(expected['date'])
+    expected['symbol'] = expected['symbol'].astype('category')
+
+    first = csv_cache.load(csv_path)
+    second = csv_cache.load(csv_path)
+
+    assert csv_cache.cache_path(csv_path).is_dir()
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+    # Mapped from the cache, not copied into memory
+    for column in ('date', 'close'):
+        assert not second[column].to_numpy().flags.owndata
+
+
+def test_cache_skips_parsing(csv_path, monkeypatch):
+    """Once cached, the CSV file is not parsed again."""
+    BinanceCSV(csv_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('The CSV file was parsed again.')
+
+    monkeypatch.setattr(csv_cache.pd, 'read_csv', fail)
+    assert len(BinanceCSV(csv_path).data) == 6091
+
+
+def test_cache_is_rebuilt_when_source_changes(csv_path):
+    """A modified source file invalidates its cache."""
+    csv_cache.load(csv_path)
+
+    lines = open(csv_path).readlines()
+    with open(csv_path, 'w') as file:
+        file.writelines(lines[:11])
+    os.utime(csv_path, ns=(0, 0))
+
+    data = csv_cache.load(csv_path)
+    assert len(data) == 10
+    assert data['close'].iloc[-1] == float(lines[1].split(',')[5])
+
+
+def test_failed_writes_leave_nothing_behind(csv_path, monkeypatch):
+    """The cache being built is removed when it cannot be swapped in."""
+    def fail(source, destination):
+        raise OSError(39, 'Directory not empty')
+
+    monkeypatch.setattr(os, 'replace', fail)
+    data = csv_cache.load(csv_path)
+
+    assert len(data)
+    assert os.listdir(Path(csv_path).parent) == [Path(csv_path).name]
+
+
+@mark.parametrize('damage', ['delete', 'truncate'])
+def test_damaged_caches_are_rebuilt(csv_path, damage):
+    """A cache with a column file missing or cut short is parsed again."""
+    expected = csv_cache.load(csv_path)
+    column = csv_cache.cache_path(csv_path) / '5.npy'
+    if damage == 'delete':
+        column.unlink()
+    else:
+        column.write_bytes(column.read_bytes()[:1000])
+
+    pd.testing.assert_frame_equal(csv_cache.load(csv_path), expected)
+    pd.testing.assert_frame_equal(csv_cache.load(csv_path), expected)
@@ -0,0 +1,82 @@
+"""Test cases for the indicators shared by a parameter sweep."""
+
+# Import standard modules
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Import third-party modules
+import numpy
+import pandas as pd
+from pytest import approx
+
+# Import local modules
+from datasources.binance_csv import BinanceCSV
+from indicators import attach_smas, share_smas, sma_matrix
+from strategies.moving_average import moving_average
+
+DATA_PATH = str(
+    Path(__file__).resolve().parents[2] / 'data' / 'Binance_BTCUSDT_1h_clean.csv'
+)
+
+
+def test_sma_matrix_matches_rolling_means():
+    """Each row is the rolling mean over its window, NaN until it is full."""
+    prices = numpy.random.default_rng(0).normal(100, 5, 500)
+    matrix = sma_matrix(prices, [1, 7, 50, 600])
+
+    for row, window in enumerate([1, 7, 50, 600]):
+        expected = pd.Series(prices).rolling(window).mean().to_numpy()
+        assert numpy.isnan(matrix[row, :window - 1]).all()
+        assert matrix[row, window - 1:] == approx(expected[window - 1:])
+
+
+def _read_shared(description, column, window, length):
+    """Read averages from the shared table, in another process."""
+    block, table = attach_smas(description)
+    averages = table.get(column, [window], length)[0].copy()
+    # Nothing may read the table once its block is closed
+    del table
+    block.close()
+    return averages
+
+
+def test_workers_read_the_shared_averages():
+    """Averages computed once can be read from other processes."""
+    data = BinanceCSV(DATA_PATH).data
+    block, description = share_smas(data, [('close', 20), ('close', 5), ('open', 5)])
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            shared = executor.submit(_read_shared, description, 'close', 20, 100).result()
+    finally:
+        block.close()
+        block.unlink()
+
+    expected = sma_matrix(data['close'], [20])[0, :100]
+    numpy.testing.assert_array_equal(shared, expected)
+
+
+def test_precomputed_averages_give_the_same_orders():
+    """The strategy reads the shared averages without changing its orders."""
+    data = BinanceCSV(DATA_PATH).data
+    windows = moving_average.sma_windows('10,50')
+    assert windows == [('close', 10), ('close', 50)]
+
+    block, description = share_smas(data, windows)
+    try:
+        table_block, table = attach_smas(description)
+        strategies = [moving_average(None, None) for _ in range(2)]
+        for strategy in strategies:
+            strategy.configure('10,50')
+        strategies[1].indicators = table
+        # A prefix of the data, as a successive halving rung sees it
+        plain, shared = (
+            strategy.process_vector(data.iloc[:3000]) for strategy in strategies
+        )
+        del table, strategies
+        table_block.close()
+    finally:
+        block.close()
+        block.unlink()
+
+    assert plain[0].any()
+    numpy.testing.assert_array_equal(plain[0], shared[0])
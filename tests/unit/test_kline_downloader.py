@@ -0,0 +1,55 @@
+"""Test cases for the historical kline downloader."""
+
+# Import third-party modules
+import numpy
+
+# Import local modules
+from binance.api_calls.market import MarketData  # type: ignore
+from binance.helpers.klines import klines_to_array  # type: ignore
+from tests.unit.stand_in_binance import FIRST_KLINE, KLINE_MS, stand_in_kline
+from datasources.binance_csv import BinanceCSV
+from datasources.kline_downloader import KlineDownloader, write_csv
+
+
+def test_pages_cover_the_range():
+    """Pages hold up to 1000 klines and cover the range without gaps."""
+    pages = KlineDownloader(None).pages('1m', 0, 2500 * KLINE_MS)
+
+    assert pages == [
+        (0, 1000 * KLINE_MS - 1),
+        (1000 * KLINE_MS, 2000 * KLINE_MS - 1),
+        (2000 * KLINE_MS, 2500 * KLINE_MS),
+    ]
+
+
+def test_download_stitches_pages(stand_in_binance):
+    """Every kline of the range comes back once, oldest first."""
+    downloader = KlineDownloader(MarketData(url=stand_in_binance.url), workers=4)
+    start = FIRST_KLINE - 10 * KLINE_MS
+    end = FIRST_KLINE + 3456 * KLINE_MS
+
+    klines = downloader.download('btcusdt', '1m', start, end)
+
+    numpy.testing.assert_array_equal(klines, klines_to_array([
+        stand_in_kline(open_time)
+        for open_time in range(FIRST_KLINE, end + 1, KLINE_MS)
+    ]))
+    pages = [params for endpoint, params, _ in stand_in_binance.calls]
+    assert len(pages) == 4
+    assert {page['symbol'] for page in pages} == {'BTCUSDT'}
+    assert {page['limit'] for page in pages} == {'1000'}
+
+
+def test_download_to_csv(stand_in_binance, tmp_path):
+    """Downloaded klines can be backtested from a CSV file."""
+    downloader = KlineDownloader(MarketData(url=stand_in_binance.url))
+    klines = downloader.download(
+        'BTCUSDT', '1m', FIRST_KLINE, FIRST_KLINE + 99 * KLINE_MS
+    )
+    path = str(tmp_path / 'klines.csv')
+
+    write_csv(klines, path, 'BTCUSDT')
+
+    data = BinanceCSV(path).data
+    assert len(data) == 100
+    assert list(data['close']) == list(klines['close'])
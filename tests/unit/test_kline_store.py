@@ -0,0 +1,121 @@
+"""Test cases for the local kline store."""
+
+# Import standard modules
+from datetime import date
+from functools import partial
+
+# Import third-party modules
+import numpy
+from pytest import fixture, raises
+
+# Import local modules
+from binance.api_calls.market import MarketData  # type: ignore
+from binance.helpers.klines import klines_to_array  # type: ignore
+from datasources import kline_store
+from datasources.kline_downloader import KlineDownloader
+from datasources.kline_store import KlineStore, KlineStoreSource
+from exchanges.fake_exchange import FakeExchange
+from optimise import optimiser
+from strategies.moving_average import moving_average
+from tests.unit.stand_in_binance import FIRST_KLINE, KLINE_MS, stand_in_kline
+
+DAY_MS = 86_400_000
+
+
+def klines(start: int, count: int) -> numpy.ndarray:
+    """Build `count` 1 minute klines from `start` as stored."""
+    return klines_to_array([
+        stand_in_kline(start + number * KLINE_MS) for number in range(count)
+    ])
+
+
+@fixture
+def store(tmp_path) -> KlineStore:
+    """Open an empty store."""
+    return KlineStore(str(tmp_path / 'store'))
+
+
+def test_write_partitions_by_day(store):
+    """Klines are split into one partition per UTC day."""
+    midnight = FIRST_KLINE - FIRST_KLINE % DAY_MS + DAY_MS
+    store.write('btcusdt', '1m', klines(midnight - 10 * KLINE_MS, 20))
+
+    assert store.days('BTCUSDT', '1m') == [date(2020, 9, 13), date(2020, 9, 14)]
+    assert len(store.load_partition('BTCUSDT', '1m', date(2020, 9, 13))) == 10
+    assert len(store.read('BTCUSDT', '1m')) == 20
+
+
+def test_write_merges_overlaps(store):
+    """Writing overlapping klines keeps one copy of each, in time order."""
+    store.write('BTCUSDT', '1m', klines(FIRST_KLINE + 5 * KLINE_MS, 10))
+    store.write('BTCUSDT', '1m', klines(FIRST_KLINE, 10))
+
+    stored = store.read('BTCUSDT', '1m')
+    numpy.testing.assert_array_equal(stored, klines(FIRST_KLINE, 15))
+
+
+def test_read_only_loads_needed_partitions(store, monkeypatch):
+    """Range queries only touch the partitions of the days they cover."""
+    store.write('BTCUSDT', '1m', klines(FIRST_KLINE, 3 * 1440))
+    loaded = []
+    load_partition = store.load_partition
+
+    def spy(symbol, interval, day):
+        loaded.append(day)
+        return load_partition(symbol, interval, day)
+
+    monkeypatch.setattr(store, 'load_partition', spy)
+    start = FIRST_KLINE + 1440 * KLINE_MS
+    selected = store.read('BTCUSDT', '1m', start, start + 59 * KLINE_MS)
+
+    assert loaded == [kline_store.to_day(start)]
+    numpy.testing.assert_array_equal(selected, klines(start, 60))
+
+
+def test_sync_is_incremental(store, stand_in_binance):
+    """A sync only downloads the klines closed after the last one stored."""
+    downloader = KlineDownloader(MarketData(url=stand_in_binance.url))
+    end = FIRST_KLINE + 100 * KLINE_MS - 1
+
+    assert store.sync(downloader, 'BTCUSDT', '1m', FIRST_KLINE, end) == 100
+    stand_in_binance.calls.clear()
+    assert store.sync(downloader, 'BTCUSDT', '1m', end=end + 50 * KLINE_MS) == 50
+
+    assert [params['startTime'] for _, params, _ in stand_in_binance.calls] == [str(end + 1)]
+    numpy.testing.assert_array_equal(store.read('BTCUSDT', '1m'), klines(FIRST_KLINE, 150))
+
+
+def test_sync_needs_a_start(store):
+    """The first sync of a symbol needs to know where to start."""
+    with raises(ValueError):
+        store.sync(None, 'BTCUSDT', '1m')
+
+
+def test_datasource_selects_by_date(store):
+    """The datasource selects klines by symbol, interval and dates."""
+    store.write('BTCUSDT', '1m', klines(FIRST_KLINE, 2 * 1440))
+
+    data = KlineStoreSource(
+        str(store.root), symbol='btcusdt', interval='1m',
+        start='2020-09-14', end='2020-09-14 00:09:00'
+    ).data
+
+    assert len(data) == 10
+    assert data['open_time'].iloc[0] == kline_store.to_milliseconds('2020-09-14')
+
+
+def test_datasource_needs_a_symbol_and_interval(store):
+    """Without a symbol and an interval there is nothing to select."""
+    with raises(ValueError):
+        KlineStoreSource(str(store.root), None)
+
+
+def test_optimiser_reads_the_store(store):
+    """The optimiser sweeps the klines selected from the store."""
+    store.write('BTCUSDT', '1m', klines(FIRST_KLINE, 500))
+    datasource = partial(KlineStoreSource, symbol='BTCUSDT', interval='1m')
+
+    ranking = optimiser.run(
+        moving_average, FakeExchange, datasource, '2:3,5|10', str(store.root), workers=2
+    )
+    assert len(ranking) == 4
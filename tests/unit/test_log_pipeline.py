@@ -0,0 +1,74 @@
+"""Test cases for the background logging pipeline."""
+
+# Import standard modules
+import io
+import logging
+
+# Import local modules
+from log_pipeline import TICKS, LogPipeline, RateLimitFilter, tick_logger
+
+
+def _record(name, lineno=1):
+    return logging.LogRecord(name, logging.INFO, 'module.py', lineno, 'message', None, None)
+
+
+def test_per_tick_records_are_rate_limited_by_line():
+    """Each line gets a burst of records, other loggers are never limited."""
+    limit = RateLimitFilter(rate=1e-9, burst=3)
+    tick = f'{TICKS}.exchanges.fake_exchange'
+
+    assert [limit.filter(_record(tick)) for _ in range(5)] == [True] * 3 + [False] * 2
+    assert limit.filter(_record(tick, lineno=2))
+    assert all(limit.filter(_record('backtest')) for _ in range(5))
+    assert limit.dropped == 2
+
+    limit.rate = 0
+    assert limit.filter(_record(tick))
+
+
+def test_records_are_written_by_the_listener():
+    """Messages are formatted in the background, quiet drops per-tick info."""
+    stream = io.StringIO()
+    root = logging.getLogger()
+    level = root.level
+    pipeline = LogPipeline(logging.StreamHandler(stream))
+    try:
+        tick_log = tick_logger('test_log_pipeline')
+        tick_log.info("Filled %s at %s", 2, 100.5)
+        pipeline.tick_messages(quiet=True)
+        tick_log.info("Filled %s at %s", 3, 101.)
+        tick_log.warning("No depth at %s", 99.)
+        logging.getLogger('backtest').info("Summary")
+    finally:
+        pipeline.tick_messages()
+        pipeline.stop()
+        root.setLevel(level)
+
+    lines = stream.getvalue().splitlines()
+    assert [line.split(' $ ')[1] for line in lines] == [
+        'Filled 2 at 100.5', 'No depth at 99.0', 'Summary'
+    ]
+    assert lines[0].split(' - ')[1].startswith(f'{TICKS}.test_log_pipeline: INFO')
+    assert pipeline.handler not in root.handlers
+
+
+def test_dropped_records_are_counted_on_stop():
+    """Stopping the pipeline logs how many per-tick records were dropped."""
+    stream = io.StringIO()
+    root = logging.getLogger()
+    level = root.level
+    pipeline = LogPipeline(logging.StreamHandler(stream))
+    try:
+        pipeline.tick_messages(rate=1e-9)
+        pipeline.rate_limit.burst = 2
+        tick_log = tick_logger('test_log_pipeline')
+        for number in range(5):
+            tick_log.info("Filled %s", number)
+    finally:
+        pipeline.stop()
+        root.setLevel(level)
+
+    lines = [line.split(' $ ')[1] for line in stream.getvalue().splitlines()]
+    assert lines == [
+        'Filled 0', 'Filled 1', 'Dropped 3 per-tick log records over the rate limit.'
+    ]
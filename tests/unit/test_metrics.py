@@ -0,0 +1,90 @@
+"""Test cases for the streaming metrics of an exchange account."""
+
+# Import standard modules
+import json
+from pathlib import Path
+
+# Import third-party modules
+import numpy
+from pytest import approx
+
+# Import local modules
+from backtest import backtest_runner
+from datasources.binance_csv import BinanceCSV
+from exchanges.fake_exchange import FakeExchange
+from metrics import METRICS_DTYPE, Metrics
+from strategies.moving_average import moving_average
+
+DATA_PATH = str(
+    Path(__file__).resolve().parents[2] / 'data' / 'Binance_BTCUSDT_1h_clean.csv'
+)
+
+
+def test_metrics_of_a_few_fills():
+    """The metrics follow the equity marked at each fill and price."""
+    metrics = Metrics()
+    metrics.fill(2., 100., fee=1.)
+    metrics.mark(110.)
+    metrics.mark(90.)
+    metrics.fill(-2., 95., fee=1.)
+    metrics.mark(120.)
+
+    curve = metrics.equity_curve()
+    assert curve.tolist() == [-1., 19., -21., -12., -12.]
+    changes = numpy.diff(curve)
+    assert metrics.max_drawdown == 40.
+    assert metrics.exposure == 3 / 5
+    assert metrics.turnover == 390.
+    assert (metrics.trades, metrics.fees) == (2, 2.)
+    assert metrics.sharpe == approx(changes.mean() / changes.std(ddof=1))
+    assert metrics.sortino == approx(
+        changes.mean() / numpy.sqrt((numpy.minimum(changes, 0) ** 2).mean())
+    )
+
+
+def test_undefined_ratios_are_exported_as_none():
+    """Without enough returns the ratios are NaN, but None in the summary."""
+    metrics = Metrics()
+    metrics.fill(1., 100.)
+    metrics.mark(110.)
+
+    assert numpy.isnan(metrics.sharpe) and numpy.isnan(metrics.sortino)
+    summary = metrics.summary()
+    assert summary['sharpe'] is None and summary['sortino'] is None
+    assert json.loads(json.dumps(summary)) == summary
+
+
+def test_vectors_match_one_row_at_a_time():
+    """Rows recorded a vector at a time end up like rows recorded one by one."""
+    rng = numpy.random.default_rng(0)
+    prices = rng.normal(100, 5, 1000)
+    quantities = numpy.where(rng.random(1000) < 0.1, rng.normal(0, 1, 1000), 0.)
+
+    one_by_one = Metrics(cash=50.)
+    for qty, price in zip(quantities, prices):
+        if qty:
+            one_by_one.fill(qty, price, 0.5)
+        else:
+            one_by_one.mark(price)
+    vector = Metrics(cash=50.)
+    vector.fill_vector(quantities[:300], prices[:300], 0.5)
+    vector.fill_vector(quantities[300:], prices[300:], 0.5)
+
+    for name, value in one_by_one.summary().items():
+        assert vector.summary()[name] == approx(value), name
+    numpy.testing.assert_allclose(vector.equity_curve(), one_by_one.equity_curve())
+    record = vector.to_array()
+    assert record.dtype == METRICS_DTYPE
+    assert record['trades'] == numpy.count_nonzero(quantities)
+
+
+def test_backtests_report_their_metrics():
+    """The equity at the last row is the profit/loss at the last close."""
+    data = BinanceCSV(DATA_PATH).data
+    result = backtest_runner.evaluate(moving_average, FakeExchange, data, '10,50')
+
+    metrics = result['metrics']
+    assert metrics['marks'] == len(data)
+    assert metrics['trades'] == result['num_purchases'] + result['num_sales']
+    assert metrics['equity'] == approx(result['profit_loss'])
+    assert 0 < metrics['exposure'] < 1
@@ -0,0 +1,102 @@
+"""Test cases for the parameter optimiser."""
+
+# Import standard modules
+from pathlib import Path
+
+# Import local modules
+from backtest import backtest_runner
+from datasources.binance_csv import BinanceCSV
+from exchanges.fake_exchange import FakeExchange
+from optimise import halving_rungs, optimiser, parse_grid
+from strategies.moving_average import moving_average
+
+DATA_PATH = str(
+    Path(__file__).resolve().parents[2] / 'data' / 'Binance_BTCUSDT_1h_clean.csv'
+)
+
+
+def test_parse_grid():
+    """Ranges are inclusive, choices and single values are kept as is."""
+    assert parse_grid('5:15:5,10|20,x') == [
+        '5,10,x', '5,20,x', '10,10,x', '10,20,x', '15,10,x', '15,20,x'
+    ]
+    assert parse_grid('1:3') == ['1', '2', '3']
+
+
+def test_optimiser_ranks_every_combination():
+    """The sweep covers the grid and matches single vectorised backtests."""
+    ranking = optimiser.run(
+        moving_average, FakeExchange, BinanceCSV, '5:15:5,20:40:10',
+        DATA_PATH, workers=2
+    )
+
+    assert len(ranking) == 9
+    assert ranking['profit_loss'].is_monotonic_decreasing
+
+    best = ranking.iloc[0]
+    data = BinanceCSV(DATA_PATH).data
+    exchange = backtest_runner.evaluate_vector(
+        moving_average, FakeExchange, data, best['strategy_params']
+    )
+    assert exchange.get_profit_loss(data['close'].iloc[-1]) == best['profit_loss']
+    assert exchange.num_purchases == best['num_purchases']
+
+
+class _moving_average_on_opens(moving_average):
+    """The moving average strategy, trading on the open of each row."""
+
+    price_open_close = 'open'
+
+
+def test_results_are_marked_at_the_traded_price():
+    """Strategies trading on the open are valued at the last open."""
+    data = BinanceCSV(DATA_PATH).data
+    result = backtest_runner.evaluate(
+        _moving_average_on_opens, FakeExchange, data, '10,50'
+    )
+    exchange = backtest_runner.evaluate_vector(
+        _moving_average_on_opens, FakeExchange, data, '10,50'
+    )
+
+    assert result['profit_loss'] == exchange.get_profit_loss(data['open'].iloc[-1])
+    assert result['profit_loss'] != exchange.get_profit_loss(data['close'].iloc[-1])
+
+
+def test_halving_rungs():
+    """Rungs grow by the rate, up to the whole history."""
+    assert halving_rungs(1600, 34674, 3) == [1284, 3852, 11558, 34674]
+    # Not enough candidates, or not enough history, to halve further
+    assert halving_rungs(8, 100_000, 2) == [12500, 25000, 50000, 100_000]
+    assert halving_rungs(1600, 3000, 2) == [1500, 3000]
+    assert halving_rungs(1, 3000, 2) == [3000]
+
+
+def test_successive_halving_keeps_the_best_combination():
+    """Halving backtests fewer combinations fully, and finds the same best."""
+    grid = optimiser.run(
+        moving_average, FakeExchange, BinanceCSV, '5:30:5,20:100:20',
+        DATA_PATH, workers=2
+    )
+    halving = optimiser.run(
+        moving_average, FakeExchange, BinanceCSV, '5:30:5,20:100:20',
+        DATA_PATH, workers=2, halving_rate=2, max_drawdown=None
+    )
+
+    rows = len(BinanceCSV(DATA_PATH).data)
+    assert sorted(halving['strategy_params']) == sorted(grid['strategy_params'])
+    assert halving['rows'].is_monotonic_decreasing
+    assert 0 < (halving['rows'] == rows).sum() < len(grid)
+    assert halving.iloc[0].equals(grid.iloc[0])
+
+
+def test_drawdown_aborts_backtests():
+    """Backtests going too far under water stop early and rank last."""
+    ranking = optimiser.run(
+        moving_average, FakeExchange, BinanceCSV, '5:15:5,20:40:10',
+        DATA_PATH, workers=2, max_drawdown=10_000
+    )
+
+    aborted = ranking[ranking['aborted']]
+    assert 0 < len(aborted) < len(ranking)
+    assert (aborted['rows'] < len(BinanceCSV(DATA_PATH).data)).all()
+    assert ranking['aborted'].is_monotonic_increasing
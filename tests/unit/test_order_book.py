@@ -0,0 +1,181 @@
+"""Test cases for the order book matching engine."""
+
+# Import third-party modules
+import curio
+import numpy
+from pytest import approx, raises
+
+# Import local modules
+from exchanges.matching_exchange import MatchingExchange
+from exchanges.order_book import BUY, ORDER_TYPES, SELL, OrderBook, SyntheticDepth
+
+
+def _book(maker_fee=0.001, taker_fee=0.002):
+    """A book with three levels of each side around 100."""
+    book = OrderBook(maker_fee=maker_fee, taker_fee=taker_fee)
+    book.load_levels(
+        bids=[(99., 1.), (98., 2.), (97., 3.)],
+        asks=[(101., 1.), (102., 2.), (103., 3.)]
+    )
+    return book
+
+
+def test_market_orders_walk_the_levels():
+    """A market buy takes the asks from the lowest up, and pays the taker fee."""
+    book = _book()
+    order_id = book.submit(BUY, 'MARKET', 2.5)
+
+    assert [(fill[2], fill[3]) for fill in book.fills] == [(101., 1.), (102., 1.5)]
+    assert all(fill[0] == order_id and not fill[5] for fill in book.fills)
+    assert sum(fill[4] for fill in book.fills) == approx((101. + 153.) * 0.002)
+    assert book.best_ask() == 102.
+    assert order_id not in book.orders
+
+
+def test_limit_orders_rest_then_fill_as_maker():
+    """The part of a limit order that cannot fill rests until the book reaches it."""
+    book = _book()
+    order_id = book.submit(SELL, 'LIMIT', 2., 98.5)
+    # The best bid fills right away, the rest waits above it
+    assert [(fill[2], fill[3]) for fill in book.fills] == [(99., 1.)]
+    assert book.orders[order_id][2] == 1.
+
+    book.load_levels(bids=[(99.5, 0.4), (98.5, 5.)], asks=[(100., 1.)])
+    assert [(fill[2], fill[3], fill[5]) for fill in book.fills[1:]] == [
+        (98.5, 0.4, True), (98.5, 0.6, True)
+    ]
+    assert book.fills[-1][4] == approx(0.6 * 98.5 * 0.001)
+    assert order_id not in book.orders
+    assert book.best_bid() == 98.5
+
+
+def test_stop_orders_wait_for_their_price():
+    """A stop loss sells once the price falls to it, and can be cancelled."""
+    book = _book()
+    stop = book.submit(SELL, 'STOP_LOSS', 1., stop_price=95.)
+    cancelled = book.submit(SELL, 'STOP_LOSS', 1., stop_price=94.)
+    assert not book.fills
+    assert book.cancel(cancelled)
+
+    book.load_levels(bids=[(94., 3.)], asks=[(96., 3.)])
+    assert [(fill[0], fill[2], fill[3]) for fill in book.fills] == [(stop, 94., 1.)]
+    assert not book.orders
+
+
+def test_market_orders_trigger_stops():
+    """A market order moving the price sets off the stops it reaches."""
+    book = _book()
+    stop = book.submit(SELL, 'STOP_LOSS', 1., stop_price=99.5)
+    book.submit(SELL, 'MARKET', 1.)
+
+    assert [(fill[0], fill[2], fill[3]) for fill in book.fills[1:]] == [(stop, 98., 1.)]
+    assert not book.orders
+    with raises(ValueError):
+        book.submit(SELL, 'STOP_LOSS', 1.)
+
+
+def test_cancelled_orders_leave_nothing_behind():
+    """Cancelling every open order empties the book's queues."""
+    book = _book()
+    orders = [book.submit(BUY, 'LIMIT', 1., 90. + number % 3) for number in range(10)]
+    orders += [book.submit(SELL, 'TAKE_PROFIT_LIMIT', 1., 120., 110.) for _ in range(3)]
+    assert all(book.cancel(order_id) for order_id in orders)
+    assert not book.cancel(orders[0])
+
+    assert not book.orders
+    assert book._resting == {BUY: {}, SELL: {}}
+    assert book._resting_prices == {BUY: [], SELL: []}
+    assert book._stops_above == book._stops_below == ({}, [])
+
+
+def test_limit_maker_orders_never_take():
+    """A limit maker order that would fill right away is rejected."""
+    book = _book()
+    assert book.submit(BUY, 'LIMIT_MAKER', 1., 101.) is None
+    assert book.submit(BUY, 'LIMIT_MAKER', 1., 100.) is not None
+    assert not book.fills
+
+    assert set(ORDER_TYPES) >= {'MARKET', 'LIMIT', 'STOP_LOSS_LIMIT'}
+    with raises(ValueError):
+        book.submit(BUY, 'ICEBERG', 1.)
+
+
+def test_limit_orders_need_a_price():
+    """Limit order types without a price are rejected before matching."""
+    book = _book()
+    for order_type in ('LIMIT', 'LIMIT_MAKER', 'STOP_LOSS_LIMIT'):
+        with raises(ValueError):
+            book.submit(BUY, order_type, 1., stop_price=95.)
+    assert not book.orders and not book.fills
+
+
+def test_snapshots_replace_the_levels():
+    """Order book snapshots of the API are loaded as they come, as strings."""
+    book = _book()
+    book.load_snapshot({
+        'lastUpdateId': 1,
+        'bids': [['100.00', '1.5'], ['99.00', '0.0']],
+        'asks': [['100.50', '2.0']],
+    })
+    assert (book.best_bid(), book.best_ask()) == (100., 100.5)
+    assert book.mid_price() == 100.25
+
+
+def test_synthetic_depth_matches_the_book():
+    """The closed form fills orders as walking the synthetic book does."""
+    depth = SyntheticDepth(half_spread=0.001, step=0.0005, level_qty=0.5, levels=10)
+    quantities = numpy.array([0.2, -1.3, 2.5, -7., 0.])
+    prices = numpy.array([100., 200., 300., 400., 500.])
+    filled, average = depth.fill_vector(quantities, prices)
+
+    for qty, price, qty_filled, price_filled in zip(quantities, prices, filled, average):
+        book = OrderBook()
+        book.load_levels(*depth.book(price))
+        if qty:
+            book.submit(BUY if qty > 0 else SELL, 'MARKET', abs(qty))
+        taken = sum(fill[3] for fill in book.fills)
+        assert qty_filled == approx(numpy.sign(qty) * taken)
+        if taken:
+            assert price_filled == approx(sum(fill[2] * fill[3] for fill in book.fills) / taken)
+    # Larger than the whole side
+    assert filled[3] == -5.
+
+
+def test_synthetic_depth_from_candles():
+    """The levels span the median range of a candle."""
+    depth = SyntheticDepth.from_candles(
+        high=[101., 102., 103.], low=[99., 100., 99.], close=[100., 100., 100.],
+        volume=[10., 20., 30.], levels=4, participation=0.1
+    )
+    assert depth.step == approx(0.02 / 4)
+    assert depth.level_qty == approx(0.5)
+
+
+def test_matching_exchange_fills_the_same_either_way():
+    """Orders filled one at a time end up like a vector of the same orders."""
+    quantities = [0.5, -0.3, 3., -2.]
+    prices = [100., 110., 90., 120.]
+
+    one_by_one = MatchingExchange(None, 10_000)
+
+    async def fill():
+        for qty, price in zip(quantities, prices):
+            if qty > 0:
+                await one_by_one.buy(qty, price)
+            else:
+                await one_by_one.sell(-qty, price)
+
+    curio.run(fill)
+    vector = MatchingExchange(None, 10_000)
+    vector.fill_vector(quantities, prices)
+
+    for exchange in (one_by_one, vector):
+        assert exchange.fees_paid > 0
+        assert (exchange.num_purchases, exchange.num_sales) == (2, 2)
+    assert vector.currency_held == approx(one_by_one.currency_held)
+    assert vector.current_balance == approx(one_by_one.current_balance)
+    for trade, expected in zip(vector.trades, one_by_one.trades):
+        assert trade[0] == expected[0]
+        assert trade[1:] == approx(expected[1:])
+    # Bought at worse prices than asked, after fees
+    assert one_by_one.currency_held < 10_000 - sum(q * p for q, p in zip(quantities, prices))
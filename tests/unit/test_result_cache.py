@@ -0,0 +1,118 @@
+"""Test cases for the on-disk cache of backtest results."""
+
+# Import standard modules
+import os
+from pathlib import Path
+
+# Import third-party modules
+from pytest import raises
+
+# Import local modules
+from backtest import backtest_runner
+from datasources.binance_csv import BinanceCSV
+from exchanges.fake_exchange import FakeExchange
+from optimise import optimiser
+from result_cache import ResultCache, data_digest, helpers_digest
+from strategies.dca import DCA
+from strategies.moving_average import moving_average
+
+DATA_PATH = str(
+    Path(__file__).resolve().parents[2] / 'data' / 'Binance_BTCUSDT_1h_clean.csv'
+)
+
+
+def test_repeat_backtest_is_read_back(tmp_path, monkeypatch):
+    """A combination run before comes from the cache, trades and all."""
+    cache = ResultCache(tmp_path)
+    data = BinanceCSV(DATA_PATH).data
+    first = backtest_runner.evaluate(
+        moving_average, FakeExchange, data, '10,50', cache
+    )
+    assert len(first['trades']) > 0
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    def fail(*args):
+        raise AssertionError('The backtest ran again')
+    monkeypatch.setattr(backtest_runner, 'simulate_vector', fail)
+    again = backtest_runner.evaluate(
+        moving_average, FakeExchange, data, '10,50', cache, data_digest(data)
+    )
+    assert again == first
+
+
+def test_key_depends_on_every_input(tmp_path):
+    """Other data, code or parameters are other keys."""
+    cache = ResultCache(tmp_path)
+    data = BinanceCSV(DATA_PATH).data
+    digest = data_digest(data)
+    key = cache.key(digest, moving_average, FakeExchange, '10,50')
+
+    assert key == cache.key(digest, moving_average, FakeExchange, '10,50')
+    assert key != cache.key(digest, moving_average, FakeExchange, '10,51')
+    assert key != cache.key(digest, DCA, FakeExchange, '10,50')
+    assert key != cache.key(
+        data_digest(data.iloc[1:]), moving_average, FakeExchange, '10,50'
+    )
+    # Helper modules, such as the indicators, count as code too
+    assert helpers_digest() != helpers_digest(('indicators',))
+    assert helpers_digest(('indicators',)) != helpers_digest(('metrics',))
+
+
+def test_failed_writes_leave_nothing_behind(tmp_path, monkeypatch):
+    """A result that cannot be written is skipped, without a staging file."""
+    cache = ResultCache(tmp_path)
+
+    def full(source, destination):
+        raise OSError(28, 'No space left on device')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, 'replace', full)
+        cache.put('full', {'profit_loss': 1.})
+    with raises(AttributeError):
+        cache.put('unserialisable', {'profit_loss': object()})
+
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get('full') is None
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    """Past the size cap, the results used longest ago go first."""
+    result = {'profit_loss': 0., 'trades': [('BUY', 1, 2.)] * 100}
+    ResultCache(tmp_path).put('size', result)
+    size = (tmp_path / 'size.json').stat().st_size
+    (tmp_path / 'size.json').unlink()
+    # Room for seven results, evicting down to six
+    cache = ResultCache(tmp_path, max_bytes=size * 7.5)
+    for number in range(5):
+        cache.put(f'{number}', result)
+        os.utime(tmp_path / f'{number}.json', ns=(number, number))
+    # Reading the oldest one makes it the most recently used
+    assert cache.get('0') is not None
+    for number in range(5, 10):
+        cache.put(f'{number}', result)
+
+    kept = {path.stem for path in tmp_path.glob('*.json')}
+    assert kept == {'0', '5', '6', '7', '8', '9'}
+
+    assert cache.clear() == len(kept)
+    assert cache.get('9') is None
+
+
+def test_optimiser_results_do_not_change_with_the_cache(tmp_path):
+    """Sweeping with an empty or a full cache ranks the same."""
+    cache = ResultCache(tmp_path)
+    rankings = [
+        optimiser.run(
+            moving_average, FakeExchange, BinanceCSV, '5:15:5,20:40:10',
+            DATA_PATH, 2, cache
+        )
+        for _ in range(2)
+    ]
+    plain = optimiser.run(
+        moving_average, FakeExchange, BinanceCSV, '5:15:5,20:40:10',
+        DATA_PATH, 2
+    )
+
+    assert len(list(tmp_path.glob('*.json'))) == 9
+    assert rankings[0].equals(plain)
+    assert rankings[1].equals(plain)
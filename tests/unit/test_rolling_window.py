@@ -0,0 +1,63 @@
+"""Test cases for the rolling window used by the moving average strategy."""
+
+# Import third-party modules
+import numpy
+from pytest import approx, raises
+
+# Import local modules
+from indicators import sma_matrix
+from strategies.moving_average import moving_average
+from strategies.rolling_window import RollingWindow
+
+
+def test_rolling_window_mean():
+    """The window mean follows the mean of the last `size` values."""
+    values = numpy.random.default_rng(0).uniform(1000, 60000, 1000)
+    window = RollingWindow(7)
+
+    for position, value in enumerate(values):
+        window.append(value)
+        expected = values[max(0, position - 6):position + 1]
+        assert len(window) == len(expected)
+        assert window.full() == (len(expected) == 7)
+        assert window.mean() == approx(numpy.mean(expected), rel=1e-12)
+
+
+def test_rolling_window_matches_the_vectorised_averages():
+    """The means are those of `sma_matrix`, to the last bit, near-ties included."""
+    values = numpy.random.default_rng(1).uniform(1000, 60000, 5000).round(2)
+    window = RollingWindow(3)
+    means = []
+    for value in values:
+        window.append(value)
+        means.append(window.mean())
+
+    numpy.testing.assert_array_equal(means[2:], sma_matrix(values, [3])[0, 2:])
+
+
+def test_fast_windows_are_capped_at_the_slow_one():
+    """A fast window longer than the slow one averages the slow window."""
+    strategy = moving_average(None, None)
+    strategy.configure('50,10')
+
+    assert strategy.ma_fast_window == strategy.ma_slow_window == 10
+    assert moving_average.sma_windows('50,10') == [('close', 10), ('close', 10)]
+
+
+def test_rolling_window_size():
+    """A window cannot be empty."""
+    with raises(ValueError):
+        RollingWindow(0)
+
+
+def test_moving_average_instances_are_independent():
+    """Several strategy instances can run side by side in one process."""
+    first = moving_average(None, None)
+    second = moving_average(None, None)
+    first.configure('2,3')
+    second.configure('2,3')
+
+    first.ma_slow.append(1.)
+
+    assert len(first.ma_slow) == 1
+    assert len(second.ma_slow) == 0
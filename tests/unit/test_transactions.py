@@ -0,0 +1,70 @@
+"""Test cases for transactions and their batches."""
+
+# Import third-party modules
+import curio
+import numpy
+from pytest import approx, raises
+
+# Import local modules
+from common.common_classes import (
+    BUY, SELL, TRANSACTION_DTYPE, transaction, transaction_batch
+)
+from exchanges.base_class import ExchangeBaseClass
+from exchanges.fake_exchange import FakeExchange
+
+
+def test_transactions_have_slots_and_the_former_fields():
+    """Transactions have no instance dictionary, and still read as before."""
+    buy = transaction.buyTransactionFactory(2, 100.)
+    sell = transaction.sellTransactionFactory(1, 110.)
+
+    with raises(AttributeError):
+        buy.__dict__
+    assert buy.isBuyTransaction and not sell.isBuyTransaction
+    assert (buy.amount, buy.desired_value) == (2, 100.)
+    assert (sell.side, sell.qty, sell.price, sell.fee) == (SELL, 1, 110., 0.)
+    assert sell.order_id == buy.order_id + 1
+
+
+def test_batches_get_their_own_order_ids():
+    """Every transaction of every batch has an order id of its own."""
+    single = transaction(BUY, 1, 1.)
+    batch = transaction_batch([BUY, SELL, BUY], [1, 2, 3], [10., 20., 30.])
+    after = transaction(SELL, 1, 1.)
+
+    assert batch.dtype == TRANSACTION_DTYPE
+    assert batch['order_id'].tolist() == [
+        single.order_id + 1, single.order_id + 2, single.order_id + 3
+    ]
+    assert after.order_id == single.order_id + 4
+    assert batch['side'].tolist() == [BUY, SELL, BUY]
+
+
+class _OneByOne(FakeExchange):
+    """Fake exchange filling batches with the default, one at a time."""
+
+    fill_batch = ExchangeBaseClass.fill_batch
+
+
+def test_batches_are_filled_like_single_transactions():
+    """A batch fills the same trades, whether filled at once or one by one."""
+    prices = numpy.random.default_rng(0).uniform(100, 200, 50)
+    batch = transaction_batch(
+        numpy.where(numpy.arange(50) % 3 == 0, SELL, BUY), 1, prices
+    )
+
+    async def fill(exchange_class):
+        queue = curio.Queue()
+        exchange = exchange_class(queue)
+        filling = await curio.spawn(exchange.run)
+        await queue.put(batch)
+        await queue.join()
+        await filling.cancel()
+        return exchange
+
+    at_once, one_by_one = (
+        curio.run(fill, exchange_class) for exchange_class in (FakeExchange, _OneByOne)
+    )
+    assert at_once.trades == one_by_one.trades
+    assert at_once.num_sales == one_by_one.num_sales == 17
+    assert at_once.currency_held == approx(one_by_one.currency_held)